@@ -43,6 +43,14 @@ for different aircraft models and modifications.
 # Index 33: M_descent   - Mach number for descent
 # Index 34: v_descent   - Descent speed (kts)
 
+# Field names for the tuple indices above, as used by config_overrides
+CONFIG_FIELDS = (
+    "s", "b", "e", "h", "sweep_25c", "sfc", "engines", "thrust_mult", "ceiling", "cl0", "cla", "cdo",
+    "dcdo_flap1", "dcdo_flap2", "dcdo_flap3", "dcdo_gear", "mu_to", "mu_lnd", "bow", "mzfw", "mrw", "mtow",
+    "max_fuel", "taxi_fuel", "reserve_fuel", "mmo", "vmo", "clmax", "clmax_1", "clmax_2", "m_climb",
+    "v_climb", "roc_min", "m_descent", "v_descent",
+)
+
 AIRCRAFT_CONFIG = {
     ('CJ', 'Flatwing'): (240.0, 46.5, 0.75, 0.0, 0, 0.72, 2, 0.674, 41000.0, 0.2, 4.5, 0.030,
                          0.01, 0.015, 0.011, 0.017, 0.015, 0.25,
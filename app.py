@@ -5,6 +5,8 @@ import pandas as pd
 from aircraft_config import AIRCRAFT_CONFIG
 from utils import load_airports
 from simulation import run_simulation, haversine_with_bearing, reset_output_timestamp, get_global_timestamp
+from mission_solvers import solve_min_fuel, solve_max_payload
+from job_client import JobClient, JobServerError
 from display import display_simulation_results, build_route_map_figure, build_fuel_remaining_figure, build_alt_mach_profile_figure, build_alt_tas_ias_profile_figure, build_roc_figure, build_thrust_figure, build_drag_figure
 
 # Optional PDF dependencies
@@ -509,6 +511,11 @@ with st.sidebar:
     # ISA deviation
     isa_dev = int(st.number_input("ISA Deviation (C)", value=0.0, step=5.0))
 
+    # Route solver: size fuel or payload for the route instead of using the inputs above
+    route_solver = st.radio("Route Solver", ["Off", "Minimum Fuel for Payload", "Maximum Payload for Route"],
+                            index=0, key="route_solver",
+                            help="Iterates the simulation (typically 3-5 runs) to land with exactly the reserve fuel")
+
     # V1 cut simulation
     v1_cut_enabled = st.checkbox("Enable V1 Cut Simulation (Single Engine)", value=False)
 
@@ -516,6 +523,23 @@ with st.sidebar:
 write_output_file = st.sidebar.checkbox("Write Output CSV File", value=True)
 # PDF export mode
 pdf_mode = st.sidebar.radio("PDF Export", ["Hide", "Show button", "Auto-generate"], index=1)
+# Optional shared job server: simulations run in its warm pool instead of this session
+job_server_url = st.sidebar.text_input(
+    "Job server URL (optional)", value=os.environ.get("JOB_SERVER_URL", ""),
+    help="Run simulations on a shared job server (python job_server.py)"
+).strip()
+
+
+def simulate(*args, **kwargs):
+    """run_simulation, in the job server's pool when a server URL is set."""
+    if not job_server_url:
+        return run_simulation(*args, **kwargs)
+    try:
+        return JobClient(job_server_url).run_simulation(*args, **kwargs)
+    except JobServerError as e:
+        st.error(str(e))
+        st.stop()
+
 
 # Main content area for outputs
 ran_now = st.button("Run Simulation")
@@ -594,6 +618,39 @@ if ran_now:
         payload_t = payload_input_t
         fuel_t = fuel_input_t
 
+    # Size fuel or payload for the route before the weight check and the displayed runs
+    if route_solver != "Off":
+        solver_inputs = {
+            "Flatwing": (payload_f, taxi_fuel_f, reserve_fuel_f, cruise_altitude_f),
+            "Tamarack": (payload_t, taxi_fuel_t, reserve_fuel_t, cruise_altitude_t),
+        }
+        for mod_name, (mod_payload, mod_taxi, mod_reserve, mod_alt) in solver_inputs.items():
+            if mod_name not in mods_available or wing_type not in (mod_name, "Comparison"):
+                continue
+            with st.spinner(f"Solving {route_solver.lower()} ({mod_name})..."):
+                if route_solver == "Minimum Fuel for Payload":
+                    solution = solve_min_fuel(dep_airport_code, arr_airport_code, aircraft_model, mod_name, mod_payload,
+                                              mod_taxi, mod_reserve, mod_alt, takeoff_flap, winds_temps_source,
+                                              isa_dev_c=isa_dev)
+                    solution["payload_lb"] = mod_payload
+                else:
+                    solution = solve_max_payload(dep_airport_code, arr_airport_code, aircraft_model, mod_name,
+                                                 mod_taxi, mod_reserve, mod_alt, takeoff_flap, winds_temps_source,
+                                                 isa_dev_c=isa_dev)
+            with st.expander(f"{mod_name} route solver: {len(solution['iterations'])} simulations"):
+                st.dataframe(pd.DataFrame(solution["iterations"]).drop(columns=["error"]), use_container_width=True, hide_index=True)
+            if solution["initial_fuel_lb"] is None:
+                st.error(f"{mod_name}: the route cannot be flown within the {solution['limit'] or 'weight'} limit.")
+                st.stop()
+            if not solution["converged"]:
+                st.warning(f"{mod_name}: route solver did not converge; using the best feasible iteration.")
+            if mod_name == "Flatwing":
+                payload_f = payload_input_f = int(solution["payload_lb"])
+                fuel_f = fuel_input_f = int(round(solution["initial_fuel_lb"]))
+            else:
+                payload_t = payload_input_t = int(solution["payload_lb"])
+                fuel_t = fuel_input_t = int(round(solution["initial_fuel_lb"]))
+
     # Calculate current weights using user inputs
     # Prepare weight summaries for Flatwing and Tamarack as applicable
     fw_summary = None
@@ -762,25 +819,25 @@ if ran_now:
 
     if wing_type == "Comparison":
         if "Tamarack" in mods_available:
-            tamarack_data, tamarack_results, dep_lat, dep_lon, arr_lat, arr_lon, tamarack_output_file = run_simulation(
+            tamarack_data, tamarack_results, dep_lat, dep_lon, arr_lat, arr_lon, tamarack_output_file = simulate(
                 dep_airport_code, arr_airport_code, aircraft_model, "Tamarack", takeoff_flap,
                 payload_t, fuel_t, taxi_fuel_t, reserve_fuel_t, cruise_altitude_t,
                 winds_temps_source, v1_cut_enabled, write_output_file,
                 isa_dev_c=isa_dev)
         if "Flatwing" in mods_available:
-            flatwing_data, flatwing_results, dep_lat, dep_lon, arr_lat, arr_lon, flatwing_output_file = run_simulation(
+            flatwing_data, flatwing_results, dep_lat, dep_lon, arr_lat, arr_lon, flatwing_output_file = simulate(
                 dep_airport_code, arr_airport_code, aircraft_model, "Flatwing", takeoff_flap,
                 payload_f, fuel_f, taxi_fuel_f, reserve_fuel_f, cruise_altitude_f,
                 winds_temps_source, v1_cut_enabled, write_output_file,
                 isa_dev_c=isa_dev)
     elif wing_type == "Tamarack":
-        tamarack_data, tamarack_results, dep_lat, dep_lon, arr_lat, arr_lon, tamarack_output_file = run_simulation(
+        tamarack_data, tamarack_results, dep_lat, dep_lon, arr_lat, arr_lon, tamarack_output_file = simulate(
             dep_airport_code, arr_airport_code, aircraft_model, "Tamarack", takeoff_flap,
             payload_t, fuel_t, taxi_fuel_t, reserve_fuel_t, cruise_altitude_t,
             winds_temps_source, v1_cut_enabled, write_output_file,
             isa_dev_c=isa_dev)
     elif wing_type == "Flatwing":
-        flatwing_data, flatwing_results, dep_lat, dep_lon, arr_lat, arr_lon, flatwing_output_file = run_simulation(
+        flatwing_data, flatwing_results, dep_lat, dep_lon, arr_lat, arr_lon, flatwing_output_file = simulate(
             dep_airport_code, arr_airport_code, aircraft_model, "Flatwing", takeoff_flap,
             payload_f, fuel_f, taxi_fuel_f, reserve_fuel_f, cruise_altitude_f,
             winds_temps_source, v1_cut_enabled, write_output_file,
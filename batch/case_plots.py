@@ -0,0 +1,136 @@
+import argparse
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from simulation import build_fuel_distance_figure
+
+# Rendered per-case PNGs, shared by every batch output directory
+DEFAULT_CACHE_DIR = Path("plot_cache")
+PLOT_WIDTH, PLOT_HEIGHT, PLOT_SCALE = 1600, 900, 2
+# Bump when build_fuel_distance_figure changes, so cached images are not reused
+PLOT_STYLE_VERSION = 2
+
+
+def case_hash(arrays: dict) -> str:
+    """
+    Cache key of a case plot: a hash of its plot data (figure_arrays), the plot
+    style version and the PNG size. Keyed on content rather than case inputs, so
+    runs whose histories differ (terminal/climb tables, simulation changes) never
+    share an image, and identical histories do.
+    """
+    digest = hashlib.sha1(repr((PLOT_STYLE_VERSION, PLOT_WIDTH, PLOT_HEIGHT, PLOT_SCALE)).encode("utf-8"))
+    for name in sorted(arrays):
+        values = np.ascontiguousarray(arrays[name])
+        digest.update(f"{name}:{values.dtype.str}:{values.shape}".encode("utf-8"))
+        digest.update(values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def figure_arrays(fig) -> dict:
+    """
+    Compact plot data of a fuel-vs-distance figure from run_simulation: the
+    distance/fuel arrays and the segment markers (enough to rebuild it with
+    build_fuel_distance_figure).
+    """
+    line = fig.data[0]
+    shapes, annotations = fig.layout.shapes, fig.layout.annotations
+    return {
+        "distance_nm": np.asarray(line.x, dtype=np.float32),
+        "fuel_remaining_lb": np.asarray(line.y, dtype=np.float32),
+        "marker_nm": np.array([s.x0 for s in shapes], dtype=float),
+        "marker_color": np.array([s.line.color for s in shapes], dtype=str),
+        "marker_label": np.array([a.text for a in annotations], dtype=str),
+    }
+
+
+def save_plot_data(path: str | Path, arrays: dict) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, **arrays)
+    return path
+
+
+def load_plot_figure(path: str | Path):
+    """Rebuild the fuel-vs-distance figure from plot data written by save_plot_data."""
+    with np.load(path) as data:
+        markers = list(zip(data["marker_nm"].tolist(), data["marker_color"].tolist(), data["marker_label"].tolist()))
+        return build_fuel_distance_figure(data["distance_nm"].astype(float), data["fuel_remaining_lb"].astype(float),
+                                          markers)
+
+
+def render_case_plot(row: dict, cache_dir: str | Path = DEFAULT_CACHE_DIR, dest: str | Path | None = None) -> Path:
+    """
+    PNG of one case from a deferred-plot batch (a result row with plot_data_path and
+    plot_hash), rendered on first request and served from cache_dir afterwards.
+
+    Args:
+        dest: Also copy the image here (e.g. the row's plot_path).
+
+    Returns:
+        Path: dest if given, else the cached image.
+    """
+    if not isinstance(row.get("plot_data_path"), (str, Path)) or not isinstance(row.get("plot_hash"), str):
+        raise ValueError("Row has no deferred plot data (run the batch with plot_mode='deferred')")
+    cache_dir = Path(cache_dir)
+    cached = cache_dir / f"{row['plot_hash']}.png"
+    if not cached.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fig = load_plot_figure(row["plot_data_path"])
+        tmp = cached.with_name(f".{cached.name}.{os.getpid()}.tmp.png")
+        fig.write_image(str(tmp), width=PLOT_WIDTH, height=PLOT_HEIGHT, scale=PLOT_SCALE)
+        os.replace(tmp, cached)
+    if dest is None:
+        return cached
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(cached, dest)
+    return dest
+
+
+def select_rows(df: pd.DataFrame, aircraft=None, mods=None, isa_devs=None, alts=None, speeds=None,
+                payloads=None) -> pd.DataFrame:
+    """Rows of a batch summary that have deferred plot data, filtered by the given values (None = any)."""
+    rows = df[df["plot_hash"].notna()] if "plot_hash" in df.columns else df.iloc[0:0]
+    for col, values in (("aircraft", aircraft), ("mod", mods), ("isa_dev", isa_devs), ("cruise_alt", alts),
+                        ("payload", payloads)):
+        if values:
+            rows = rows[rows[col].isin(values)]
+    if speeds:
+        speed = pd.to_numeric(rows["mach"], errors="coerce").where(rows["mach"] > 0, rows.get("ktas"))
+        rows = rows[np.isclose(speed.to_numpy(dtype=float)[:, None], np.asarray(speeds, dtype=float)[None, :]).any(axis=1)]
+    return rows
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Render per-case fuel-vs-distance plots of a deferred-plot batch run")
+    p.add_argument("batch_dir", help="Batch output directory (holds combined_summary.csv)")
+    p.add_argument("--aircraft", nargs="*", default=None)
+    p.add_argument("--mods", nargs="*", default=None)
+    p.add_argument("--isa", nargs="*", type=int, default=None)
+    p.add_argument("--alts", nargs="*", type=int, default=None)
+    p.add_argument("--speeds", nargs="*", type=float, default=None, help="Mach (jets) or TAS in kts (turboprops)")
+    p.add_argument("--payloads", nargs="*", type=int, default=None)
+    p.add_argument("--cache", type=str, default=str(DEFAULT_CACHE_DIR), help="Rendered-image cache directory")
+    p.add_argument("--limit", type=int, default=50, help="Refuse to render more than this many cases (0 = no limit)")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    df = pd.read_csv(Path(args.batch_dir) / "combined_summary.csv")
+    rows = select_rows(df, args.aircraft, args.mods, args.isa, args.alts, args.speeds, args.payloads)
+    if rows.empty:
+        raise SystemExit("No matching cases with deferred plot data")
+    if args.limit and len(rows) > args.limit:
+        raise SystemExit(f"{len(rows)} cases match; narrow the filters or raise --limit")
+    for row in rows.to_dict("records"):
+        print(render_case_plot(row, args.cache, dest=row["plot_path"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+import argparse
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from aircraft_config import AIRCRAFT_CONFIG
+try:
+    from aircraft_config import TURBOPROP_PARAMS
+except ImportError:
+    TURBOPROP_PARAMS = {}
+from simulation import run_simulation
+from config_overrides import ensure_config
+from perf_tables import ClimbTable, config_fingerprint
+from batch.terminal_tables import DEFAULT_TABLE_DIR, default_fuel_policy
+
+
+def _run_climb_case(case: dict) -> dict:
+    """Run one mission up to the first level-off and return its top-of-climb state."""
+    try:
+        ensure_config(case["aircraft"], case["mod"])
+        _, results, *_ = run_simulation(
+            "KSZT", "KSAN", case["aircraft"], case["mod"], case["flap"],
+            case["payload"], case["initial_fuel"], case["taxi_fuel"], case["reserve_fuel"],
+            case["target_alt"], "No Wind", False,
+            write_output_file=False,
+            cruise_mach=case["cruise_mach"],
+            cruise_kias=case["cruise_kias"],
+            isa_dev_c=case["isa_dev"],
+            range_mode=True,
+            stop_at_segment=6,
+        )
+        return {**case, "toc": results.get("Top of Climb")}
+    except Exception as e:
+        return {**case, "toc": None, "error_message": str(e)}
+
+
+def default_target_alts(ceiling_ft: int) -> list[int]:
+    from batch.payload_range import build_alt_grid
+
+    return sorted(build_alt_grid(int(ceiling_ft)))
+
+
+def build_climb_table(
+    aircraft: str,
+    mod: str,
+    flap: int = 0,
+    isa_devs: list[int] = (-10, 0, 10, 20),
+    target_alts: list[int] | None = None,
+    weight_steps: int = 6,
+    parallel_workers: int = 6,
+) -> ClimbTable:
+    """
+    Sweep the climb phase (segments 0-5) over takeoff weight, ISA and target altitude.
+
+    Each sample runs run_simulation in range mode (sea-level departure, still air)
+    and stops at the first level-off, so only the climb is integrated.
+    """
+    ac = AIRCRAFT_CONFIG[(aircraft, mod)]
+    bow, mzfw, mrw, mtow, max_fuel = float(ac[18]), float(ac[19]), float(ac[20]), float(ac[21]), float(ac[22])
+    m_cruise, v_climb = float(ac[25]), float(ac[31])
+    taxi_fuel, reserve_fuel = default_fuel_policy(aircraft, mod)
+    is_turboprop = aircraft in TURBOPROP_PARAMS
+    max_payload = max(0.0, mzfw - bow)
+
+    # Range mode starts the descent once fuel nears the reserve, so every sample
+    # carries enough mission fuel to reach the highest target altitude.
+    min_fuel = min(max_fuel, reserve_fuel + taxi_fuel + 0.35 * max_fuel)
+    w_lo = bow + min_fuel - taxi_fuel
+    w_hi = min(mtow, mrw - taxi_fuel, mzfw + max_fuel - taxi_fuel)
+    weights = np.linspace(w_lo, w_hi, max(2, int(weight_steps)))
+    isa_axis = sorted({int(x) for x in isa_devs})
+    alt_axis = sorted({int(a) for a in (target_alts or default_target_alts(int(ac[8])))})
+
+    cases = []
+    for tow, isa_dev, target_alt in product(weights, isa_axis, alt_axis):
+        fuel = min(max_fuel, max(min_fuel, tow + taxi_fuel - bow - max_payload))
+        payload = max(0.0, tow + taxi_fuel - bow - fuel)
+        cases.append({
+            "aircraft": aircraft,
+            "mod": mod,
+            "flap": int(flap),
+            "isa_dev": float(isa_dev),
+            "target_alt": int(target_alt),
+            "payload": float(payload),
+            "initial_fuel": float(fuel),
+            "taxi_fuel": float(taxi_fuel),
+            "reserve_fuel": float(reserve_fuel),
+            "cruise_mach": (0.0 if is_turboprop else m_cruise),
+            "cruise_kias": (v_climb if is_turboprop else None),
+        })
+
+    with ProcessPoolExecutor(max_workers=parallel_workers) as ex:
+        runs = list(ex.map(_run_climb_case, cases))
+
+    values = np.full((len(weights), len(isa_axis), len(alt_axis), len(ClimbTable.FIELDS)), np.nan)
+    for k, run in enumerate(runs):
+        i, rem = divmod(k, len(isa_axis) * len(alt_axis))
+        j, n = divmod(rem, len(alt_axis))
+        toc = run.get("toc")
+        if toc:
+            values[i, j, n] = [toc[f] for f in ClimbTable.FIELDS]
+    if np.isnan(values).any():
+        failed = [r.get("error_message") for r in runs if r.get("toc") is None]
+        raise RuntimeError(f"Climb table sweep failed for {aircraft} {mod}: {failed[:3]}")
+
+    meta = {
+        "elevation_ft": 0.0,
+        "taxi_fuel_lb": taxi_fuel,
+        "config_hash": config_fingerprint(aircraft, mod),
+    }
+    return ClimbTable(aircraft, mod, flap, weights, isa_axis, alt_axis, values, meta=meta)
+
+
+def climb_table_path(aircraft: str, mod: str, flap: int, table_dir: str | Path | None = None) -> Path:
+    table_dir = Path(table_dir) if table_dir else DEFAULT_TABLE_DIR
+    return table_dir / f"climb_{aircraft}_{mod}_flap{int(flap)}_{config_fingerprint(aircraft, mod)}.npz"
+
+
+def load_or_build_climb_table(
+    aircraft: str,
+    mod: str,
+    flap: int = 0,
+    isa_devs: list[int] = (-10, 0, 10, 20),
+    target_alts: list[int] | None = None,
+    table_dir: str | Path | None = None,
+    parallel_workers: int = 6,
+) -> ClimbTable:
+    """Load a cached climb table, rebuilding it if missing or if it does not span the request."""
+    path = climb_table_path(aircraft, mod, flap, table_dir)
+    target_alts = list(target_alts or default_target_alts(int(AIRCRAFT_CONFIG[(aircraft, mod)][8])))
+    if path.exists():
+        table = ClimbTable.load(path)
+        if table.covers(isa_devs, target_alts):
+            return table
+        isa_devs = sorted({*isa_devs, *table.isa_devs.astype(int).tolist()})
+        target_alts = sorted({*target_alts, *table.target_alts.astype(int).tolist()})
+    table = build_climb_table(aircraft, mod, flap, isa_devs=isa_devs, target_alts=target_alts,
+                              parallel_workers=parallel_workers)
+    table.save(path)
+    return table
+
+
+def validate_climb_table(
+    table: ClimbTable,
+    cruise_alts: list[int],
+    speeds: list,
+    payloads: list[int],
+    isa_devs: list[int] = (0,),
+) -> pd.DataFrame:
+    """
+    Run matching full-physics and climb-table range missions and report the
+    differences. speeds are Mach numbers (or KIAS for turboprops) and may include
+    "MRC"/"LRC", whose cruise speed is solved on the first step after the jump.
+    """
+    from batch.payload_range import compute_initial_fuel
+
+    aircraft, mod, flap = table.aircraft, table.mod, table.flap
+    ac = ensure_config(aircraft, mod)
+    is_turboprop = aircraft in TURBOPROP_PARAMS
+    taxi_fuel, reserve_fuel = default_fuel_policy(aircraft, mod)
+    rows = []
+    for cruise_alt, spd, payload, isa_dev in product(cruise_alts, speeds, payloads, isa_devs):
+        fuel = compute_initial_fuel(float(ac[22]), float(ac[20]), float(ac[18]), float(payload))
+        row = {"aircraft": aircraft, "mod": mod, "flap": flap, "isa_dev": int(isa_dev),
+               "cruise_alt": int(cruise_alt), "speed": spd, "payload": int(payload)}
+        for label, climb_table in (("full", None), ("fast", table)):
+            t0 = time.perf_counter()
+            _, results, *_ = run_simulation(
+                "KSZT", "KSAN", aircraft, mod, flap, payload, fuel, taxi_fuel, reserve_fuel,
+                int(cruise_alt), "No Wind", False,
+                write_output_file=False,
+                cruise_mach=(0.0 if is_turboprop else spd),
+                cruise_kias=(spd if is_turboprop else None),
+                isa_dev_c=isa_dev,
+                range_mode=True,
+                climb_table=climb_table,
+            )
+            row[f"wall_s_{label}"] = round(time.perf_counter() - t0, 3)
+            row[f"error_{label}"] = results.get("error")
+            for key, field in (("total_dist_nm", "Total Dist (NM)"), ("fuel_burned_lb", "Total Fuel Burned (lb)")):
+                row[f"{key}_{label}"] = pd.to_numeric(pd.Series([results.get(field)]), errors="coerce").iloc[0]
+        for key in ("total_dist_nm", "fuel_burned_lb"):
+            row[f"{key}_delta"] = row[f"{key}_fast"] - row[f"{key}_full"]
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def save_climb_charts(table: ClimbTable, out_dir: str | Path) -> list[Path]:
+    """AFM-style time/fuel/distance-to-climb charts, one PNG per ISA deviation."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    panels = [("time_s", "Time to Climb (min)", 1 / 60.0), ("fuel_lb", "Fuel to Climb (lb)", 1.0), ("dist_nm", "Distance to Climb (NM)", 1.0)]
+    for j, isa in enumerate(table.isa_devs):
+        fig = make_subplots(rows=1, cols=3, subplot_titles=[p[1] for p in panels])
+        for i, w in enumerate(table.weights):
+            for col, (field, _, scale) in enumerate(panels, start=1):
+                f = ClimbTable.FIELDS.index(field)
+                fig.add_trace(go.Scatter(
+                    x=table.values[i, j, :, f] * scale,
+                    y=table.values[i, j, :, ClimbTable.FIELDS.index("level_off_ft")],
+                    mode="lines",
+                    name=f"TOW {w:,.0f} lb",
+                    legendgroup=f"w{i}",
+                    showlegend=(col == 1),
+                ), row=1, col=col)
+        fig.update_yaxes(title_text="Pressure Altitude (ft)", row=1, col=1)
+        fig.update_layout(
+            title=f"Climb Performance | {table.aircraft} {table.mod} | Flap {table.flap} | ISA {isa:+.0f}°C",
+            template="plotly_white",
+        )
+        path = out_dir / f"climb_{table.aircraft}_{table.mod}_flap{table.flap}_ISA{isa:+.0f}C.png".replace("+", "p")
+        fig.write_image(str(path), width=1800, height=700, scale=2)
+        paths.append(path)
+    return paths
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Build time/fuel/distance-to-climb tables and charts")
+    p.add_argument("--aircraft", nargs="+", required=True, help="Aircraft models, e.g., CJ1 M2 C208B")
+    p.add_argument("--mods", nargs="+", default=["Flatwing", "Tamarack"], help="Mods to include")
+    p.add_argument("--flaps", nargs="+", type=int, default=[0])
+    p.add_argument("--isa", nargs="+", type=int, default=[-10, 0, 10, 20])
+    p.add_argument("--alts", nargs="*", type=int, default=None, help="Target altitudes in ft (default batch altitude grid)")
+    p.add_argument("--weight-steps", type=int, default=6)
+    p.add_argument("--parallel", type=int, default=6)
+    p.add_argument("--out", type=str, default=None, help="Table directory (default performance_tables)")
+    p.add_argument("--no-charts", action="store_true", help="Skip the PNG climb charts")
+    p.add_argument("--validate", action="store_true",
+                   help="Compare climb-table and full-physics range missions (jets at a fixed Mach, MRC and LRC)")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    table_dir = Path(args.out) if args.out else DEFAULT_TABLE_DIR
+    frames, reports = [], []
+    for aircraft, mod, flap in product(args.aircraft, args.mods, args.flaps):
+        if (aircraft, mod) not in AIRCRAFT_CONFIG:
+            continue
+        table = build_climb_table(aircraft, mod, flap, isa_devs=args.isa, target_alts=args.alts,
+                                  weight_steps=args.weight_steps, parallel_workers=args.parallel)
+        path = table.save(climb_table_path(aircraft, mod, flap, table_dir))
+        print(f"Saved {path}")
+        frames.append(table.to_frame())
+        if not args.no_charts:
+            save_climb_charts(table, table_dir / "climb_charts")
+        if args.validate:
+            ac = AIRCRAFT_CONFIG[(aircraft, mod)]
+            is_turboprop = aircraft in TURBOPROP_PARAMS
+            speeds = [float(ac[31])] if is_turboprop else [round(0.9 * float(ac[25]), 2), "MRC", "LRC"]
+            max_payload = max(0, int(ac[19] - ac[18]))
+            reports.append(validate_climb_table(
+                table,
+                cruise_alts=[int(ac[8]) - 4000],
+                speeds=speeds,
+                payloads=[max_payload // 2],
+                isa_devs=args.isa,
+            ))
+    if frames:
+        pd.concat(frames, ignore_index=True).to_csv(table_dir / "climb_tables.csv", index=False)
+    if reports:
+        report = pd.concat(reports, ignore_index=True)
+        report_path = table_dir / "climb_validation.csv"
+        report.to_csv(report_path, index=False)
+        print(report[["aircraft", "mod", "isa_dev", "speed", "total_dist_nm_delta", "fuel_burned_lb_delta",
+                      "error_full", "error_fast", "wall_s_full", "wall_s_fast"]].to_string(index=False))
+        print(f"Saved {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+from pathlib import Path
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from aircraft_config import AIRCRAFT_CONFIG
+from performance import LRC_SR_FRACTION, cruise_speed_tables
+from batch.envelope import default_envelope_axes
+
+DEFAULT_CRUISE_SPEED_DIR = Path("performance_tables") / "cruise_speeds"
+SPEED_FIELDS = ("mach", "vktas", "vkias", "sr")
+
+
+def cruise_speed_frame(aircraft: str, mod: str, weights, alts, isa_devs,
+                       lrc_fraction: float = LRC_SR_FRACTION) -> pd.DataFrame:
+    """Long-form MRC/LRC table, one row per (weight, altitude, ISA)."""
+    tables = cruise_speed_tables(aircraft, mod, weights, alts, isa_devs, lrc_fraction)
+    W, A, I = np.meshgrid(tables["weights"], tables["alts"], tables["isa_devs"], indexing="ij")
+    columns = {
+        "aircraft": aircraft,
+        "mod": mod,
+        "weight_lb": W.ravel(),
+        "alt_ft": A.ravel(),
+        "isa_dev": I.ravel(),
+    }
+    for name, field in product(("mrc", "lrc"), SPEED_FIELDS):
+        columns[f"{name}_{field}"] = tables[f"{name}_{field}"].ravel()
+    return pd.DataFrame(columns)
+
+
+def save_cruise_speed_charts(df: pd.DataFrame, out_dir: str | Path) -> list[Path]:
+    """MRC (solid) and LRC (dashed) Mach vs altitude, one line pair per weight and one PNG per ISA."""
+    import plotly.graph_objects as go
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for (aircraft, mod, isa), sub in df.groupby(["aircraft", "mod", "isa_dev"]):
+        fig = go.Figure()
+        for w, line in sub.groupby("weight_lb"):
+            fig.add_trace(go.Scatter(x=line["mrc_mach"], y=line["alt_ft"], mode="lines",
+                                     name=f"MRC W {w:,.0f} lb", legendgroup=f"{w}"))
+            fig.add_trace(go.Scatter(x=line["lrc_mach"], y=line["alt_ft"], mode="lines", line=dict(dash="dash"),
+                                     name=f"LRC W {w:,.0f} lb", legendgroup=f"{w}"))
+        fig.update_layout(
+            title=f"Optimal Cruise Mach | {aircraft} {mod} | ISA {isa:+.0f}°C",
+            xaxis_title="Mach", yaxis_title="Pressure Altitude (ft)", template="plotly_white",
+        )
+        path = out_dir / f"cruise_speeds_{aircraft}_{mod}_ISA{isa:+.0f}C.png".replace("+", "p")
+        fig.write_image(str(path), width=1400, height=1000, scale=2)
+        paths.append(path)
+    return paths
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Maximum-range and long-range cruise speed tables")
+    p.add_argument("--aircraft", nargs="+", required=True, help="Aircraft models, e.g., CJ1 M2 C208B")
+    p.add_argument("--mods", nargs="+", default=["Flatwing", "Tamarack"], help="Mods to include")
+    p.add_argument("--isa", nargs="+", type=int, default=[-10, 0, 10, 20])
+    p.add_argument("--weight-steps", type=int, default=6)
+    p.add_argument("--alt-step", type=int, default=1000, help="Altitude step (ft)")
+    p.add_argument("--lrc-fraction", type=float, default=LRC_SR_FRACTION, help="LRC specific range as a fraction of MRC")
+    p.add_argument("--out", type=str, default=None, help="Output directory (default performance_tables/cruise_speeds)")
+    p.add_argument("--no-charts", action="store_true", help="Skip the PNG charts")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    out_dir = Path(args.out) if args.out else DEFAULT_CRUISE_SPEED_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    frames = []
+    for aircraft, mod in product(args.aircraft, args.mods):
+        if (aircraft, mod) not in AIRCRAFT_CONFIG:
+            continue
+        weights, alts = default_envelope_axes(aircraft, mod, args.weight_steps, args.alt_step)
+        frames.append(cruise_speed_frame(aircraft, mod, weights, alts, args.isa, args.lrc_fraction))
+    if not frames:
+        return
+    df = pd.concat(frames, ignore_index=True)
+    path = out_dir / "cruise_speeds.csv"
+    df.to_csv(path, index=False)
+    print(f"Saved {path} ({len(df):,} rows)")
+    if not args.no_charts:
+        save_cruise_speed_charts(df, out_dir / "charts")
+
+
+if __name__ == "__main__":
+    main()
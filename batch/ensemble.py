@@ -0,0 +1,224 @@
+import argparse
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from aircraft_config import AIRCRAFT_CONFIG
+try:
+    from aircraft_config import TURBOPROP_PARAMS
+except ImportError:
+    TURBOPROP_PARAMS = {}
+from simulation import run_simulation
+from utils import load_airports
+from batch.payload_range import compute_initial_fuel
+from batch.terminal_tables import default_fuel_policy
+
+WIND_PRESETS = ["No Wind", "Current Conditions", "Summer Average", "Winter Average"]
+PERCENTILES = (50, 90, 99)
+METRICS = {
+    "fuel_burned_lb": "Total Fuel Burned (lb)",
+    "time_min": "Total Time (min)",
+    "dist_nm": "Total Dist (NM)",
+}
+
+# Route and aircraft setup shared by every draw, installed once per worker process
+_SETUP = {}
+
+
+def _init_worker(setup: dict) -> None:
+    """Install the shared mission setup and warm the airport table in this worker."""
+    _SETUP.clear()
+    _SETUP.update(setup)
+    load_airports()
+
+
+def _run_draw(draw: dict) -> dict:
+    """Run one dispersed mission on the installed setup."""
+    setup = _SETUP
+    try:
+        _, results, *_ = run_simulation(
+            setup["dep_airport"], setup["arr_airport"], setup["aircraft"], setup["mod"], setup["flap"],
+            draw["payload"], draw["initial_fuel"], setup["taxi_fuel"], setup["reserve_fuel"],
+            setup["cruise_alt"], draw["wind"], False,
+            write_output_file=False,
+            cruise_mach=setup["cruise_mach"],
+            cruise_kias=setup["cruise_kias"],
+            isa_dev_c=draw["isa_dev"],
+            range_mode=setup["range_mode"],
+            sfc_factor=draw["sfc_factor"],
+            drag_factor=draw["drag_factor"],
+        )
+        error = results.get("error")
+        out = {**draw, "status": "ok" if error is None else "failed", "error_message": error}
+        for name, key in METRICS.items():
+            out[name] = results.get(key)
+        return out
+    except Exception as e:
+        return {**draw, "status": "error", "error_message": str(e)}
+
+
+def draw_dispersions(rng: np.random.Generator, n: int, setup: dict, spec: dict) -> list[dict]:
+    """
+    n random draws of ISA deviation, wind preset, payload and SFC/drag multipliers.
+
+    Args:
+        spec: isa_mean, isa_sd (C), winds (list of presets) and wind_weights,
+            payload_min/payload_max (lb, uniform), sfc_sd and drag_sd (normal
+            around 1.0). Each draw is fuelled to tanks-full within MRW unless the
+            setup fixes initial_fuel.
+    """
+    ac = AIRCRAFT_CONFIG[(setup["aircraft"], setup["mod"])]
+    bow, mzfw, mrw, max_fuel = float(ac[18]), float(ac[19]), float(ac[20]), float(ac[22])
+    winds = list(spec["winds"])
+    weights = np.asarray(spec.get("wind_weights") or [1.0] * len(winds), dtype=float)
+    isa = rng.normal(spec["isa_mean"], spec["isa_sd"], n)
+    wind = rng.choice(len(winds), size=n, p=weights / weights.sum())
+    payload = np.clip(rng.uniform(spec["payload_min"], spec["payload_max"], n), 0.0, mzfw - bow)
+    sfc = rng.normal(1.0, spec["sfc_sd"], n)
+    drag = rng.normal(1.0, spec["drag_sd"], n)
+    draws = []
+    for i in range(n):
+        fuel = setup.get("initial_fuel")
+        draws.append({
+            "isa_dev": round(float(isa[i]), 2),
+            "wind": winds[wind[i]],
+            "payload": round(float(payload[i]), 1),
+            "initial_fuel": float(fuel) if fuel is not None else compute_initial_fuel(max_fuel, mrw, bow, float(payload[i])),
+            "sfc_factor": round(float(sfc[i]), 4),
+            "drag_factor": round(float(drag[i]), 4),
+        })
+    return draws
+
+
+def percentile_stats(rows: list[dict]) -> dict:
+    """P50/P90/P99 of every metric over the successful draws."""
+    ok = [r for r in rows if r.get("status") == "ok"]
+    stats = {"n_draws": len(rows), "n_ok": len(ok), "failure_rate": 1.0 - len(ok) / max(len(rows), 1)}
+    for name in METRICS:
+        values = np.asarray([r[name] for r in ok if r.get(name) is not None], dtype=float)
+        for p in PERCENTILES:
+            stats[f"{name}_p{p}"] = float(np.percentile(values, p)) if values.size else np.nan
+    return stats
+
+
+def _max_relative_change(prev: dict, cur: dict) -> float:
+    changes = [
+        abs(cur[k] - prev[k]) / max(abs(prev[k]), 1e-9)
+        for k in cur if k.endswith(tuple(f"_p{p}" for p in PERCENTILES)) and np.isfinite(prev[k]) and np.isfinite(cur[k])
+    ]
+    return max(changes) if changes else np.inf
+
+
+def run_ensemble(setup: dict, spec: dict, max_draws: int = 1000, batch_size: int = 48, min_draws: int = 96,
+                 rel_tol: float = 0.005, patience: int = 2, seed: int = 0, parallel_workers: int = 6) -> dict:
+    """
+    Monte-Carlo dispersion of one mission, dispatched in batches over a process pool.
+
+    After each batch the percentiles are recomputed; the run stops early once at
+    least min_draws are in and no P50/P90/P99 has moved by more than rel_tol
+    (relative) for patience consecutive batches.
+
+    Returns:
+        dict: stats (percentile_stats of all draws), converged, history (stats
+        after each batch with max_rel_change) and draws (one row per draw).
+    """
+    rng = np.random.default_rng(seed)
+    rows, history = [], []
+    stable = 0
+    converged = False
+    with ProcessPoolExecutor(max_workers=parallel_workers, initializer=_init_worker, initargs=(setup,)) as ex:
+        while len(rows) < max_draws:
+            n = min(batch_size, max_draws - len(rows))
+            rows.extend(ex.map(_run_draw, draw_dispersions(rng, n, setup, spec)))
+            stats = percentile_stats(rows)
+            stats["max_rel_change"] = _max_relative_change(history[-1], stats) if history else np.inf
+            history.append(stats)
+            stable = stable + 1 if stats["max_rel_change"] <= rel_tol else 0
+            if len(rows) >= min_draws and stable >= patience:
+                converged = True
+                break
+    return {"stats": history[-1], "converged": converged, "history": history, "draws": rows}
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Monte-Carlo dispersion ensemble of one mission (P50/P90/P99 fuel, time, range)")
+    p.add_argument("--dep", default="KSZT")
+    p.add_argument("--arr", default="KSAN")
+    p.add_argument("--aircraft", required=True)
+    p.add_argument("--mod", default="Flatwing")
+    p.add_argument("--flap", type=int, default=0)
+    p.add_argument("--alt", type=int, required=True, help="Cruise altitude (ft)")
+    p.add_argument("--mach", type=float, default=None, help="Cruise Mach (default MMO)")
+    p.add_argument("--kias", type=float, default=None, help="Cruise IAS for turboprops (kts)")
+    p.add_argument("--fuel", type=float, default=None, help="Fixed initial fuel (default tanks-full within MRW)")
+    p.add_argument("--range-mode", action="store_true", help="Fly to the reserve instead of the arrival airport")
+    p.add_argument("--isa-mean", type=float, default=0.0)
+    p.add_argument("--isa-sd", type=float, default=5.0)
+    p.add_argument("--winds", nargs="+", default=WIND_PRESETS, choices=WIND_PRESETS)
+    p.add_argument("--wind-weights", nargs="*", type=float, default=None)
+    p.add_argument("--payload-min", type=float, default=0.0)
+    p.add_argument("--payload-max", type=float, default=None, help="Default MZFW - BOW")
+    p.add_argument("--sfc-sd", type=float, default=0.02, help="SFC multiplier standard deviation")
+    p.add_argument("--drag-sd", type=float, default=0.03, help="Drag multiplier standard deviation")
+    p.add_argument("--max-draws", type=int, default=1000)
+    p.add_argument("--batch-size", type=int, default=48)
+    p.add_argument("--min-draws", type=int, default=96)
+    p.add_argument("--rel-tol", type=float, default=0.005, help="Percentile stability tolerance (relative)")
+    p.add_argument("--patience", type=int, default=2, help="Stable batches required before stopping")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--parallel", type=int, default=6)
+    p.add_argument("--out", type=str, default=None, help="Optional directory for draws and convergence CSVs")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    ac = AIRCRAFT_CONFIG[(args.aircraft, args.mod)]
+    taxi_fuel, reserve_fuel = default_fuel_policy(args.aircraft, args.mod)
+    is_turboprop = args.aircraft in TURBOPROP_PARAMS
+    setup = {
+        "dep_airport": args.dep,
+        "arr_airport": args.arr,
+        "aircraft": args.aircraft,
+        "mod": args.mod,
+        "flap": args.flap,
+        "taxi_fuel": float(taxi_fuel),
+        "reserve_fuel": float(reserve_fuel),
+        "cruise_alt": args.alt,
+        "cruise_mach": float(args.mach if args.mach is not None else (0.0 if is_turboprop else ac[25])),
+        "cruise_kias": args.kias if is_turboprop else None,
+        "initial_fuel": args.fuel,
+        "range_mode": args.range_mode,
+    }
+    spec = {
+        "isa_mean": args.isa_mean,
+        "isa_sd": args.isa_sd,
+        "winds": args.winds,
+        "wind_weights": args.wind_weights,
+        "payload_min": args.payload_min,
+        "payload_max": args.payload_max if args.payload_max is not None else float(ac[19]) - float(ac[18]),
+        "sfc_sd": args.sfc_sd,
+        "drag_sd": args.drag_sd,
+    }
+    t0 = time.perf_counter()
+    res = run_ensemble(setup, spec, max_draws=args.max_draws, batch_size=args.batch_size, min_draws=args.min_draws,
+                       rel_tol=args.rel_tol, patience=args.patience, seed=args.seed, parallel_workers=args.parallel)
+    stats = res["stats"]
+    print(f"{stats['n_draws']} draws ({stats['n_ok']} ok, {'converged' if res['converged'] else 'max draws reached'}) "
+          f"in {time.perf_counter() - t0:.1f} s")
+    table = pd.DataFrame({name: [stats[f"{name}_p{p}"] for p in PERCENTILES] for name in METRICS},
+                         index=[f"P{p}" for p in PERCENTILES])
+    print(table.round(1).to_string())
+    if args.out:
+        out_dir = Path(args.out)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame(res["draws"]).to_csv(out_dir / "ensemble_draws.csv", index=False)
+        pd.DataFrame(res["history"]).to_csv(out_dir / "ensemble_convergence.csv", index=False)
+        print(f"Saved {out_dir / 'ensemble_draws.csv'} and {out_dir / 'ensemble_convergence.csv'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import argparse
+from pathlib import Path
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from aircraft_config import AIRCRAFT_CONFIG
+from performance import aircraft_terms, ceiling_altitude, envelope_tables, max_level_mach
+from batch.terminal_tables import default_fuel_policy
+
+DEFAULT_ENVELOPE_DIR = Path("performance_tables") / "envelope"
+
+
+def default_envelope_axes(aircraft: str, mod: str, weight_steps: int = 6, alt_step_ft: int = 1000) -> tuple[np.ndarray, np.ndarray]:
+    """Weights from empty-plus-reserve to MTOW and altitudes from sea level to the certified ceiling."""
+    ac = AIRCRAFT_CONFIG[(aircraft, mod)]
+    _, reserve_fuel = default_fuel_policy(aircraft, mod)
+    weights = np.linspace(float(ac[18]) + reserve_fuel, float(ac[21]), max(2, int(weight_steps)))
+    alts = np.arange(0, int(ac[8]) + 1, int(alt_step_ft), dtype=float)
+    return weights, alts
+
+
+def envelope_frames(aircraft: str, mod: str, weights, isa_devs, alts) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Long-form ceiling (weight x ISA) and maximum-Mach (weight x altitude x ISA) tables."""
+    env = envelope_tables(aircraft, mod, weights, isa_devs, alts)
+    ceiling_rows = []
+    mach_rows = []
+    for i, w in enumerate(env["weights"]):
+        for j, isa in enumerate(env["isa_devs"]):
+            ceiling_rows.append({
+                "aircraft": aircraft, "mod": mod, "weight_lb": w, "isa_dev": isa,
+                "ceiling_ft": env["ceiling_ft"][i, j],
+            })
+            for k, alt in enumerate(env["alts"]):
+                mach_rows.append({
+                    "aircraft": aircraft, "mod": mod, "weight_lb": w, "isa_dev": isa, "alt_ft": alt,
+                    "max_mach": env["max_mach"][i, k, j],
+                    "max_vktas": env["max_vktas"][i, k, j],
+                    "max_vkias": env["max_vkias"][i, k, j],
+                    "mmo_limited": bool(env["mmo_limited"][i, k, j]),
+                    "above_ceiling": bool(not alt <= env["ceiling_ft"][i, j]),
+                })
+    return pd.DataFrame(ceiling_rows), pd.DataFrame(mach_rows)
+
+
+def envelope_grid_bounds(aircraft: str, mod: str, toc_weight: float, cruise_weight: float,
+                         isa_devs: list[int]) -> dict:
+    """
+    Most generous ceiling and maximum level Mach over isa_devs, for trimming sweep grids.
+
+    Args:
+        toc_weight: Lightest plausible top-of-climb weight (lb) in the sweep.
+        cruise_weight: Lightest cruise weight (lb), e.g. empty + reserve fuel.
+
+    Returns:
+        dict: ceiling_ft and max_mach (max level Mach at or below that ceiling).
+    """
+    terms = aircraft_terms(aircraft, mod)
+    isa = np.asarray(list(isa_devs), dtype=float)
+    ceilings = ceiling_altitude(terms, toc_weight, isa)
+    ceiling = float(np.nanmax(ceilings)) if np.isfinite(ceilings).any() else 0.0
+    alts = np.arange(0.0, ceiling + 1.0, 1000.0)
+    mach = max_level_mach(terms, cruise_weight, alts[:, None], isa[None, :])["mach"]
+    max_mach = float(np.nanmax(mach)) if np.isfinite(mach).any() else 0.0
+    return {"ceiling_ft": round(ceiling), "max_mach": round(max_mach, 4)}
+
+
+def trim_grid_to_bound(values: list, bound: float) -> list:
+    """Grid values at or below bound, plus the first one beyond it so the limited edge stays visible."""
+    values = sorted(values)
+    kept = [v for v in values if v <= bound]
+    beyond = [v for v in values if v > bound]
+    if beyond:
+        kept.append(beyond[0])
+    return sorted(kept, reverse=True)
+
+
+def save_envelope_charts(ceiling_df: pd.DataFrame, mach_df: pd.DataFrame, out_dir: str | Path) -> list[Path]:
+    """Maximum level Mach vs altitude (one line per weight) beside ceiling vs weight, one PNG per ISA."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for (aircraft, mod, isa), mach_sub in mach_df.groupby(["aircraft", "mod", "isa_dev"]):
+        fig = make_subplots(rows=1, cols=2, subplot_titles=["Maximum Level Mach", "Ceiling (ROC = roc_min)"])
+        for w, line in mach_sub.groupby("weight_lb"):
+            line = line[~line["above_ceiling"]]
+            fig.add_trace(go.Scatter(x=line["max_mach"], y=line["alt_ft"], mode="lines",
+                                     name=f"W {w:,.0f} lb"), row=1, col=1)
+        ceil_sub = ceiling_df[(ceiling_df["aircraft"] == aircraft) & (ceiling_df["mod"] == mod) & (ceiling_df["isa_dev"] == isa)]
+        fig.add_trace(go.Scatter(x=ceil_sub["weight_lb"], y=ceil_sub["ceiling_ft"], mode="lines+markers",
+                                 name="Ceiling", line=dict(color="black")), row=1, col=2)
+        fig.update_xaxes(title_text="Mach", row=1, col=1)
+        fig.update_xaxes(title_text="Weight (lb)", row=1, col=2)
+        fig.update_yaxes(title_text="Pressure Altitude (ft)", row=1, col=1)
+        fig.update_layout(title=f"Flight Envelope | {aircraft} {mod} | ISA {isa:+.0f}°C", template="plotly_white")
+        path = out_dir / f"envelope_{aircraft}_{mod}_ISA{isa:+.0f}C.png".replace("+", "p")
+        fig.write_image(str(path), width=1800, height=800, scale=2)
+        paths.append(path)
+    return paths
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Ceiling and maximum level-speed envelope tables and charts")
+    p.add_argument("--aircraft", nargs="+", required=True, help="Aircraft models, e.g., CJ1 M2 C208B")
+    p.add_argument("--mods", nargs="+", default=["Flatwing", "Tamarack"], help="Mods to include")
+    p.add_argument("--isa", nargs="+", type=int, default=[-10, 0, 10, 20])
+    p.add_argument("--weight-steps", type=int, default=6)
+    p.add_argument("--alt-step", type=int, default=1000, help="Altitude step for the maximum-Mach table (ft)")
+    p.add_argument("--out", type=str, default=None, help="Output directory (default performance_tables/envelope)")
+    p.add_argument("--no-charts", action="store_true", help="Skip the PNG envelope charts")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    out_dir = Path(args.out) if args.out else DEFAULT_ENVELOPE_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    ceiling_frames, mach_frames = [], []
+    for aircraft, mod in product(args.aircraft, args.mods):
+        if (aircraft, mod) not in AIRCRAFT_CONFIG:
+            continue
+        weights, alts = default_envelope_axes(aircraft, mod, args.weight_steps, args.alt_step)
+        ceiling_df, mach_df = envelope_frames(aircraft, mod, weights, args.isa, alts)
+        ceiling_frames.append(ceiling_df)
+        mach_frames.append(mach_df)
+    if not ceiling_frames:
+        return
+    ceiling_df = pd.concat(ceiling_frames, ignore_index=True)
+    mach_df = pd.concat(mach_frames, ignore_index=True)
+    ceiling_df.to_csv(out_dir / "envelope_ceiling.csv", index=False)
+    mach_df.to_csv(out_dir / "envelope_max_mach.csv", index=False)
+    print(f"Saved {out_dir / 'envelope_ceiling.csv'} and {out_dir / 'envelope_max_mach.csv'}")
+    if not args.no_charts:
+        save_envelope_charts(ceiling_df, mach_df, out_dir / "charts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import argparse
+import time
+from pathlib import Path
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from aircraft_config import AIRCRAFT_CONFIG
+from performance import aircraft_terms, climb_schedule_mach, excess_power_grid
+from batch.terminal_tables import default_fuel_policy
+
+DEFAULT_PS_DIR = Path("performance_tables") / "excess_power"
+
+
+def default_ps_axes(aircraft: str, mods: list[str], weight_steps: int = 5, mach_step: float = 0.01,
+                    alt_step_ft: int = 500) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Mach, altitude and weight axes shared by all mods of an aircraft, so the
+    mod-to-mod deltas line up point for point.
+    """
+    acs = [AIRCRAFT_CONFIG[(aircraft, mod)] for mod in mods]
+    _, reserve_fuel = default_fuel_policy(aircraft, mods[0])
+    mmo = max(float(ac[25]) for ac in acs)
+    ceiling = max(int(ac[8]) for ac in acs)
+    machs = np.round(np.arange(0.15, mmo + 1e-9, mach_step), 4)
+    alts = np.arange(0, ceiling + 1, int(alt_step_ft), dtype=float)
+    weights = np.linspace(min(float(ac[18]) for ac in acs) + reserve_fuel, max(float(ac[21]) for ac in acs),
+                          max(2, int(weight_steps)))
+    return machs, alts, weights
+
+
+def ps_frame(aircraft: str, mod: str, grid: dict, isa_dev: float) -> pd.DataFrame:
+    """Long-form Ps map, one row per (Mach, altitude, weight)."""
+    M, A, W = np.meshgrid(grid["machs"], grid["alts"], grid["weights"], indexing="ij")
+    return pd.DataFrame({
+        "aircraft": aircraft,
+        "mod": mod,
+        "isa_dev": float(isa_dev),
+        "mach": M.ravel(),
+        "alt_ft": A.ravel(),
+        "weight_lb": W.ravel(),
+        "vktas": grid["vktas"].ravel(),
+        "vkias": grid["vkias"].ravel(),
+        "thrust_lb": grid["thrust"].ravel(),
+        "drag_lb": grid["drag"].ravel(),
+        "cl": grid["cl"].ravel(),
+        "ps_fpm": grid["ps_fpm"].ravel(),
+        "gradient_pct": grid["gradient_pct"].ravel(),
+    })
+
+
+def save_ps_contours(aircraft: str, grids: dict, isa_dev: float, out_dir: str | Path) -> list[Path]:
+    """
+    Ps contours over Mach x altitude, one PNG per (mod, weight) with the
+    v_climb / m_climb schedule overlaid, plus mod-minus-Flatwing delta contours.
+    """
+    import plotly.graph_objects as go
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    base_mod = "Flatwing" if "Flatwing" in grids else next(iter(grids))
+    for mod, grid in grids.items():
+        terms = aircraft_terms(aircraft, mod)
+        schedule = climb_schedule_mach(terms, grid["alts"], isa_dev)
+        panels = [("ps", grid["ps_fpm"], "Ps (fpm)")]
+        if mod != base_mod:
+            panels.append(("delta", grid["ps_fpm"] - grids[base_mod]["ps_fpm"], f"Ps {mod} - {base_mod} (fpm)"))
+        for (kind, values, label), (i, w) in product(panels, enumerate(grid["weights"])):
+            fig = go.Figure()
+            fig.add_trace(go.Contour(
+                x=grid["machs"], y=grid["alts"], z=values[:, :, i].T,
+                colorscale=("RdBu" if kind == "delta" else "Viridis"),
+                zmid=(0.0 if kind == "delta" else None),
+                contours=dict(showlabels=True), colorbar=dict(title=label),
+            ))
+            fig.add_trace(go.Scatter(x=schedule, y=grid["alts"], mode="lines", name="Climb schedule",
+                                     line=dict(color="white" if kind == "ps" else "black", dash="dash")))
+            fig.update_layout(
+                title=f"{label} | {aircraft} {mod} | W {w:,.0f} lb | ISA {isa_dev:+.0f}°C",
+                xaxis_title="Mach", yaxis_title="Pressure Altitude (ft)", template="plotly_white",
+            )
+            name = f"{kind}_{aircraft}_{mod}_W{int(round(w))}_ISA{isa_dev:+.0f}C.png".replace("+", "p")
+            path = out_dir / name
+            fig.write_image(str(path), width=1400, height=1000, scale=2)
+            paths.append(path)
+    return paths
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Specific excess power (Ps) and climb-gradient maps")
+    p.add_argument("--aircraft", nargs="+", required=True, help="Aircraft models, e.g., CJ1 M2 C208B")
+    p.add_argument("--mods", nargs="+", default=["Flatwing", "Tamarack"], help="Mods to include")
+    p.add_argument("--isa", nargs="+", type=int, default=[0])
+    p.add_argument("--weight-steps", type=int, default=5)
+    p.add_argument("--mach-step", type=float, default=0.01)
+    p.add_argument("--alt-step", type=int, default=500, help="Altitude step (ft)")
+    p.add_argument("--out", type=str, default=None, help="Output directory (default performance_tables/excess_power)")
+    p.add_argument("--no-charts", action="store_true", help="Skip the PNG contour plots")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    out_dir = Path(args.out) if args.out else DEFAULT_PS_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    frames = []
+    t0 = time.perf_counter()
+    for aircraft in args.aircraft:
+        mods = [m for m in args.mods if (aircraft, m) in AIRCRAFT_CONFIG]
+        if not mods:
+            continue
+        machs, alts, weights = default_ps_axes(aircraft, mods, args.weight_steps, args.mach_step, args.alt_step)
+        for isa_dev in args.isa:
+            grids = {mod: excess_power_grid(aircraft, mod, machs, alts, weights, isa_dev) for mod in mods}
+            frames.extend(ps_frame(aircraft, mod, grid, isa_dev) for mod, grid in grids.items())
+            if not args.no_charts:
+                save_ps_contours(aircraft, grids, isa_dev, out_dir / "charts")
+    if not frames:
+        return
+    df = pd.concat(frames, ignore_index=True)
+    path = out_dir / "excess_power.parquet"
+    df.to_parquet(path)
+    print(f"Saved {path} ({len(df):,} points, {time.perf_counter() - t0:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
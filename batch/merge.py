@@ -0,0 +1,176 @@
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from batch.payload_range import (
+    SHARD_KEY_COLS,
+    make_aircraft_dirs,
+    parse_shard,
+    write_meta,
+    write_summary_plots,
+    write_summary_tables,
+)
+
+# Meta keys that legitimately differ between shards of one sweep
+_PER_SHARD_META = (
+    "shard", "shard_cases", "case_budget", "parallel_workers", "prescreened_out", "duplicate_cases",
+    "envelope_bounds", "output_dir", "run_type",
+)
+
+
+def load_shard(shard_dir: str | Path) -> dict:
+    """
+    Meta, result rows and case manifest written by one `payload_range --shard` run.
+
+    Returns:
+        dict: dir, meta (combined meta.json), aircraft_meta (aircraft -> meta.json),
+        rows (shard_rows.csv) and cases (shard_cases.csv).
+    """
+    shard_dir = Path(shard_dir)
+    meta_path = shard_dir / "meta.json"
+    if not meta_path.exists():
+        raise FileNotFoundError(f"{shard_dir}: no meta.json (shard not finished?)")
+    meta = json.loads(meta_path.read_text())
+    if not meta.get("shard"):
+        raise ValueError(f"{shard_dir}: not a sharded run (meta.json has no shard)")
+    aircraft_meta = {}
+    for aircraft in meta["aircraft_models"]:
+        path = shard_dir / aircraft / "meta.json"
+        aircraft_meta[aircraft] = json.loads(path.read_text()) if path.exists() else {}
+    rows_path, cases_path = shard_dir / "shard_rows.csv", shard_dir / "shard_cases.csv"
+    rows = pd.read_csv(rows_path) if rows_path.exists() and rows_path.stat().st_size > 1 else pd.DataFrame()
+    cases = pd.read_csv(cases_path) if cases_path.exists() else pd.DataFrame(columns=list(SHARD_KEY_COLS))
+    return {"dir": shard_dir, "meta": meta, "aircraft_meta": aircraft_meta, "rows": rows, "cases": cases}
+
+
+def _case_keys(df: pd.DataFrame) -> list[tuple]:
+    """Comparable grid-case keys (NaN -> None, floats to 4 decimals) of the SHARD_KEY_COLS of df."""
+    keys = []
+    for row in df.reindex(columns=list(SHARD_KEY_COLS)).itertuples(index=False):
+        keys.append(tuple(
+            None if v is None or (isinstance(v, float) and np.isnan(v)) else (round(float(v), 4) if isinstance(v, (int, float, np.number)) else v)
+            for v in row
+        ))
+    return keys
+
+
+def validate_shards(shards: list[dict]) -> list[str]:
+    """
+    Problems that make the shards an incomplete or inconsistent sweep: differing
+    run settings, missing or repeated shard indices, case counts that do not add
+    up to the grid, cases assigned to two shards and (for grid sweeps) assigned
+    cases with no result row.
+    """
+    problems = []
+    settings = [{k: v for k, v in s["meta"].items() if k not in _PER_SHARD_META} for s in shards]
+    for s, other in zip(shards[1:], settings[1:]):
+        diff = sorted(k for k in set(settings[0]) | set(other) if settings[0].get(k) != other.get(k))
+        if diff:
+            problems.append(f"{s['dir']}: settings differ from {shards[0]['dir']} ({', '.join(diff)})")
+
+    specs = [parse_shard(s["meta"]["shard"]) for s in shards]
+    counts = {n for _, n in specs}
+    if len(counts) != 1:
+        problems.append(f"Shards come from different splits: {sorted(counts)}")
+    count = max(counts)
+    indices = [i for i, _ in specs]
+    missing = sorted(set(range(1, count + 1)) - set(indices))
+    repeated = sorted({i for i in indices if indices.count(i) > 1})
+    if missing:
+        problems.append(f"Missing shards: {', '.join(f'{i}/{count}' for i in missing)}")
+    if repeated:
+        problems.append(f"Repeated shards: {', '.join(f'{i}/{count}' for i in repeated)}")
+
+    grid_cases = shards[0]["meta"].get("grid_cases")
+    assigned = sum(int(s["meta"].get("shard_cases", 0)) for s in shards)
+    if not missing and grid_cases is not None and assigned != grid_cases:
+        problems.append(f"Shards hold {assigned} cases but the grid has {grid_cases}")
+
+    owner = {}
+    for s in shards:
+        for key in _case_keys(s["cases"]):
+            if key in owner:
+                problems.append(f"Case {key} assigned to both {owner[key]} and {s['dir']}")
+            owner[key] = s["dir"]
+        if shards[0]["meta"].get("sweep_mode") == "grid":
+            done = set(_case_keys(s["rows"])) if not s["rows"].empty else set()
+            lost = [k for k in _case_keys(s["cases"]) if k not in done]
+            if lost:
+                problems.append(f"{s['dir']}: {len(lost)} assigned cases have no result row (first: {lost[0]})")
+    return problems
+
+
+def merge_shards(shard_dirs: list[str | Path], output_dir: str | Path, save_summary_plots: bool = True,
+                 force: bool = False) -> pd.DataFrame:
+    """
+    Combine the outputs of `payload_range --shard i/N` runs into one output
+    directory with the same combined_summary.*, per-aircraft CSVs, meta.json and
+    summary plots as a single-host run. Per-run plots and time series stay in the
+    shard directories (their paths in the rows remain valid on a shared filesystem).
+
+    Args:
+        shard_dirs: Output directories of the shards.
+        output_dir: Directory for the merged outputs.
+        force: Merge even if validate_shards reports problems.
+
+    Returns:
+        pd.DataFrame: The merged result rows.
+    """
+    shards = sorted((load_shard(d) for d in shard_dirs), key=lambda s: parse_shard(s["meta"]["shard"]))
+    problems = validate_shards(shards)
+    if problems and not force:
+        raise ValueError("Shards do not form a complete sweep:\n  " + "\n  ".join(problems))
+    for problem in problems:
+        print(f"[merge] warning: {problem}")
+
+    base_ts_dir = Path(output_dir)
+    base_ts_dir.mkdir(parents=True, exist_ok=True)
+    meta = shards[0]["meta"]
+    aircraft_models = list(meta["aircraft_models"])
+    aircraft_dirs = make_aircraft_dirs(base_ts_dir, aircraft_models)
+
+    df = pd.concat([s["rows"] for s in shards if not s["rows"].empty], ignore_index=True)
+    crosschecks = [pd.read_csv(s["dir"] / "fast_crosscheck.csv") for s in shards if (s["dir"] / "fast_crosscheck.csv").exists()]
+    if crosschecks:
+        pd.concat(crosschecks, ignore_index=True).to_csv(base_ts_dir / "fast_crosscheck.csv", index=False)
+
+    settings = {k: v for k, v in meta.items() if k not in _PER_SHARD_META and k != "aircraft_models"}
+    settings.update({
+        "shard": None,
+        "shard_cases": int(sum(int(s["meta"].get("shard_cases", 0)) for s in shards)),
+        "merged_shards": [str(s["dir"]) for s in shards],
+    })
+    prescreened_out, duplicate_cases, envelope_bounds = {}, {}, {}
+    for s in shards:
+        envelope_bounds.update(s["meta"].get("envelope_bounds") or {})
+        for aircraft, a_meta in s["aircraft_meta"].items():
+            prescreened_out[aircraft] = prescreened_out.get(aircraft, 0) + int(a_meta.get("prescreened_out", 0))
+            duplicate_cases[aircraft] = duplicate_cases.get(aircraft, 0) + int(a_meta.get("duplicate_cases", 0))
+
+    write_summary_tables(df, base_ts_dir, aircraft_dirs)
+    write_meta(base_ts_dir, aircraft_dirs, settings, prescreened_out, duplicate_cases, envelope_bounds)
+    if save_summary_plots:
+        write_summary_plots(df, aircraft_dirs)
+    return df
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Merge sharded payload-range sweep outputs (payload_range --shard i/N)")
+    p.add_argument("shards", nargs="+", help="Shard output directories")
+    p.add_argument("--out", type=str, required=True, help="Output directory for the merged sweep")
+    p.add_argument("--no-summary-plots", action="store_true", help="Skip the summary PNG plots")
+    p.add_argument("--force", action="store_true", help="Merge even if shards are missing or inconsistent")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    df = merge_shards(args.shards, args.out, save_summary_plots=not args.no_summary_plots, force=args.force)
+    print(f"Merged {len(args.shards)} shards ({len(df):,} rows) into {args.out}")
+
+
+if __name__ == "__main__":
+    main()
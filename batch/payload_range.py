@@ -1,8 +1,10 @@
 import argparse
+import asyncio
+import shutil
 from pathlib import Path
 from datetime import datetime
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
-from itertools import product
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import count, product
 
 import numpy as np
 import pandas as pd
@@ -14,6 +16,44 @@ except ImportError:
     TURBOPROP_PARAMS = {}
 from simulation import run_simulation
 from flight_physics import atmos
+from batch.terminal_tables import load_or_build_terminal_table
+from batch.climb_tables import load_or_build_climb_table
+from batch.envelope import envelope_grid_bounds, trim_grid_to_bound
+from performance import aircraft_terms, cruise_point, fast_mission, screen_cases
+from config_overrides import VARIANT_SEP, ensure_config, expand_config_variants, parse_param_axis
+from batch.work_queue import LEASE_TIMEOUT_S, close_queue, init_queue, run_queued
+from batch.case_plots import case_hash, figure_arrays, save_plot_data
+from batch.summary_plots import build_plot_specs, render_specs
+from batch.timeseries import DATASET_DIR, TimeseriesDatasetWriter, pa, timeseries_case_id
+from job_client import JobClient, format_progress
+
+# Keys of a batch case dict (inputs to run_single_case); result rows carry these plus outputs
+_CASE_KEYS = (
+    "aircraft", "mod", "flap", "isa_dev", "cruise_alt", "mach", "kias", "ktas", "payload",
+    "taxi_fuel", "reserve_fuel", "save_plot", "plot_path", "plot_data_path", "save_timeseries", "timeseries_path",
+    "base_mod", "config_params",
+)
+# Columns identifying a grid case in shard manifests (batch.merge checks coverage on these)
+SHARD_KEY_COLS = ("aircraft", "mod", "flap", "isa_dev", "cruise_alt", "mach", "kias", "ktas", "payload")
+# Predicted runtime model for shard balancing: fine-step takeoff/landing work in units of
+# one cruise step, plus one unit per CRUISE_STEP_S of predicted flight time
+TERMINAL_STEP_COST = 300.0
+CRUISE_STEP_S = 5.0
+# Output stage of execute_cases: writer processes for per-run PNGs/timeseries, and
+# rows that may wait for them (per writer) before case submission is held back
+IO_WORKERS = 2
+IO_QUEUE_PER_WORKER = 4
+
+
+def mod_sort_order(mods) -> pd.CategoricalDtype:
+    """Flatwing before Tamarack, each base mod followed by its config-override variants."""
+    base_rank = {"Flatwing": 0, "Tamarack": 1}
+
+    def key(mod):
+        base, sep, params = str(mod).partition(VARIANT_SEP)
+        return (base_rank.get(base, len(base_rank)), base, bool(sep), params)
+
+    return pd.CategoricalDtype(sorted({str(m) for m in mods}, key=key), ordered=True)
 
 
 def build_mach_grid(mmo: float) -> list[float]:
@@ -55,6 +95,306 @@ def payload_sweep(max_payload_lb: float, num_steps: int) -> list[int]:
     return vals
 
 
+def payload_corners(bow: float, mzfw: float, mrw: float, max_fuel: float) -> list[int]:
+    """Payloads at the payload-range chart corners: MZFW, the MRW/max-fuel knee and zero (ferry)."""
+    max_payload = max(0.0, mzfw - bow)
+    vals = {int(round(max_payload)), 0}
+    knee = mrw - bow - max_fuel  # Heaviest payload that still allows full tanks at MRW
+    if 0 < knee < max_payload:
+        vals.add(int(round(knee)))
+    return sorted(vals, reverse=True)
+
+
+def _speed_key(case: dict) -> str:
+    """Which case field carries the swept speed: ktas (TAS grid), kias (IAS grid) or mach."""
+    if case.get("ktas") is not None:
+        return "ktas"
+    if case.get("kias") is not None:
+        return "kias"
+    return "mach"
+
+
+def _case_with(case: dict, **updates) -> dict:
+    """Copy of case with new payload/cruise_alt/speed values, renaming per-run output files to match."""
+    new_case = {**case, **updates}
+    if "ktas" in updates:
+        new_case["kias"] = kias_from_tas(float(new_case["ktas"]), int(new_case["cruise_alt"]), float(new_case["isa_dev"]))
+    tokens = [("payload", "_payload{}.", lambda v: int(v)), ("cruise_alt", "_alt{}_", lambda v: int(v)),
+              ("mach", "_mach{}_", lambda v: f"{float(v):.2f}"), ("kias", "_kias{}_", lambda v: int(v)),
+              ("ktas", "_tas{}_", lambda v: int(v))]
+    for key in ("plot_path", "plot_data_path", "timeseries_path"):
+        if case.get(key) is None:
+            continue
+        name = Path(case[key]).name
+        for field, pattern, fmt in tokens:
+            if field in updates and case.get(field) is not None:
+                name = name.replace(pattern.format(fmt(case[field])), pattern.format(fmt(updates[field])))
+        new_case[key] = Path(case[key]).with_name(name)
+    return new_case
+
+
+def refine_payload_points(results: list[dict], evaluate, tol_nm: float, max_rounds: int = 3,
+                          min_step_lb: int = 50) -> list[dict]:
+    """
+    Add payload cases between existing ones wherever linear interpolation of range is poor.
+
+    Each round evaluates the midpoint of every open payload interval (per aircraft, mod,
+    flap, ISA, altitude and speed) and keeps splitting the intervals whose midpoint range
+    differs from the straight line between its neighbours by more than tol_nm.
+
+    Args:
+        results: Rows already evaluated (run_single_case output format).
+        evaluate: Callable taking a list of cases and returning their result rows.
+        tol_nm: Interpolation error (NM) above which an interval is split again.
+        max_rounds: Maximum number of refinement rounds.
+        min_step_lb: Intervals narrower than twice this are not split.
+    """
+    group_cols = ("aircraft", "mod", "flap", "isa_dev", "cruise_alt", "mach", "kias", "ktas")
+
+    def group_key(row):
+        return tuple(row.get(c) for c in group_cols)
+
+    def dist(row):
+        return pd.to_numeric(pd.Series([row.get("total_dist_nm")]), errors="coerce").iloc[0]
+
+    all_rows = list(results)
+    groups = {}
+    for row in all_rows:
+        groups.setdefault(group_key(row), []).append(row)
+    pending = []
+    for rows in groups.values():
+        rows = sorted(rows, key=lambda r: r["payload"])
+        pending.extend(zip(rows, rows[1:]))
+
+    for _ in range(max_rounds):
+        probes = []
+        for lo, hi in pending:
+            if hi["payload"] - lo["payload"] < 2 * min_step_lb or np.isnan(dist(lo)) or np.isnan(dist(hi)):
+                continue
+            mid = int(round(0.5 * (lo["payload"] + hi["payload"])))
+            case = _case_with({k: v for k, v in lo.items() if k in _CASE_KEYS}, payload=mid)
+            probes.append((lo, hi, case))
+        if not probes:
+            break
+        new_rows = {(group_key(r), r["payload"]): r for r in evaluate([p[2] for p in probes])}
+        pending = []
+        for lo, hi, case in probes:
+            row = new_rows.get((group_key(case), case["payload"]))
+            if row is None:
+                continue
+            frac = (case["payload"] - lo["payload"]) / (hi["payload"] - lo["payload"])
+            err = abs(dist(row) - (dist(lo) + frac * (dist(hi) - dist(lo))))
+            row["interp_error_nm"] = err
+            all_rows.append(row)
+            if err > tol_nm:
+                pending.extend([(lo, row), (row, hi)])
+    return all_rows
+
+
+def coarsen_grid(values: list, stride: int = 3) -> list:
+    """Every stride-th value of a sorted grid, always keeping both ends."""
+    values = sorted(values)
+    keep = values[::stride]
+    if values and keep[-1] != values[-1]:
+        keep.append(values[-1])
+    return keep
+
+
+def adaptive_refine(results: list[dict], evaluate, case_budget: int, tol_nm: float = 10.0,
+                    min_alt_step_ft: int = 1000, min_speed_step: dict | None = None, max_rounds: int = 8) -> list[dict]:
+    """
+    Add altitude and speed cases where they change the answer, within a total case budget.
+
+    Neighbouring cases along the altitude axis (same speed) and along the speed axis (same
+    altitude) form intervals. An interval is refined at its midpoint when the feasibility
+    flags or status flip across it, or when range changes by more than tol_nm; flips are
+    refined first, then the largest range changes, so the optimum altitude/speed and the
+    altitude_limited/mach_limited edges get resolution while flat regions do not.
+
+    Args:
+        results: Rows of the coarse sweep (run_single_case output format).
+        evaluate: Callable taking a list of cases and returning their result rows.
+        case_budget: Maximum total number of cases, including the coarse ones.
+        tol_nm: Range change (NM) below which an interval with no flag flip is left alone.
+        min_alt_step_ft: Altitude resolution; intervals narrower than twice this are final.
+        min_speed_step: Speed resolution per speed field (mach, kias, ktas).
+        max_rounds: Maximum number of refinement rounds.
+    """
+    min_speed_step = {"mach": 0.01, "kias": 5.0, "ktas": 5.0, **(min_speed_step or {})}
+    base_cols = ("aircraft", "mod", "flap", "isa_dev", "payload")
+
+    def dist(row):
+        return pd.to_numeric(pd.Series([row.get("total_dist_nm")]), errors="coerce").iloc[0]
+
+    def flags(row):
+        return (row.get("status"), bool(row.get("altitude_limited")), bool(row.get("mach_limited")))
+
+    all_rows = list(results)
+    seen = {(tuple(r.get(c) for c in base_cols), int(r["cruise_alt"]), round(float(r[_speed_key(r)]), 4)) for r in all_rows}
+    for _ in range(max_rounds):
+        remaining = case_budget - len(all_rows)
+        if remaining <= 0:
+            break
+        by_alt_axis, by_speed_axis = {}, {}
+        for r in all_rows:
+            skey = _speed_key(r)
+            base = tuple(r.get(c) for c in base_cols)
+            by_alt_axis.setdefault((base, skey, r[skey]), []).append(r)
+            by_speed_axis.setdefault((base, skey, r["cruise_alt"]), []).append(r)
+
+        candidates = {}
+        for axis, groups in (("cruise_alt", by_alt_axis), ("speed", by_speed_axis)):
+            for (base, skey, _), rows in groups.items():
+                field = "cruise_alt" if axis == "cruise_alt" else skey
+                step = min_alt_step_ft if axis == "cruise_alt" else min_speed_step[skey]
+                rows = sorted(rows, key=lambda r: float(r[field]))
+                for lo, hi in zip(rows, rows[1:]):
+                    if float(hi[field]) - float(lo[field]) < 2 * step - 1e-9:
+                        continue
+                    d_lo, d_hi = dist(lo), dist(hi)
+                    if flags(lo) != flags(hi) or np.isnan(d_lo) != np.isnan(d_hi):
+                        score = 1e9 + (abs(d_hi - d_lo) if not (np.isnan(d_lo) or np.isnan(d_hi)) else 0.0)
+                    elif not np.isnan(d_lo) and abs(d_hi - d_lo) > tol_nm:
+                        score = abs(d_hi - d_lo)
+                    else:
+                        continue
+                    mid = round(0.5 * (float(lo[field]) + float(hi[field])) / step) * step
+                    if not float(lo[field]) < mid < float(hi[field]):
+                        continue
+                    mid = int(mid) if field in ("cruise_alt", "kias", "ktas") else round(mid, 2)
+                    case = _case_with({k: v for k, v in lo.items() if k in _CASE_KEYS}, **{field: mid})
+                    key = (base, int(case["cruise_alt"]), round(float(case[skey]), 4))
+                    if key not in seen and score > candidates.get(key, (-1, None))[0]:
+                        candidates[key] = (score, case)
+        if not candidates:
+            break
+        picked = sorted(candidates.items(), key=lambda kv: kv[1][0], reverse=True)[:remaining]
+        seen.update(k for k, _ in picked)
+        all_rows.extend(evaluate([case for _, (_, case) in picked]))
+    return all_rows
+
+
+def effective_case_key(case: dict) -> tuple:
+    """
+    The inputs run_simulation actually sees for a case: payload, initial fuel after
+    the MRW/max-fuel clamp, altitude, speed goal (IAS after TAS conversion, to 0.1 kt),
+    ISA, flap and the taxi/reserve policy.
+    """
+    ac = AIRCRAFT_CONFIG[(case["aircraft"], case["mod"])]
+    fuel = compute_initial_fuel(ac[22], ac[20], ac[18], case["payload"])
+    kias = case.get("kias")
+    return (
+        case["aircraft"], case["mod"], int(case["flap"]), float(case["isa_dev"]), int(case["cruise_alt"]),
+        round(float(case["mach"]), 4), None if kias is None else round(float(kias), 1),
+        float(case["payload"]), round(fuel, 1), float(case["taxi_fuel"]), float(case["reserve_fuel"]),
+    )
+
+
+def dedupe_cases(cases: list[dict]) -> tuple[list[dict], list[list[int]]]:
+    """
+    Collapse cases with identical effective simulation inputs.
+
+    Returns:
+        tuple: (unique cases, groups) where groups[i] lists the indices into cases
+        that unique case i stands for; its first entry is the case itself.
+    """
+    index = {}
+    unique, groups = [], []
+    for i, case in enumerate(cases):
+        key = effective_case_key(case)
+        if key not in index:
+            index[key] = len(unique)
+            unique.append(case)
+            groups.append([])
+        groups[index[key]].append(i)
+    return unique, groups
+
+
+def fan_out_result(row: dict, case: dict) -> dict:
+    """Result row for a duplicate case: outputs of its representative, inputs (and file names) of its own."""
+    out = {**row, **{k: case[k] for k in _CASE_KEYS if k in case}, "deduplicated": True}
+    for key in ("plot_path", "plot_data_path", "timeseries_path"):
+        src, dst = row.get(key), case.get(key)
+        if src is not None and dst is not None and Path(src) != Path(dst) and Path(src).exists():
+            Path(dst).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(src, dst)
+    return out
+
+
+def _crash_row(case: dict, e: Exception) -> dict:
+    return {**case, "status": "error", "error_message": str(e),
+            "total_dist_nm": np.nan, "total_time_min": np.nan, "fuel_burned_lb": np.nan,
+            "first_level_off_ft": np.nan, "cruise_vktas_kts": np.nan}
+
+
+async def _case_pipeline(cases: list[dict], worker_func, io_func, executor, io_executor,
+                         parallel_workers: int, io_workers: int, sink=None, sink_executor=None) -> list[dict]:
+    """
+    Compute stage (worker_func in executor) feeding a bounded queue drained by
+    io_workers writer tasks (sink in sink_executor for rows carrying a time
+    series, then io_func in io_executor). A case is only submitted
+    while fewer than parallel_workers + queue_size rows are computing, queued or
+    being written, so slow output holds back new submissions instead of memory
+    growing without bound.
+    """
+    loop = asyncio.get_running_loop()
+    queue_size = IO_QUEUE_PER_WORKER * io_workers
+    queue = asyncio.Queue(maxsize=queue_size)
+    slots = asyncio.Semaphore(parallel_workers + queue_size)
+    results = []
+
+    async def compute(case):
+        await slots.acquire()
+        try:
+            row = await loop.run_in_executor(executor, worker_func, case)
+        except Exception as e:
+            row = _crash_row(case, e)
+        await queue.put(row)
+
+    async def write():
+        while (row := await queue.get()) is not None:
+            if sink is not None and "timeseries" in row.get("_outputs", {}):
+                try:
+                    row = await loop.run_in_executor(sink_executor, sink, row)
+                except Exception as e:
+                    row = {**{k: v for k, v in row.items() if k != "_outputs"}, "output_error_message": str(e)}
+            if io_func is not None and "_outputs" in row:
+                try:
+                    row = await loop.run_in_executor(io_executor, io_func, row)
+                except Exception as e:
+                    row = {**{k: v for k, v in row.items() if k != "_outputs"}, "output_error_message": str(e)}
+            results.append(row)
+            slots.release()
+
+    writers = [asyncio.create_task(write()) for _ in range(io_workers)]
+    await asyncio.gather(*(compute(c) for c in cases))
+    for _ in writers:
+        await queue.put(None)
+    await asyncio.gather(*writers)
+    return results
+
+
+def execute_cases(cases: list[dict], worker_func, parallel_workers: int = 6, use_threads: bool = False,
+                  io_func=None, io_workers: int = IO_WORKERS, sink=None) -> list[dict]:
+    """
+    Run worker_func over cases in a process (or thread) pool, converting worker
+    crashes to error rows. With io_func, rows carrying deferred outputs (see
+    run_single_case) are handed to io_func in a separate pool of io_workers, so
+    PNG rendering and timeseries writes overlap the simulations. With sink, rows
+    carrying a time series pass through sink first, on one thread of this
+    process (it appends to shared files, e.g. TimeseriesDatasetWriter).
+
+    Returns:
+        list[dict]: Result rows in completion order.
+    """
+    io_workers = max(1, int(io_workers))
+    Executor = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+    with Executor(max_workers=parallel_workers) as ex, Executor(max_workers=io_workers) as io_ex, \
+            ThreadPoolExecutor(max_workers=1) as sink_ex:
+        return asyncio.run(_case_pipeline(cases, worker_func, io_func, ex, io_ex, parallel_workers, io_workers,
+                                          sink, sink_ex))
+
+
 def compute_initial_fuel(max_fuel: float, mrw: float, bow: float, payload: float) -> float:
     max_fuel_by_weight = mrw - (bow + payload)
     return float(max(0.0, min(max_fuel, max_fuel_by_weight)))
@@ -75,7 +415,64 @@ def kias_from_tas(ktas: float, cruise_alt_ft: int, isa_dev_c: float) -> float:
         return float(ktas)  # Fallback: treat TAS as IAS if conversion fails
 
 
-def run_single_case(case: dict, hide_mach_limited: bool = False, hide_altitude_limited: bool = False) -> dict:
+def apply_hidden_flags(out: dict, hide_mach_limited: bool, hide_altitude_limited: bool) -> dict:
+    # If hiding Mach-limited cases, replace numeric outputs with 'n/p'
+    if hide_mach_limited and out.get("mach_limited", False):
+        # Replace numeric result fields with 'n/p'
+        for key in ["total_dist_nm", "total_time_min", "fuel_burned_lb", "first_level_off_ft", "cruise_vktas_kts", "cruise_vkias_kts"]:
+            if key in out and out[key] is not None:
+                out[key] = "n/p"
+        out["status"] = "mach_limited"
+
+    # If hiding Altitude-limited cases, replace numeric outputs with 'n/p'
+    if hide_altitude_limited and out.get("altitude_limited", False):
+        # Replace numeric result fields with 'n/p'
+        for key in ["total_dist_nm", "total_time_min", "fuel_burned_lb", "first_level_off_ft", "cruise_vktas_kts"]:
+            if key in out and out[key] is not None:
+                out[key] = "n/p"
+        out["status"] = "altitude_limited"
+    return out
+
+
+def write_case_outputs(row: dict) -> dict:
+    """
+    Write the per-run PNG (or deferred plot data) and timeseries carried in
+    row["_outputs"] (run_single_case with defer_outputs) to the case's plot_path,
+    plot_data_path and timeseries_path.
+
+    Returns:
+        dict: The row without "_outputs", with failed writes recorded in its status.
+    """
+    out = {k: v for k, v in row.items() if k != "_outputs"}
+    outputs = row.get("_outputs") or {}
+    if outputs.get("plot") is not None:
+        try:
+            plot_path = Path(row["plot_path"])
+            plot_path.parent.mkdir(parents=True, exist_ok=True)
+            outputs["plot"].write_image(str(plot_path), width=1600, height=900, scale=2)
+        except Exception as e:
+            out["status"] = "plot_error" if out["status"] == "ok" else out["status"]
+            out["plot_error_message"] = str(e)
+    if outputs.get("plot_data") is not None:
+        try:
+            save_plot_data(row["plot_data_path"], outputs["plot_data"])
+        except Exception as e:
+            out["status"] = "plot_error" if out["status"] == "ok" else out["status"]
+            out["plot_error_message"] = str(e)
+    if outputs.get("timeseries") is not None:
+        try:
+            ts_path = Path(row["timeseries_path"])
+            ts_path.parent.mkdir(parents=True, exist_ok=True)
+            outputs["timeseries"].to_parquet(ts_path)
+        except Exception as e:
+            out["status"] = "ts_error" if out["status"] == "ok" else out["status"]
+            out["timeseries_error_message"] = str(e)
+    return out
+
+
+def run_single_case(case: dict, hide_mach_limited: bool = False, hide_altitude_limited: bool = False,
+                    terminal_tables: dict | None = None, climb_tables: dict | None = None,
+                    defer_outputs: bool = False) -> dict:
     try:
         (
             aircraft,
@@ -105,7 +502,7 @@ def run_single_case(case: dict, hide_mach_limited: bool = False, hide_altitude_l
         arr = "KSAN"
 
         # Compute initial fuel respecting MRW and tank capacity
-        ac = AIRCRAFT_CONFIG[(aircraft, mod)]
+        ac = ensure_config(aircraft, mod)
         bow = ac[18]
         max_fuel = ac[22]
         mrw = ac[20]
@@ -140,6 +537,8 @@ def run_single_case(case: dict, hide_mach_limited: bool = False, hide_altitude_l
             cruise_kias=(float(kias) if kias is not None else None),
             isa_dev_c=float(isa_dev),
             range_mode=True,
+            terminal_table=(terminal_tables or {}).get((aircraft, mod, int(flap))),
+            climb_table=(climb_tables or {}).get((aircraft, mod, int(flap))),
         )
 
         # Extract outputs
@@ -227,41 +626,22 @@ def run_single_case(case: dict, hide_mach_limited: bool = False, hide_altitude_l
             out["achieved_mach"] = None
             out["mach_limited"] = True
         
-        # If hiding Mach-limited cases, replace numeric outputs with 'n/p'
-        if hide_mach_limited and out.get("mach_limited", False):
-            # Replace numeric result fields with 'n/p'
-            for key in ["total_dist_nm", "total_time_min", "fuel_burned_lb", "first_level_off_ft", "cruise_vktas_kts", "cruise_vkias_kts"]:
-                if key in out and out[key] is not None:
-                    out[key] = "n/p"
-            out["status"] = "mach_limited"
-        
-        # If hiding Altitude-limited cases, replace numeric outputs with 'n/p'
-        if hide_altitude_limited and out.get("altitude_limited", False):
-            # Replace numeric result fields with 'n/p'
-            for key in ["total_dist_nm", "total_time_min", "fuel_burned_lb", "first_level_off_ft", "cruise_vktas_kts"]:
-                if key in out and out[key] is not None:
-                    out[key] = "n/p"
-            out["status"] = "altitude_limited"
-        # Save per-run PNG
+        apply_hidden_flags(out, hide_mach_limited, hide_altitude_limited)
+        # Per-run PNG and timeseries, written here or (defer_outputs) by the I/O stage of execute_cases
+        outputs = {}
         if case.get("save_plot") and results.get("fuel_distance_plot") is not None:
-            try:
-                fig = results["fuel_distance_plot"]
-                plot_path: Path = case["plot_path"]
-                plot_path.parent.mkdir(parents=True, exist_ok=True)
-                fig.write_image(str(plot_path), width=1600, height=900, scale=2)
-            except Exception as e:
-                out["status"] = "plot_error" if out["status"] == "ok" else out["status"]
-                out["plot_error_message"] = str(e)
-        # Save per-run timeseries
+            if case.get("plot_data_path") is not None:
+                # Deferred plot: keep the arrays; batch.case_plots renders the PNG on request
+                outputs["plot_data"] = figure_arrays(results["fuel_distance_plot"])
+                out["plot_hash"] = case_hash(outputs["plot_data"])
+            else:
+                outputs["plot"] = results["fuel_distance_plot"]
         if case.get("save_timeseries") and isinstance(df, pd.DataFrame) and not df.empty:
-            try:
-                ts_path: Path = case["timeseries_path"]
-                ts_path.parent.mkdir(parents=True, exist_ok=True)
-                df.to_parquet(ts_path)
-            except Exception as e:
-                out["status"] = "ts_error" if out["status"] == "ok" else out["status"]
-                out["timeseries_error_message"] = str(e)
-        return out
+            outputs["timeseries"] = df
+        if not outputs:
+            return out
+        out["_outputs"] = outputs
+        return out if defer_outputs else write_case_outputs(out)
     except Exception as e:
         return {
             **case,
@@ -275,6 +655,377 @@ def run_single_case(case: dict, hide_mach_limited: bool = False, hide_altitude_l
         }
 
 
+def screen_batch_cases(cases: list[dict], roc_margin: float = 0.15) -> list[dict]:
+    """
+    Vectorized feasibility pre-screen of batch cases (see performance.screen_cases).
+
+    Cases are grouped by (aircraft, mod) and each group is screened in one call.
+    Returns one prediction dict per case, in input order, with prescreen_class,
+    prescreen_altitude, prescreen_mach, predicted_roc_fpm and predicted_max_mach.
+    """
+    predictions = [None] * len(cases)
+    groups = {}
+    for i, case in enumerate(cases):
+        groups.setdefault((case["aircraft"], case["mod"]), []).append(i)
+    for (aircraft, mod), idx in groups.items():
+        ac = AIRCRAFT_CONFIG[(aircraft, mod)]
+        bow, max_fuel, mrw = ac[18], ac[22], ac[20]
+        payload = np.array([float(cases[i]["payload"]) for i in idx])
+        taxi = np.array([float(cases[i]["taxi_fuel"]) for i in idx])
+        fuel = np.array([compute_initial_fuel(max_fuel, mrw, bow, p) for p in payload])
+        speed = [float(cases[i]["kias"]) if cases[i].get("kias") is not None else float(cases[i]["mach"]) for i in idx]
+        res = screen_cases(
+            aircraft, mod, bow + payload + fuel - taxi, bow + payload,
+            [float(cases[i]["reserve_fuel"]) for i in idx], [cases[i]["cruise_alt"] for i in idx],
+            [cases[i]["isa_dev"] for i in idx], speed, roc_margin=roc_margin,
+        )
+        for n, i in enumerate(idx):
+            predictions[i] = {
+                "prescreen_class": str(res["prescreen_class"][n]),
+                "prescreen_altitude": str(res["altitude_class"][n]),
+                "prescreen_mach": str(res["mach_class"][n]),
+                "predicted_roc_fpm": round(float(res["predicted_roc_fpm"][n]), 1),
+                "predicted_max_mach": round(float(res["predicted_max_mach"][n]), 4),
+            }
+    return predictions
+
+
+def prescreened_row(case: dict, hide_mach_limited: bool = False, hide_altitude_limited: bool = False) -> dict:
+    """Result row for a case skipped by the pre-screen, flagged with its predicted limits."""
+    out = {
+        **case,
+        "status": "prescreened_out",
+        "error_message": "Predicted infeasible before dispatch",
+        "total_dist_nm": np.nan,
+        "total_time_min": np.nan,
+        "fuel_burned_lb": np.nan,
+        "first_level_off_ft": np.nan,
+        "cruise_vktas_kts": np.nan,
+        "cruise_vkias_kts": np.nan,
+        "altitude_limited": case.get("prescreen_altitude") == "infeasible",
+        "mach_limited": case.get("prescreen_mach") == "infeasible",
+    }
+    return apply_hidden_flags(out, hide_mach_limited, hide_altitude_limited)
+
+
+def run_fast_cases(cases: list[dict], climb_tables: dict, hide_mach_limited: bool = False,
+                   hide_altitude_limited: bool = False) -> list[dict]:
+    """
+    Evaluate cases with the vectorized specific-range model instead of run_simulation.
+
+    Cases are grouped by (aircraft, mod, flap) and each group is solved in one
+    fast_mission() call. Rows carry the same keys as run_single_case output.
+    """
+    rows = []
+    groups = {}
+    for case in cases:
+        groups.setdefault((case["aircraft"], case["mod"], int(case["flap"])), []).append(case)
+    for (aircraft, mod, flap), group in groups.items():
+        ac = AIRCRAFT_CONFIG[(aircraft, mod)]
+        bow, max_fuel, mrw = ac[18], ac[22], ac[20]
+        fuels = np.array([compute_initial_fuel(max_fuel, mrw, bow, c["payload"]) for c in group])
+        taxi = np.array([float(c["taxi_fuel"]) for c in group])
+        reserve = np.array([float(c["reserve_fuel"]) for c in group])
+        has_fuel = fuels - reserve - taxi > 0
+        speed = [float(c["kias"]) if c.get("kias") is not None else float(c["mach"]) for c in group]
+        res = None
+        if has_fuel.any():
+            idx = np.flatnonzero(has_fuel)
+            res = fast_mission(
+                aircraft, mod, climb_tables[(aircraft, mod, flap)],
+                [group[i]["payload"] for i in idx], fuels[idx], taxi[idx], reserve[idx],
+                [group[i]["cruise_alt"] for i in idx], [group[i]["isa_dev"] for i in idx], [speed[i] for i in idx],
+            )
+            pos = {i: n for n, i in enumerate(idx)}
+        for i, case in enumerate(group):
+            if not has_fuel[i]:
+                rows.append({
+                    **case,
+                    "status": "infeasible",
+                    "error_message": "No mission fuel (initial <= reserve + taxi)",
+                    "total_dist_nm": np.nan,
+                    "total_time_min": np.nan,
+                    "fuel_burned_lb": np.nan,
+                    "first_level_off_ft": np.nan,
+                    "cruise_vktas_kts": np.nan,
+                })
+                continue
+            n = pos[i]
+            achieved_alt = int(res["first_level_off_ft"][n])
+            achieved_mach = float(res["achieved_mach"][n])
+            out = {
+                **case,
+                "initial_fuel_lb": int(fuels[i]),
+                "takeoff_weight_lb": int(bow + case["payload"] + fuels[i] - taxi[i]),
+                "status": "ok",
+                "error_message": None,
+                "total_dist_nm": float(res["total_dist_nm"][n]),
+                "total_time_min": int(res["total_time_min"][n]),
+                "fuel_burned_lb": int(fuels[i] - taxi[i] - reserve[i]),
+                "first_level_off_ft": achieved_alt,
+                "cruise_vktas_kts": float(res["cruise_vktas_kts"][n]),
+                "cruise_vkias_kts": float(res["cruise_vkias_kts"][n]),
+                "achieved_alt_ft": achieved_alt,
+                "altitude_limited": achieved_alt + 500 < int(case["cruise_alt"]),
+                "achieved_mach": achieved_mach,
+                "mach_limited": (achieved_mach + 1e-3) < float(case["mach"]),
+            }
+            rows.append(apply_hidden_flags(out, hide_mach_limited, hide_altitude_limited))
+    return rows
+
+
+def cross_check_fast_cases(fast_rows: list[dict], climb_tables: dict, num_cases: int = 4,
+                           parallel_workers: int = 6) -> pd.DataFrame:
+    """Re-run a spread of fast-mode cases with full physics and report the differences."""
+    ok_rows = [r for r in fast_rows if r.get("status") == "ok"]
+    if not ok_rows or num_cases <= 0:
+        return pd.DataFrame()
+    picks = [ok_rows[i] for i in sorted({int(round(x)) for x in np.linspace(0, len(ok_rows) - 1, num_cases)})]
+    case_keys = ("aircraft", "mod", "flap", "isa_dev", "cruise_alt", "mach", "kias", "payload", "taxi_fuel", "reserve_fuel")
+    checks = [{k: r.get(k) for k in case_keys} for r in picks]
+    with ProcessPoolExecutor(max_workers=parallel_workers) as ex:
+        full_rows = list(ex.map(run_single_case, checks))
+    report = []
+    for fast, full in zip(picks, full_rows):
+        row = {k: fast.get(k) for k in ("aircraft", "mod", "flap", "isa_dev", "cruise_alt", "mach", "kias", "payload")}
+        for key in ("total_dist_nm", "total_time_min", "first_level_off_ft", "cruise_vktas_kts"):
+            a = pd.to_numeric(pd.Series([full.get(key)]), errors="coerce").iloc[0]
+            b = pd.to_numeric(pd.Series([fast.get(key)]), errors="coerce").iloc[0]
+            row[f"{key}_full"] = a
+            row[f"{key}_fast"] = b
+            row[f"{key}_delta"] = b - a
+        row["total_dist_pct_delta"] = 100.0 * row["total_dist_nm_delta"] / row["total_dist_nm_full"] if row["total_dist_nm_full"] else np.nan
+        report.append(row)
+    return pd.DataFrame(report)
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """Parse a shard spec "i/N" (1 <= i <= N) into (i, N)."""
+    try:
+        index, count = (int(x) for x in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Cannot parse shard '{spec}' (expected i/N, e.g. 2/4)") from None
+    if not 1 <= index <= count:
+        raise ValueError(f"Shard index out of range in '{spec}' (expected 1 <= i <= N)")
+    return index, count
+
+
+def predict_case_cost(cases: list[dict]) -> np.ndarray:
+    """
+    Predicted relative runtime of each case: a fixed terminal-phase cost plus one
+    unit per fixed cruise step of the predicted flight time, i.e. mission fuel over
+    the cruise fuel flow at mid-mission weight (performance.cruise_point).
+    """
+    cost = np.full(len(cases), TERMINAL_STEP_COST)
+    groups = {}
+    for i, case in enumerate(cases):
+        groups.setdefault((case["aircraft"], case["mod"]), []).append(i)
+    for (aircraft, mod), idx in groups.items():
+        terms = aircraft_terms(aircraft, mod)
+        payload = np.array([float(cases[i]["payload"]) for i in idx])
+        fuel = np.array([compute_initial_fuel(terms["max_fuel"], terms["mrw"], terms["bow"], p) for p in payload])
+        mission_fuel = np.maximum(
+            fuel - np.array([float(cases[i]["taxi_fuel"]) + float(cases[i]["reserve_fuel"]) for i in idx]), 0.0)
+        speed = [float(cases[i]["kias"]) if cases[i].get("kias") is not None else float(cases[i]["mach"]) for i in idx]
+        cruise = cruise_point(terms, terms["bow"] + payload + fuel - 0.5 * mission_fuel,
+                              [cases[i]["cruise_alt"] for i in idx], [cases[i]["isa_dev"] for i in idx], speed)
+        hours = mission_fuel / np.maximum(cruise["fuel_flow"], 1.0)
+        cost[idx] += np.nan_to_num(hours * 3600.0 / CRUISE_STEP_S)
+    return cost
+
+
+def shard_cases(cases: list[dict], shard_index: int, shard_count: int, unit_key=None) -> list[dict]:
+    """
+    The slice of the case grid run by shard shard_index of shard_count.
+
+    Cases are grouped into units by unit_key (default effective_case_key, so
+    duplicates stay on one host for deduplication) and the units are assigned
+    longest-predicted-runtime first to the least loaded shard. The partition
+    depends only on the case list, so every host computes the same one.
+    """
+    unit_key = unit_key or effective_case_key
+    cost = predict_case_cost(cases)
+    units = {}
+    for i, case in enumerate(cases):
+        units.setdefault(unit_key(case), []).append(i)
+    order = sorted(units, key=lambda k: (-sum(cost[i] for i in units[k]), repr(k)))
+    loads = [0.0] * shard_count
+    mine = []
+    for key in order:
+        target = min(range(shard_count), key=lambda n: (loads[n], n))
+        loads[target] += sum(cost[i] for i in units[key])
+        if target == shard_index - 1:
+            mine.extend(units[key])
+    return [cases[i] for i in sorted(mine)]
+
+
+def make_aircraft_dirs(base_ts_dir: Path, aircraft_models: list[str]) -> dict:
+    """Per-aircraft output directories (base, plots, summary_plots, timeseries) under base_ts_dir."""
+    aircraft_dirs = {}
+    for aircraft in aircraft_models:
+        aircraft_dir = base_ts_dir / aircraft
+        aircraft_dir.mkdir(parents=True, exist_ok=True)
+        aircraft_dirs[aircraft] = {
+            "base": aircraft_dir,
+            "plots": aircraft_dir / "plots",
+            "summary_plots": aircraft_dir / "summary_plots",
+            "timeseries": aircraft_dir / "timeseries"
+        }
+        aircraft_dirs[aircraft]["summary_plots"].mkdir(parents=True, exist_ok=True)
+    return aircraft_dirs
+
+
+def write_summary_tables(df: pd.DataFrame, base_ts_dir: Path, aircraft_dirs: dict) -> None:
+    """Per-aircraft and combined summary CSV/parquet files and the derived long-form tables."""
+    aircraft_models = list(aircraft_dirs)
+    # Save summary files by aircraft model
+    for aircraft in aircraft_models:
+        aircraft_df = df[df["aircraft"] == aircraft].copy()
+        if len(aircraft_df) > 0:
+            # Sort by mod (Flatwing, then Tamarack), altitude (desc), ISA (asc), Mach (desc), payload (asc)
+            mod_order = mod_sort_order(aircraft_df["mod"].unique())
+            aircraft_df.loc[:, "mod"] = aircraft_df["mod"].astype(mod_order)
+            aircraft_sorted = aircraft_df.sort_values(["mod","cruise_alt","isa_dev","mach","payload"], ascending=[True,False,True,False,True])
+            aircraft_dir = aircraft_dirs[aircraft]["base"]
+            
+            # Round selected columns to 0 decimals for summary CSV
+            cols0 = ["total_dist_nm", "cruise_vkias_kts"]
+            display_df = aircraft_sorted.copy()
+            for _c in cols0:
+                if _c in display_df.columns:
+                    _num = pd.to_numeric(display_df[_c], errors="coerce")
+                    _num = _num.replace([np.inf, -np.inf], np.nan)
+                    _mask = _num.notna()
+                    display_df.loc[_mask, _c] = _num[_mask].round(0).astype(int)
+            
+            # Save CSV and parquet
+            display_df.to_csv(aircraft_dir / "summary.csv", index=False)
+            try:
+                aircraft_sorted.to_parquet(aircraft_dir / "summary.parquet", index=False)
+            except Exception:
+                pass
+    
+    # Also save combined summary in base directory (sorted by aircraft model first, then mod, alt desc, ISA asc, Mach desc, payload asc)
+    df_sorted = df.copy()
+    mod_order = mod_sort_order(df_sorted["mod"].unique())
+    df_sorted.loc[:, "mod"] = df_sorted["mod"].astype(mod_order)
+    df_sorted = df_sorted.sort_values(["aircraft","mod","cruise_alt","isa_dev","mach","payload"], ascending=[True,True,False,True,False,True])
+    # Round selected columns to 0 decimals for combined summary CSV
+    cols0 = ["total_dist_nm", "cruise_vkias_kts"]
+    display_df2 = df_sorted.copy()
+    for _c in cols0:
+        if _c in display_df2.columns:
+            _num = pd.to_numeric(display_df2[_c], errors="coerce")
+            _num = _num.replace([np.inf, -np.inf], np.nan)
+            _mask = _num.notna()
+            display_df2.loc[_mask, _c] = _num[_mask].round(0).astype(int)
+    display_df2.to_csv(base_ts_dir / "combined_summary.csv", index=False)
+    try:
+        df_sorted.to_parquet(base_ts_dir / "combined_summary.parquet", index=False)
+    except Exception:
+        pass
+
+    # Derived tables (long form) - save by aircraft and combined
+    try:
+        # Save comprehensive CSVs by aircraft
+        for aircraft in aircraft_models:
+            aircraft_df = df[df["aircraft"] == aircraft].copy()
+            if len(aircraft_df) > 0:
+                aircraft_dir = aircraft_dirs[aircraft]["base"]
+                
+                # Payload range all data for this aircraft
+                df_aircraft_all = aircraft_df[[
+                    "aircraft","mod","flap","isa_dev","cruise_alt","mach","payload",
+                    "total_dist_nm","total_time_min","fuel_burned_lb","first_level_off_ft","cruise_vktas_kts","cruise_vkias_kts"
+                ]].copy().sort_values(["mod","cruise_alt","mach","payload"], ascending=[True,False,False,True])
+                df_aircraft_all.to_csv(aircraft_dir / "payload_range_all.csv", index=False)
+                
+                # Payload=0 data for this aircraft
+                df_aircraft_payload0 = aircraft_df[aircraft_df["payload"] == 0].copy()
+                if len(df_aircraft_payload0) > 0:
+                    # Range vs Mach
+                    df_rvm = df_aircraft_payload0[["aircraft","mod","flap","isa_dev","cruise_alt","mach","payload","total_dist_nm"]].dropna()
+                    df_rvm.to_csv(aircraft_dir / "range_vs_mach_payload0.csv", index=False)
+                    # Endurance vs Mach
+                    df_evm = df_aircraft_payload0[["aircraft","mod","flap","isa_dev","cruise_alt","mach","payload","total_time_min"]].dropna()
+                    df_evm.to_csv(aircraft_dir / "endurance_vs_mach_payload0.csv", index=False)
+                    # Range vs Altitude
+                    df_rva = df_aircraft_payload0[["aircraft","mod","flap","isa_dev","mach","cruise_alt","payload","total_dist_nm"]].dropna()
+                    df_rva.to_csv(aircraft_dir / "range_vs_altitude_payload0.csv", index=False)
+        
+        # Also save combined files in base directory
+        df_all = df[[
+            "aircraft","mod","flap","isa_dev","cruise_alt","mach","payload",
+            "total_dist_nm","total_time_min","fuel_burned_lb","first_level_off_ft","cruise_vktas_kts","cruise_vkias_kts"
+        ]].copy().sort_values(["aircraft","mod","cruise_alt","mach","payload"], ascending=[True,True,False,False,True])
+        df_all.to_csv(base_ts_dir / "combined_payload_range_all.csv", index=False)
+
+        df_payload0 = df[df["payload"] == 0].copy()
+        if len(df_payload0) > 0:
+            df_rvm = df_payload0[["aircraft","mod","flap","isa_dev","cruise_alt","mach","payload","total_dist_nm"]].dropna()
+            df_rvm.to_csv(base_ts_dir / "combined_range_vs_mach_payload0.csv", index=False)
+            df_evm = df_payload0[["aircraft","mod","flap","isa_dev","cruise_alt","mach","payload","total_time_min"]].dropna()
+            df_evm.to_csv(base_ts_dir / "combined_endurance_vs_mach_payload0.csv", index=False)
+            df_rva = df_payload0[["aircraft","mod","flap","isa_dev","mach","cruise_alt","payload","total_dist_nm"]].dropna()
+            df_rva.to_csv(base_ts_dir / "combined_range_vs_altitude_payload0.csv", index=False)
+    except Exception:
+        pass
+
+
+def write_meta(base_ts_dir: Path, aircraft_dirs: dict, settings: dict, prescreened_out: dict,
+               duplicate_cases: dict, envelope_bounds: dict) -> None:
+    """
+    meta.json for the combined run and for each aircraft.
+
+    Args:
+        settings: Run settings shared by every meta file (mods, grids, modes, ...).
+        prescreened_out: Cases skipped by the pre-screen, per aircraft.
+        duplicate_cases: Cases answered by deduplication, per aircraft.
+        envelope_bounds: Envelope grid bounds keyed "aircraft mod".
+    """
+    aircraft_models = list(aircraft_dirs)
+    combined_meta = {
+        "aircraft_models": aircraft_models,
+        **settings,
+        "prescreened_out": sum(prescreened_out.values()),
+        "duplicate_cases": sum(duplicate_cases.values()),
+        "envelope_bounds": envelope_bounds,
+        "output_dir": str(base_ts_dir),
+        "run_type": "combined_multi_aircraft"
+    }
+    pd.Series(combined_meta).to_json(base_ts_dir / "meta.json")
+
+    # Save individual meta files for each aircraft
+    for aircraft in aircraft_models:
+        aircraft_meta = {
+            "aircraft_models": [aircraft],
+            **settings,
+            "prescreened_out": prescreened_out.get(aircraft, 0),
+            "duplicate_cases": duplicate_cases.get(aircraft, 0),
+            "envelope_bounds": {k: v for k, v in envelope_bounds.items() if k.split(" ")[0] == aircraft},
+            "output_dir": str(aircraft_dirs[aircraft]["base"]),
+            "run_type": "individual_aircraft"
+        }
+        pd.Series(aircraft_meta).to_json(aircraft_dirs[aircraft]["base"] / "meta.json")
+
+
+def write_summary_plots(df: pd.DataFrame, aircraft_dirs: dict, workers: int | None = None,
+                        use_threads: bool = False) -> None:
+    """
+    Payload-range overlays and range vs speed/altitude families (PNG) in each
+    aircraft's summary_plots directory, built as specs in one pass
+    (batch.summary_plots) and rendered on a pool of `workers` processes.
+    """
+    try:
+        specs = build_plot_specs(df, aircraft_dirs)
+    except Exception:
+        import traceback
+        print("[summary_plots] Error while generating plots:\n" + traceback.format_exc())
+        return
+    for error in render_specs(specs, workers, use_threads):
+        print(f"[summary_plots] Error while saving {error}")
+
+
 def run_payload_range_batch(
     aircraft_models: list[str],
     mods: list[str],
@@ -294,27 +1045,60 @@ def run_payload_range_batch(
     hide_mach_limited: bool = False,
     hide_altitude_limited: bool = False,
     use_threads: bool = False,
+    fast_terminal: bool = False,
+    fast_climb: bool = False,
+    mode: str = "full",
+    fast_check_cases: int = 4,
+    payload_mode: str = "sweep",
+    corner_refine_tol_nm: float | None = None,
+    sweep_mode: str = "grid",
+    case_budget: int | None = None,
+    adaptive_tol_nm: float = 10.0,
+    prescreen: str = "flag",
+    prescreen_margin: float = 0.15,
+    envelope_bound: bool = False,
+    config_params: list[str] | None = None,
+    shard: str | None = None,
+    queue_dir: str | Path | None = None,
+    lease_timeout: float = LEASE_TIMEOUT_S,
+    io_workers: int = IO_WORKERS,
+    plot_mode: str = "png",
+    timeseries_format: str = "dataset",
 ) -> pd.DataFrame:
+    if mode not in ("full", "fast"):
+        raise ValueError(f"Unknown batch mode '{mode}' (expected 'full' or 'fast')")
+    if payload_mode not in ("sweep", "corners"):
+        raise ValueError(f"Unknown payload mode '{payload_mode}' (expected 'sweep' or 'corners')")
+    if sweep_mode not in ("grid", "adaptive"):
+        raise ValueError(f"Unknown sweep mode '{sweep_mode}' (expected 'grid' or 'adaptive')")
+    if prescreen not in ("off", "flag", "skip"):
+        raise ValueError(f"Unknown prescreen mode '{prescreen}' (expected 'off', 'flag' or 'skip')")
+    if plot_mode not in ("png", "deferred"):
+        raise ValueError(f"Unknown plot mode '{plot_mode}' (expected 'png' or 'deferred')")
+    if timeseries_format not in ("dataset", "files"):
+        raise ValueError(f"Unknown timeseries format '{timeseries_format}' (expected 'dataset' or 'files')")
+    if queue_dir and mode != "full":
+        raise ValueError("A work queue runs full-physics cases only (mode='full')")
+    if queue_dir and save_timeseries and timeseries_format == "dataset":
+        # Queue workers run on their own and return rows as JSON, so each writes its own files
+        print("[timeseries] Work-queue runs write one Parquet file per case (timeseries_format='files')")
+        timeseries_format = "files"
+    if save_timeseries and timeseries_format == "dataset" and pa is None:
+        print("[timeseries] pyarrow is not installed; writing one file per case (timeseries_format='files')")
+        timeseries_format = "files"
+    param_axes = [parse_param_axis(spec) for spec in (config_params or [])]
+    shard_index, shard_count = parse_shard(shard) if shard else (1, 1)
     base_ts_dir = Path(output_dir) if output_dir else Path("batch_outputs") / datetime.now().strftime("%Y%m%d_%H%M%S")
     base_ts_dir.mkdir(parents=True, exist_ok=True)
     
-    # Create separate directories for each aircraft model
-    aircraft_dirs = {}
-    for aircraft in aircraft_models:
-        aircraft_dir = base_ts_dir / aircraft
-        aircraft_dir.mkdir(parents=True, exist_ok=True)
-        aircraft_dirs[aircraft] = {
-            "base": aircraft_dir,
-            "plots": aircraft_dir / "plots",
-            "summary_plots": aircraft_dir / "summary_plots",
-            "timeseries": aircraft_dir / "timeseries"
-        }
-        aircraft_dirs[aircraft]["summary_plots"].mkdir(parents=True, exist_ok=True)
+    aircraft_dirs = make_aircraft_dirs(base_ts_dir, aircraft_models)
 
     # Build cases
     cases = []
+    envelope_bounds = {}
     for aircraft in aircraft_models:
-        for mod in mods:
+        # Config-override axes (--param) multiply the mods into registered variants
+        for mod in expand_config_variants(aircraft, mods, param_axes):
             ac = AIRCRAFT_CONFIG.get((aircraft, mod))
             if not ac:
                 continue
@@ -350,7 +1134,21 @@ def run_payload_range_batch(
                 if len(tas_grid) == 0:
                     tas_grid = None
 
-            payloads = payload_sweep(max_payload, payload_steps)
+            if payload_mode == "corners":
+                payloads = payload_corners(bow, mzfw, float(ac[20]), float(ac[22]))
+            else:
+                payloads = payload_sweep(max_payload, payload_steps)
+
+            # Trim altitudes above the solved ceiling and Mach values above the maximum
+            # level speed, judged at the lightest weights the sweep can reach
+            if envelope_bound:
+                taxi_default = 15 if is_turboprop else int(taxi_fuel_lb)
+                tows = [bow + p + compute_initial_fuel(float(ac[22]), float(ac[20]), bow, p) - taxi_default for p in payloads]
+                bounds = envelope_grid_bounds(aircraft, mod, 0.95 * min(tows), bow + min(payloads) + reserve_default,
+                                              list(isa_devs))
+                envelope_bounds[f"{aircraft} {mod}"] = bounds
+                alt_grid = trim_grid_to_bound(alt_grid, bounds["ceiling_ft"])
+                mach_grid = trim_grid_to_bound(mach_grid, bounds["max_mach"])
 
             if tas_grid is not None:
                 for flap, isa_dev, cruise_alt, ktas, payload in product(
@@ -429,428 +1227,205 @@ def run_payload_range_batch(
                         case["save_timeseries"] = True
                     cases.append(case)
 
-    # Execute in parallel
-    from functools import partial
-    worker_func = partial(run_single_case, hide_mach_limited=hide_mach_limited, hide_altitude_limited=hide_altitude_limited)
-    results = []
-    Executor = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
-    with Executor(max_workers=parallel_workers) as ex:
-        fut_to_case = {ex.submit(worker_func, c): c for c in cases}
-        for fut in as_completed(fut_to_case):
-            case = fut_to_case[fut]
-            try:
-                results.append(fut.result())
-            except Exception as e:
-                results.append({**case, "status": "error", "error_message": str(e),
-                                "total_dist_nm": np.nan, "total_time_min": np.nan, "fuel_burned_lb": np.nan,
-                                "first_level_off_ft": np.nan, "cruise_vktas_kts": np.nan})
+    for case in cases:
+        case["base_mod"], _, case["config_params"] = case["mod"].partition(VARIANT_SEP)
+        if case.get("plot_path") is not None and plot_mode == "deferred":
+            case["plot_data_path"] = case["plot_path"].with_suffix(".npz")
+        if case.get("timeseries_path") is not None and timeseries_format == "dataset":
+            # Dataset time series: appended to base_ts_dir/timeseries under the row's case_id
+            case["timeseries_path"] = None
 
-    df = pd.DataFrame(results)
-    df["reserve_fuel_calc_lb"] = pd.to_numeric(df.get("initial_fuel_lb"), errors="coerce") - pd.to_numeric(df.get("fuel_burned_lb"), errors="coerce")
+    # Sharded execution: keep this host's slice of the grid. The adaptive sweep and
+    # corner refinement need neighbouring cases, so they shard whole (aircraft, mod,
+    # flap, ISA) groups; an explicit case budget is split in proportion
+    grid_cases = len(cases)
+    if shard:
+        refine_groups = sweep_mode == "adaptive" or (payload_mode == "corners" and corner_refine_tol_nm)
+        unit_key = (lambda c: (c["aircraft"], c["mod"], c["flap"], c["isa_dev"])) if refine_groups else None
+        cases = shard_cases(cases, shard_index, shard_count, unit_key)
+        if case_budget is not None:
+            case_budget = int(round(case_budget * len(cases) / max(grid_cases, 1)))
+        pd.DataFrame([{k: c.get(k) for k in SHARD_KEY_COLS} for c in cases], columns=list(SHARD_KEY_COLS)).to_csv(
+            base_ts_dir / "shard_cases.csv", index=False)
 
-    # Save summary files by aircraft model
-    for aircraft in aircraft_models:
-        aircraft_df = df[df["aircraft"] == aircraft].copy()
-        if len(aircraft_df) > 0:
-            # Sort by mod (Flatwing, then Tamarack), altitude (desc), ISA (asc), Mach (desc), payload (asc)
-            mod_order = pd.CategoricalDtype(["Flatwing", "Tamarack"], ordered=True)
-            aircraft_df.loc[:, "mod"] = aircraft_df["mod"].astype(mod_order)
-            aircraft_sorted = aircraft_df.sort_values(["mod","cruise_alt","isa_dev","mach","payload"], ascending=[True,False,True,False,True])
-            aircraft_dir = aircraft_dirs[aircraft]["base"]
-            
-            # Round selected columns to 0 decimals for summary CSV
-            cols0 = ["total_dist_nm", "cruise_vkias_kts"]
-            display_df = aircraft_sorted.copy()
-            for _c in cols0:
-                if _c in display_df.columns:
-                    _num = pd.to_numeric(display_df[_c], errors="coerce")
-                    _num = _num.replace([np.inf, -np.inf], np.nan)
-                    _mask = _num.notna()
-                    display_df.loc[_mask, _c] = _num[_mask].round(0).astype(int)
-            
-            # Save CSV and parquet
-            display_df.to_csv(aircraft_dir / "summary.csv", index=False)
-            try:
-                aircraft_sorted.to_parquet(aircraft_dir / "summary.parquet", index=False)
-            except Exception:
-                pass
-    
-    # Also save combined summary in base directory (sorted by aircraft model first, then mod, alt desc, ISA asc, Mach desc, payload asc)
-    df_sorted = df.copy()
-    mod_order = pd.CategoricalDtype(["Flatwing", "Tamarack"], ordered=True)
-    df_sorted.loc[:, "mod"] = df_sorted["mod"].astype(mod_order)
-    df_sorted = df_sorted.sort_values(["aircraft","mod","cruise_alt","isa_dev","mach","payload"], ascending=[True,True,False,True,False,True])
-    # Round selected columns to 0 decimals for combined summary CSV
-    cols0 = ["total_dist_nm", "cruise_vkias_kts"]
-    display_df2 = df_sorted.copy()
-    for _c in cols0:
-        if _c in display_df2.columns:
-            _num = pd.to_numeric(display_df2[_c], errors="coerce")
-            _num = _num.replace([np.inf, -np.inf], np.nan)
-            _mask = _num.notna()
-            display_df2.loc[_mask, _c] = _num[_mask].round(0).astype(int)
-    display_df2.to_csv(base_ts_dir / "combined_summary.csv", index=False)
-    try:
-        df_sorted.to_parquet(base_ts_dir / "combined_summary.parquet", index=False)
-    except Exception:
-        pass
+    # Range-mode fast path: tabulated takeoff/landing increments per (aircraft, mod, flap)
+    terminal_tables = None
+    if fast_terminal:
+        terminal_tables = {}
+        for key in sorted({(c["aircraft"], c["mod"], c["flap"]) for c in cases}):
+            terminal_tables[key] = load_or_build_terminal_table(
+                *key, isa_devs=list(isa_devs), parallel_workers=parallel_workers
+            )
+
+    # Tabulated brake-release to top-of-climb increments per (aircraft, mod, flap)
+    climb_tables = None
+    if fast_climb or mode == "fast":
+        climb_tables = {}
+        for key in sorted({(c["aircraft"], c["mod"], c["flap"]) for c in cases}):
+            key_alts = sorted({c["cruise_alt"] for c in cases if (c["aircraft"], c["mod"], c["flap"]) == key})
+            climb_tables[key] = load_or_build_climb_table(
+                *key, isa_devs=list(isa_devs), target_alts=key_alts, parallel_workers=parallel_workers
+            )
+
+    # Adaptive sweep: start from a coarse subset of the altitude/speed grids; by default
+    # the refinement may spend as many cases as the uniform grid would have used
+    if sweep_mode == "adaptive":
+        if case_budget is None:
+            case_budget = len(cases)
+        coarse = {}
+        for c in cases:
+            entry = coarse.setdefault((c["aircraft"], c["mod"]), (set(), set()))
+            entry[0].add(c["cruise_alt"])
+            entry[1].add(c[_speed_key(c)])
+        coarse = {k: (set(coarsen_grid(alts)), set(coarsen_grid(spds))) for k, (alts, spds) in coarse.items()}
+        cases = [c for c in cases
+                 if c["cruise_alt"] in coarse[(c["aircraft"], c["mod"])][0] and c[_speed_key(c)] in coarse[(c["aircraft"], c["mod"])][1]]
+
+    ts_writer = None
+    if mode == "fast":
+        # Specific-range integration (no time histories, so per-run plots/timeseries are skipped)
+        def evaluate(batch_cases):
+            return run_fast_cases(batch_cases, climb_tables, hide_mach_limited=hide_mach_limited,
+                                  hide_altitude_limited=hide_altitude_limited)
+    else:
+        # Execute in parallel
+        from functools import partial
+        worker_func = partial(run_single_case, hide_mach_limited=hide_mach_limited, hide_altitude_limited=hide_altitude_limited,
+                              terminal_tables=terminal_tables, climb_tables=climb_tables, defer_outputs=True)
+
+        # Time series of every case go to one dataset partitioned by aircraft/mod
+        sink = None
+        if save_timeseries and timeseries_format == "dataset" and not queue_dir:
+            ts_writer = TimeseriesDatasetWriter(base_ts_dir / DATASET_DIR)
+
+            def sink(row):
+                return ts_writer.write_row(row, timeseries_case_id(effective_case_key(row)))
+
+        def evaluate(batch_cases):
+            return execute_cases(batch_cases, worker_func, parallel_workers, use_threads,
+                                 io_func=write_case_outputs, io_workers=io_workers, sink=sink)
+
+        if queue_dir:
+            # Elastic execution: cases go to task files in queue_dir and any number of
+            # `python -m batch.worker` processes (sharing the directory) run them
+            init_queue(queue_dir, {
+                "hide_mach_limited": hide_mach_limited,
+                "hide_altitude_limited": hide_altitude_limited,
+                "fast_terminal": fast_terminal,
+                "fast_climb": fast_climb,
+                "isa_devs": list(isa_devs),
+                "climb_alts": {
+                    "|".join(map(str, key)): sorted({c["cruise_alt"] for c in cases if (c["aircraft"], c["mod"], c["flap"]) == key})
+                    for key in (climb_tables or {})
+                },
+            })
+            queue_batches = count()
+
+            def evaluate(batch_cases):
+                return run_queued(queue_dir, batch_cases, next(queue_batches), lease_timeout)
+
+    # Pre-dispatch screen: annotate every case with its predicted limits and skip the
+    # clear failures (always in skip mode, and whenever their output would be hidden)
+    prescreened_out = {}
+    if prescreen != "off":
+        run_cases = evaluate
+
+        def evaluate(batch_cases):
+            batch_cases = [{**c, **p} for c, p in zip(batch_cases, screen_batch_cases(batch_cases, prescreen_margin))]
+            skipped, dispatched = [], []
+            for c in batch_cases:
+                skip = (
+                    (prescreen == "skip" and c["prescreen_class"] == "infeasible")
+                    or (hide_altitude_limited and c["prescreen_altitude"] == "infeasible")
+                    or (hide_mach_limited and c["prescreen_mach"] == "infeasible")
+                )
+                (skipped if skip else dispatched).append(c)
+            for c in skipped:
+                prescreened_out[c["aircraft"]] = prescreened_out.get(c["aircraft"], 0) + 1
+            rows = [prescreened_row(c, hide_mach_limited, hide_altitude_limited) for c in skipped]
+            return rows + (run_cases(dispatched) if dispatched else [])
+
+    # Equivalent-case deduplication: run each distinct set of effective inputs once
+    # and fan its result back out to every grid point that asked for it
+    duplicate_cases = {}
+    run_unique = evaluate
+
+    def evaluate(batch_cases):
+        unique, groups = dedupe_cases(batch_cases)
+        rows_by_key = {effective_case_key(r): r for r in run_unique(unique)}
+        rows = []
+        for rep_case, members in zip(unique, groups):
+            row = rows_by_key[effective_case_key(rep_case)]
+            rows.append({**row, "deduplicated": False})
+            for i in members[1:]:
+                rows.append(fan_out_result(row, batch_cases[i]))
+                duplicate_cases[rep_case["aircraft"]] = duplicate_cases.get(rep_case["aircraft"], 0) + 1
+        return rows
 
-    # Derived tables (long form) - save by aircraft and combined
     try:
-        # Save comprehensive CSVs by aircraft
-        for aircraft in aircraft_models:
-            aircraft_df = df[df["aircraft"] == aircraft].copy()
-            if len(aircraft_df) > 0:
-                aircraft_dir = aircraft_dirs[aircraft]["base"]
-                
-                # Payload range all data for this aircraft
-                df_aircraft_all = aircraft_df[[
-                    "aircraft","mod","flap","isa_dev","cruise_alt","mach","payload",
-                    "total_dist_nm","total_time_min","fuel_burned_lb","first_level_off_ft","cruise_vktas_kts","cruise_vkias_kts"
-                ]].copy().sort_values(["mod","cruise_alt","mach","payload"], ascending=[True,False,False,True])
-                df_aircraft_all.to_csv(aircraft_dir / "payload_range_all.csv", index=False)
-                
-                # Payload=0 data for this aircraft
-                df_aircraft_payload0 = aircraft_df[aircraft_df["payload"] == 0].copy()
-                if len(df_aircraft_payload0) > 0:
-                    # Range vs Mach
-                    df_rvm = df_aircraft_payload0[["aircraft","mod","flap","isa_dev","cruise_alt","mach","payload","total_dist_nm"]].dropna()
-                    df_rvm.to_csv(aircraft_dir / "range_vs_mach_payload0.csv", index=False)
-                    # Endurance vs Mach
-                    df_evm = df_aircraft_payload0[["aircraft","mod","flap","isa_dev","cruise_alt","mach","payload","total_time_min"]].dropna()
-                    df_evm.to_csv(aircraft_dir / "endurance_vs_mach_payload0.csv", index=False)
-                    # Range vs Altitude
-                    df_rva = df_aircraft_payload0[["aircraft","mod","flap","isa_dev","mach","cruise_alt","payload","total_dist_nm"]].dropna()
-                    df_rva.to_csv(aircraft_dir / "range_vs_altitude_payload0.csv", index=False)
-        
-        # Also save combined files in base directory
-        df_all = df[[
-            "aircraft","mod","flap","isa_dev","cruise_alt","mach","payload",
-            "total_dist_nm","total_time_min","fuel_burned_lb","first_level_off_ft","cruise_vktas_kts","cruise_vkias_kts"
-        ]].copy().sort_values(["aircraft","mod","cruise_alt","mach","payload"], ascending=[True,True,False,False,True])
-        df_all.to_csv(base_ts_dir / "combined_payload_range_all.csv", index=False)
+        results = evaluate(cases) if cases else []
+        if sweep_mode == "adaptive":
+            results = adaptive_refine(results, evaluate, case_budget, tol_nm=adaptive_tol_nm)
+        if payload_mode == "corners" and corner_refine_tol_nm:
+            results = refine_payload_points(results, evaluate, float(corner_refine_tol_nm))
+    finally:
+        # Close the queue even when evaluation fails, so waiting workers exit
+        if queue_dir:
+            close_queue(queue_dir)
+        if ts_writer is not None:
+            ts_writer.close()
+    if mode == "fast":
+        crosscheck = cross_check_fast_cases(results, climb_tables, num_cases=fast_check_cases,
+                                            parallel_workers=parallel_workers)
+        if len(crosscheck) > 0:
+            crosscheck.to_csv(base_ts_dir / "fast_crosscheck.csv", index=False)
 
-        df_payload0 = df[df["payload"] == 0].copy()
-        if len(df_payload0) > 0:
-            df_rvm = df_payload0[["aircraft","mod","flap","isa_dev","cruise_alt","mach","payload","total_dist_nm"]].dropna()
-            df_rvm.to_csv(base_ts_dir / "combined_range_vs_mach_payload0.csv", index=False)
-            df_evm = df_payload0[["aircraft","mod","flap","isa_dev","cruise_alt","mach","payload","total_time_min"]].dropna()
-            df_evm.to_csv(base_ts_dir / "combined_endurance_vs_mach_payload0.csv", index=False)
-            df_rva = df_payload0[["aircraft","mod","flap","isa_dev","mach","cruise_alt","payload","total_dist_nm"]].dropna()
-            df_rva.to_csv(base_ts_dir / "combined_range_vs_altitude_payload0.csv", index=False)
-    except Exception:
-        pass
+    df = pd.DataFrame(results)
+    if not df.empty:
+        df["reserve_fuel_calc_lb"] = pd.to_numeric(df.get("initial_fuel_lb"), errors="coerce") - pd.to_numeric(df.get("fuel_burned_lb"), errors="coerce")
 
-    # Save meta files - one combined and one per aircraft
-    combined_meta = {
-        "aircraft_models": aircraft_models,
+    settings = {
         "mods": mods,
         "payload_steps": payload_steps,
         "taxi_fuel_lb": taxi_fuel_lb,
         "isa_devs": list(isa_devs),
         "flap_settings": list(flap_settings),
         "save_plots": save_plots,
+        "plot_mode": plot_mode,
         "save_summary_plots": save_summary_plots,
         "save_timeseries": save_timeseries,
+        "timeseries_format": timeseries_format,
         "parallel_workers": parallel_workers,
-        "output_dir": str(base_ts_dir),
-        "run_type": "combined_multi_aircraft"
+        "fast_terminal": fast_terminal,
+        "fast_climb": fast_climb,
+        "mode": mode,
+        "payload_mode": payload_mode,
+        "corner_refine_tol_nm": corner_refine_tol_nm,
+        "sweep_mode": sweep_mode,
+        "case_budget": case_budget,
+        "prescreen": prescreen,
+        "prescreen_margin": prescreen_margin,
+        "envelope_bound": envelope_bound,
+        "config_params": list(config_params or []),
+        "shard": shard,
+        "grid_cases": grid_cases,
+        "shard_cases": len(cases),
     }
-    pd.Series(combined_meta).to_json(base_ts_dir / "meta.json")
-    
-    # Save individual meta files for each aircraft
-    for aircraft in aircraft_models:
-        aircraft_meta = {
-            "aircraft_models": [aircraft],
-            "mods": mods,
-            "payload_steps": payload_steps,
-            "taxi_fuel_lb": taxi_fuel_lb,
-            "isa_devs": list(isa_devs),
-            "flap_settings": list(flap_settings),
-            "save_plots": save_plots,
-            "save_summary_plots": save_summary_plots,
-            "save_timeseries": save_timeseries,
-            "parallel_workers": parallel_workers,
-            "output_dir": str(aircraft_dirs[aircraft]["base"]),
-            "run_type": "individual_aircraft"
-        }
-        pd.Series(aircraft_meta).to_json(aircraft_dirs[aircraft]["base"] / "meta.json")
 
-    # Generate summary plots (PNG) - save to respective aircraft directories
-    if save_summary_plots:
-        try:
-            import plotly.graph_objects as go
-            # Payload-Range overlays per (altitude, mach) with ISA temperature separation
-            for aircraft in sorted(df["aircraft"].dropna().unique()):
-                df_a = df[df["aircraft"]==aircraft]
-                aircraft_summary_dir = aircraft_dirs[aircraft]["summary_plots"]
-                
-                for alt in sorted(df_a["cruise_alt"].dropna().unique(), reverse=True):
-                    # Prefer TAS for turboprops, then IAS, else Mach
-                    has_ktas = ("ktas" in df_a.columns) and pd.to_numeric(df_a.get("ktas"), errors="coerce").notna().any()
-                    has_kias = ("kias" in df_a.columns) and pd.to_numeric(df_a.get("kias"), errors="coerce").notna().any()
-                    if has_ktas:
-                        speeds = sorted(pd.to_numeric(df_a["ktas"], errors="coerce").dropna().unique().tolist(), reverse=True)
-                    elif has_kias:
-                        speeds = sorted(pd.to_numeric(df_a["kias"], errors="coerce").dropna().unique().tolist(), reverse=True)
-                    else:
-                        speeds = sorted(pd.to_numeric(df_a["mach"], errors="coerce").dropna().unique().tolist(), reverse=True)
-                    for spd in speeds:
-                        if has_ktas:
-                            df_filtered = df_a[(df_a["cruise_alt"] == alt) & (np.isclose(pd.to_numeric(df_a["ktas"], errors="coerce"), float(spd)))]
-                        elif has_kias:
-                            df_filtered = df_a[(df_a["cruise_alt"] == alt) & (pd.to_numeric(df_a["kias"], errors="coerce") == int(spd))]
-                        else:
-                            df_filtered = df_a[(df_a["cruise_alt"] == alt) & (np.isclose(pd.to_numeric(df_a["mach"], errors="coerce"), float(spd)))]
-                        if df_filtered.empty:
-                            continue
-                        
-                        # Create ISA deviation labels for better legend
-                        df_filtered = df_filtered.copy()
-                        df_filtered.loc[:, "isa_label"] = df_filtered["isa_dev"].apply(lambda x: f"ISA {x:+d}°C")
-                        
-                        fig = go.Figure()
-                        for mod in sorted(df_filtered["mod"].unique()):
-                            df_mod = df_filtered[df_filtered["mod"] == mod]
-                            if df_mod.empty:
-                                continue
-                            
-                            color = "red" if mod == "Flatwing" else "green"
-                            mod_name = "Baseline (Flatwing)" if mod == "Flatwing" else "Modified (Tamarack)"
-                            
-                            for isa_dev in sorted(df_mod["isa_dev"].unique()):
-                                df_isa = df_mod[df_mod["isa_dev"] == isa_dev]
-                                if df_isa.empty:
-                                    continue
-                                df_plot = df_isa.sort_values("payload", ascending=False).copy()
-                                isa_label = f"ISA {isa_dev:+d}°C"
-
-                                df_plot.loc[:, "total_dist_nm_num"] = pd.to_numeric(df_plot["total_dist_nm"], errors="coerce")
-                                df_plot = df_plot.dropna(subset=["total_dist_nm_num", "payload"])
-                                if df_plot.empty:
-                                    continue
-
-                                # Deduplicate any repeated payload values: keep max range for each payload
-                                df_plot = df_plot.groupby("payload", as_index=False).agg(total_dist_nm_num=("total_dist_nm_num", "max"))
-                                df_plot = df_plot.sort_values("payload", ascending=False)
-
-                                x_vals = df_plot["total_dist_nm_num"].to_numpy()
-                                y_vals = df_plot["payload"].to_numpy()
-                                # Enforce monotone non-decreasing range as payload decreases and shift by one
-                                x_mon = np.maximum.accumulate(x_vals)
-                                if len(x_mon) >= 1:
-                                    x_plot = np.concatenate(([0.0], x_mon[:-1]))
-                                else:
-                                    x_plot = x_mon
-                                # Drop consecutive duplicate ranges keeping the LAST occurrence; apply mask to y
-                                if len(x_plot) > 1:
-                                    keep = np.concatenate(((x_plot[:-1] < x_plot[1:] - 1e-9), [True]))
-                                    x_plot = x_plot[keep]
-                                    y_vals = y_vals[keep]
-                                fig.add_trace(go.Scatter(
-                                    x=x_plot,
-                                    y=y_vals,
-                                    mode="lines",
-                                    name=f"{mod_name} - {isa_label}",
-                                    line=dict(color=color, dash=("dash" if isa_dev == -10 else "solid" if isa_dev == 0 else "dot" if isa_dev == 10 else "dashdot"))
-                                ))
-                        title_txt = (
-                            f"Payload-Range | {aircraft} | FL{int(alt/100)} | TAS {float(spd):.0f} kt" if has_ktas else (
-                            f"Payload-Range | {aircraft} | FL{int(alt/100)} | IAS {int(spd)} kt" if has_kias else 
-                            f"Payload-Range | {aircraft} | FL{int(alt/100)} | M {float(spd):.2f}"
-                        ))
-                        fig.update_layout(
-                            title=title_txt,
-                            xaxis_title="Range (NM)",
-                            yaxis_title="Payload (lb)",
-                            template="plotly_white"
-                        )
-                        # Determine unique ISA values present in this slice
-                        isa_vals = sorted(pd.to_numeric(df_filtered["isa_dev"], errors="coerce").dropna().unique().tolist())
-                        multiple_isa = len(isa_vals) > 1
-                        # Build base filename components
-                        if has_ktas:
-                            base_name = f"payload_range_{aircraft}_alt{int(alt)}_tas{int(spd)}"
-                        elif has_kias:
-                            base_name = f"payload_range_{aircraft}_alt{int(alt)}_kias{int(spd)}"
-                        else:
-                            base_name = f"payload_range_{aircraft}_alt{int(alt)}_mach{float(spd):.2f}"
-                        # If multiple ISA, save combined plot; if single ISA, skip combined
-                        if multiple_isa:
-                            fname = aircraft_summary_dir / f"{base_name}.png"
-                            fig.write_image(str(fname), width=1400, height=900, scale=2)
-                        # Always save per-ISA plots; if only one ISA, this results in exactly one image
-                        for _isa in isa_vals:
-                            # Build a per-ISA figure
-                            import plotly.graph_objects as go  # local import safe in worker
-                            fig_isa = go.Figure()
-                            for _mod in sorted(df_filtered["mod"].unique()):
-                                df_mod = df_filtered[(df_filtered["mod"] == _mod) & (pd.to_numeric(df_filtered["isa_dev"], errors="coerce") == float(_isa))]
-                                if df_mod.empty:
-                                    continue
-                                df_plot = df_mod.sort_values("payload", ascending=False).copy()
-                                df_plot.loc[:, "total_dist_nm_num"] = pd.to_numeric(df_plot["total_dist_nm"], errors="coerce")
-                                df_plot = df_plot.dropna(subset=["total_dist_nm_num", "payload"]) 
-                                if df_plot.empty:
-                                    continue
-                                df_plot = df_plot.groupby("payload", as_index=False).agg(total_dist_nm_num=("total_dist_nm_num", "max"))
-                                df_plot = df_plot.sort_values("payload", ascending=False)
-                                x_vals = df_plot["total_dist_nm_num"].to_numpy()
-                                y_vals = df_plot["payload"].to_numpy()
-                                x_mon = np.maximum.accumulate(x_vals)
-                                if len(x_mon) >= 1:
-                                    x_plot = np.concatenate(([0.0], x_mon[:-1]))
-                                else:
-                                    x_plot = x_mon
-                                if len(x_plot) > 1:
-                                    keep = np.concatenate(((x_plot[:-1] < x_plot[1:] - 1e-9), [True]))
-                                    x_plot = x_plot[keep]
-                                    y_vals = y_vals[keep]
-                                color = "red" if _mod == "Flatwing" else "green"
-                                mod_name = "Baseline (Flatwing)" if _mod == "Flatwing" else "Modified (Tamarack)"
-                                fig_isa.add_trace(go.Scatter(
-                                    x=x_plot,
-                                    y=y_vals,
-                                    mode="lines",
-                                    name=f"{mod_name}",
-                                    line=dict(color=color)
-                                ))
-                            title_isa = (
-                                f"Payload-Range | {aircraft} | FL{int(alt/100)} | TAS {float(spd):.0f} kt — ISA {_isa:+.0f}°C" if has_ktas else (
-                                f"Payload-Range | {aircraft} | FL{int(alt/100)} | IAS {int(spd)} kt — ISA {_isa:+.0f}°C" if has_kias else 
-                                f"Payload-Range | {aircraft} | FL{int(alt/100)} | M {float(spd):.2f} — ISA {_isa:+.0f}°C"
-                            ))
-                            fig_isa.update_layout(
-                                title=title_isa,
-                                xaxis_title="Range (NM)",
-                                yaxis_title="Payload (lb)",
-                                template="plotly_white"
-                            )
-                            # Build filename and sanitize '+' only in filename, not full path
-                        file_name = f"{base_name}_ISA{_isa:+.0f}C.png".replace("+", "p")
-                        fname_isa = aircraft_summary_dir / file_name
-                        fig_isa.write_image(str(fname_isa), width=1400, height=900, scale=2)
-            # Family: Range vs Speed by Altitude (payload 0) with ISA temperature separation
-            for aircraft in sorted(df["aircraft"].dropna().unique()):
-                df_a0 = df[(df["aircraft"]==aircraft) & (df["payload"]==0)]
-                aircraft_summary_dir = aircraft_dirs[aircraft]["summary_plots"]
-                
-                for alt in sorted(df_a0["cruise_alt"].dropna().unique(), reverse=True):
-                    df_alt = df_a0[df_a0["cruise_alt"] == alt]
-                    if df_alt.empty:
-                        continue
-                    
-                    # Decide TAS vs IAS vs Mach
-                    has_ktas = ("ktas" in df_alt.columns) and pd.to_numeric(df_alt.get("ktas"), errors="coerce").notna().any()
-                    has_kias = ("kias" in df_alt.columns) and pd.to_numeric(df_alt.get("kias"), errors="coerce").notna().any()
-                    x_col = "ktas" if has_ktas else ("kias" if has_kias else "mach")
-                    x_label = "TAS (kts)" if x_col == "ktas" else ("IAS (kts)" if x_col == "kias" else "Mach")
-                    title_txt = f"Range vs {'TAS' if x_col=='ktas' else ('IAS' if x_col=='kias' else 'Mach')} (Payload=0) | {aircraft} | FL{int(alt/100)}"
-
-                    # Create ISA deviation labels for better legend
-                    df_alt = df_alt.copy()
-                    df_alt.loc[:, "isa_label"] = df_alt["isa_dev"].apply(lambda x: f"ISA {x:+d}°C")
-                    
-                    fig = go.Figure()
-                    for mod in sorted(df_alt["mod"].unique()):
-                        df_mod = df_alt[df_alt["mod"] == mod]
-                        if df_mod.empty:
-                            continue
-                        
-                        color = "red" if mod == "Flatwing" else "green"
-                        mod_name = "Baseline" if mod == "Flatwing" else "Modified"
-                        
-                        for isa_dev in sorted(df_mod["isa_dev"].unique()):
-                            df_isa = df_mod[df_mod["isa_dev"] == isa_dev]
-                            if df_isa.empty:
-                                continue
-                            
-                            df_plot = df_isa.sort_values(x_col)
-                            isa_label = f"ISA {isa_dev:+d}°C"
-                            
-                            fig.add_trace(go.Scatter(
-                                x=pd.to_numeric(df_plot[x_col], errors="coerce"), 
-                                y=pd.to_numeric(df_plot["total_dist_nm"], errors="coerce"), 
-                                mode="lines", 
-                                name=f"{mod_name} FL{int(alt/100)} - {isa_label}",
-                                line=dict(color=color, dash=("dash" if isa_dev == -10 else "solid" if isa_dev == 0 else "dot" if isa_dev == 10 else "dashdot"))
-                            ))
-                    
-                    fig.update_layout(
-                        title=title_txt,
-                        xaxis_title=x_label,
-                        yaxis_title="Range (NM)",
-                        template="plotly_white"
-                    )
-                    out_name = (f"range_vs_ias_{aircraft}_FL{int(alt/100)}.png" if has_kias else f"range_vs_mach_{aircraft}_FL{int(alt/100)}.png")
-                    fig.write_image(str(aircraft_summary_dir / out_name), width=1600, height=900, scale=2)
-            # Family: Range vs Altitude by Speed (payload 0) with ISA temperature separation
-            for aircraft in sorted(df["aircraft"].dropna().unique()):
-                df_a0 = df[(df["aircraft"]==aircraft) & (df["payload"]==0)]
-                aircraft_summary_dir = aircraft_dirs[aircraft]["summary_plots"]
-                
-                # Decide speed dimension
-                has_ktas = ("ktas" in df_a0.columns) and pd.to_numeric(df_a0.get("ktas"), errors="coerce").notna().any()
-                has_kias = ("kias" in df_a0.columns) and pd.to_numeric(df_a0.get("kias"), errors="coerce").notna().any()
-                if has_ktas:
-                    speeds = sorted(pd.to_numeric(df_a0["ktas"], errors="coerce").dropna().unique().tolist(), reverse=True)
-                elif has_kias:
-                    speeds = sorted(pd.to_numeric(df_a0["kias"], errors="coerce").dropna().unique().tolist(), reverse=True)
-                else:
-                    speeds = sorted(pd.to_numeric(df_a0["mach"], errors="coerce").dropna().unique().tolist(), reverse=True)
-                
-                for spd in speeds:
-                    if has_ktas:
-                        df_spd = df_a0[np.isclose(pd.to_numeric(df_a0["ktas"], errors="coerce"), float(spd))]
-                    elif has_kias:
-                        df_spd = df_a0[pd.to_numeric(df_a0["kias"], errors="coerce") == int(spd)]
-                    else:
-                        df_spd = df_a0[np.isclose(pd.to_numeric(df_a0["mach"], errors="coerce"), float(spd))]
-                    if df_spd.empty:
-                        continue
-                    
-                    # Create ISA deviation labels for better legend
-                    df_spd = df_spd.copy()
-                    df_spd.loc[:, "isa_label"] = df_spd["isa_dev"].apply(lambda x: f"ISA {x:+d}°C")
-                    
-                    fig = go.Figure()
-                    for mod in sorted(df_spd["mod"].unique()):
-                        df_mod = df_spd[df_spd["mod"] == mod]
-                        if df_mod.empty:
-                            continue
-                        
-                        color = "red" if mod == "Flatwing" else "green"
-                        mod_name = "Baseline" if mod == "Flatwing" else "Modified"
-                        
-                        for isa_dev in sorted(df_mod["isa_dev"].unique()):
-                            df_isa = df_mod[df_mod["isa_dev"] == isa_dev]
-                            if df_isa.empty:
-                                continue
-                            
-                            df_plot = df_isa.sort_values("cruise_alt")
-                            isa_label = f"ISA {isa_dev:+d}°C"
-                            speed_label = (f"TAS {int(spd)} kt" if has_ktas else (f"IAS {int(spd)} kt" if has_kias else f"M {float(spd):.2f}"))
-                            
-                            fig.add_trace(go.Scatter(
-                                x=pd.to_numeric(df_plot["cruise_alt"], errors="coerce"), 
-                                y=pd.to_numeric(df_plot["total_dist_nm"], errors="coerce"), 
-                                mode="lines", 
-                                name=f"{mod_name} {speed_label} - {isa_label}",
-                                line=dict(color=color, dash=("dash" if isa_dev == -10 else "solid" if isa_dev == 0 else "dot" if isa_dev == 10 else "dashdot"))
-                            ))
-                    
-                    title_txt = f"Range vs Altitude (Payload=0) | {aircraft} | {('TAS ' + str(int(spd)) + ' kt') if has_ktas else (('IAS ' + str(int(spd)) + ' kt') if has_kias else ('M ' + format(float(spd), '.2f')))}"
-                    fig.update_layout(
-                        title=title_txt,
-                        xaxis_title="Altitude (ft)",
-                        yaxis_title="Range (NM)",
-                        template="plotly_white"
-                    )
-                    out_name = (f"range_vs_altitude_{aircraft}_IAS{int(spd)}.png" if has_kias else f"range_vs_altitude_{aircraft}_M{float(spd):.2f}.png")
-                    fig.write_image(str(aircraft_summary_dir / out_name), width=1600, height=900, scale=2)
-        except Exception as e:
-            import traceback
-            print("[summary_plots] Error while generating/saving plots:\n" + traceback.format_exc())
+    if shard:
+        # Full-precision rows for batch.merge (the summary CSVs round some columns)
+        df.to_csv(base_ts_dir / "shard_rows.csv", index=False)
+    if df.empty:
+        write_meta(base_ts_dir, aircraft_dirs, settings, prescreened_out, duplicate_cases, envelope_bounds)
+        return df
+    # Summary plots render (kaleido) while the tables and meta files are written
+    with ThreadPoolExecutor(max_workers=1) as plot_ex:
+        plots = (plot_ex.submit(write_summary_plots, df, aircraft_dirs, parallel_workers, use_threads)
+                 if save_summary_plots else None)
+        write_summary_tables(df, base_ts_dir, aircraft_dirs)
+        write_meta(base_ts_dir, aircraft_dirs, settings, prescreened_out, duplicate_cases, envelope_bounds)
+        if plots is not None:
+            plots.result()
 
     return df
 
@@ -869,14 +1444,42 @@ def parse_args():
     p.add_argument("--tas", nargs="*", type=float, default=None, help="Optional TAS values for turboprops in kts (e.g., --tas 170 160 150)")
     p.add_argument("--alts", nargs="*", type=int, default=None, help="Optional custom altitudes in ft (e.g., --alts 41000 39000 35000)")
     p.add_argument("--no-plots", action="store_true", help="Disable per-run PNG plot export (fuel vs distance)")
+    p.add_argument("--plot-mode", choices=["png", "deferred"], default="png",
+                   help="png: render every per-run plot; deferred: store its fuel/distance arrays and render on request with batch.case_plots")
     p.add_argument("--no-summary-plots", action="store_true", help="Disable summary PNG plots (payload-range and family plots)")
+    p.add_argument("--timeseries", action="store_true", help="Save each run's time history")
+    p.add_argument("--timeseries-format", choices=["dataset", "files"], default="dataset",
+                   help="dataset: one Parquet dataset partitioned by aircraft/mod, read with batch.timeseries; files: one Parquet file per run")
     p.add_argument("--out", type=str, default=None, help="Output directory (default batch_outputs/{timestamp})")
+    p.add_argument("--fast-terminal", action="store_true", help="Use tabulated takeoff/landing increments instead of detailed physics")
+    p.add_argument("--fast-climb", action="store_true", help="Use tabulated time/fuel/distance-to-climb instead of integrating the climb")
+    p.add_argument("--mode", choices=["full", "fast"], default="full", help="full: time-stepped simulation per case; fast: specific-range integration")
+    p.add_argument("--fast-check", type=int, default=4, help="Number of fast-mode cases re-run with full physics for fast_crosscheck.csv")
+    p.add_argument("--payload-mode", choices=["sweep", "corners"], default="sweep", help="sweep: evenly spaced payloads; corners: MZFW, MRW/max-fuel knee and zero payload only")
+    p.add_argument("--sweep-mode", choices=["grid", "adaptive"], default="grid", help="grid: uniform altitude/speed grid; adaptive: coarse grid refined near range changes and feasibility edges")
+    p.add_argument("--case-budget", type=int, default=None, help="Total case budget for --sweep-mode adaptive (default: size of the uniform grid)")
+    p.add_argument("--adaptive-tol", type=float, default=10.0, help="Range change (NM) that triggers adaptive refinement between neighbouring cases")
+    p.add_argument("--prescreen", choices=["off", "flag", "skip"], default="flag", help="off: no pre-screen; flag: record predicted limits (and skip cases whose output would be hidden); skip: also skip every predicted-infeasible case")
+    p.add_argument("--prescreen-margin", type=float, default=0.15, help="Fractional rate-of-climb margin around roc_min for the marginal band")
+    p.add_argument("--envelope-bound", action="store_true", help="Trim altitude/Mach grids to the solved ceiling and maximum level speed (plus one point beyond)")
+    p.add_argument("--param", dest="config_params", action="append", default=None,
+                   help="Config-override sweep axis, repeatable: field=start:stop:step, field*=values or field+=values "
+                        "(e.g. --param cdo=0.026:0.030:0.001 --param h*=1.0,1.2)")
+    p.add_argument("--shard", type=str, default=None,
+                   help="Run only slice i of N of the case grid (e.g. 2/4), balanced by predicted runtime; combine shard outputs with batch.merge")
+    p.add_argument("--queue", type=str, default=None,
+                   help="Queue directory: write cases as task files for `python -m batch.worker DIR` processes instead of running them here")
+    p.add_argument("--lease-timeout", type=float, default=LEASE_TIMEOUT_S, help="Seconds before a silent worker's claimed case is re-queued")
+    p.add_argument("--corner-tol", type=float, default=None, help="With --payload-mode corners, add midpoints where linear interpolation misses range by more than this (NM)")
+    p.add_argument("--io-workers", type=int, default=IO_WORKERS, help="Processes writing per-run plots/timeseries alongside the simulations")
+    p.add_argument("--server", type=str, default=None,
+                   help="Job server URL (job_server.py): submit the sweep there and wait for it instead of running it here")
     return p.parse_args()
 
 
 def main():
     args = parse_args()
-    run_payload_range_batch(
+    kwargs = dict(
         aircraft_models=args.aircraft,
         mods=args.mods,
         payload_steps=args.payload_step,
@@ -885,13 +1488,44 @@ def main():
         flap_settings=args.flaps,
         parallel_workers=args.parallel,
         save_plots=not args.no_plots,
+        plot_mode=args.plot_mode,
         output_dir=args.out,
         mach_values=args.mach,
         kias_values=args.kias,
         tas_values=args.tas,
         alt_values=args.alts,
         save_summary_plots=not args.no_summary_plots,
+        save_timeseries=args.timeseries,
+        timeseries_format=args.timeseries_format,
+        fast_terminal=args.fast_terminal,
+        fast_climb=args.fast_climb,
+        mode=args.mode,
+        fast_check_cases=args.fast_check,
+        payload_mode=args.payload_mode,
+        corner_refine_tol_nm=args.corner_tol,
+        sweep_mode=args.sweep_mode,
+        case_budget=args.case_budget,
+        adaptive_tol_nm=args.adaptive_tol,
+        prescreen=args.prescreen,
+        prescreen_margin=args.prescreen_margin,
+        envelope_bound=args.envelope_bound,
+        config_params=args.config_params,
+        lease_timeout=args.lease_timeout,
+        io_workers=args.io_workers,
     )
+    if args.server:
+        if args.out or args.shard or args.queue:
+            raise SystemExit("--out, --shard and --queue are chosen by the job server; drop them with --server")
+        client = JobClient(args.server)
+        job_id = client.submit_sweep(**{k: v for k, v in kwargs.items() if k != "output_dir"})
+        print(f"Submitted job {job_id} to {args.server}")
+        status = client.wait(job_id, on_progress=lambda s: print(f"\r{format_progress(s)}", end="", flush=True))
+        print()
+        if status["state"] != "done":
+            raise SystemExit(f"Job {job_id} {status['state']}" + (f": {status['error']}" if status["error"] else ""))
+        print(f"Outputs in {status['output_dir']}")
+        return
+    run_payload_range_batch(**kwargs, shard=args.shard, queue_dir=args.queue)
 
 
 if __name__ == "__main__":
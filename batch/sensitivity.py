@@ -0,0 +1,462 @@
+import argparse
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from aircraft_config import AIRCRAFT_CONFIG, CONFIG_FIELDS
+try:
+    from aircraft_config import TURBOPROP_PARAMS
+except ImportError:
+    TURBOPROP_PARAMS = {}
+from config_overrides import ensure_config, register_variant
+from simulation import run_simulation
+from utils import load_airports
+from batch.payload_range import compute_initial_fuel
+from batch.terminal_tables import default_fuel_policy
+
+# Central-difference half-steps of the aircraft parameters (absolute, in config units)
+CONFIG_STEPS = {
+    "cdo": 0.0005,
+    "e": 0.01,
+    "b": 0.5,
+    "h": 0.25,
+    "sfc": 0.01,
+    "thrust_mult": 0.01,
+    "bow": 50.0,
+}
+# Central-difference half-steps of the mission inputs; "speed" is Mach for jets and KIAS for turboprops
+MISSION_STEPS = {
+    "payload": 100.0,
+    "isa_dev": 2.0,
+    "cruise_alt": 1000.0,
+    "speed": 0.01,
+}
+TURBOPROP_SPEED_STEP = 5.0
+# Half-step of config fields without a CONFIG_STEPS entry (fraction of the value)
+DEFAULT_REL_STEP = 0.01
+# Coarsest fixed integration step of run_simulation (s), used in climb, cruise and descent
+TIME_STEP_S = 5.0
+# Payload offsets (lb) of the time-step noise probe
+NOISE_OFFSETS = (-3.0, -2.0, -1.0, 1.0, 2.0, 3.0)
+# An output is noise-limited when |f+ - f-| is within this many noise standard deviations
+NOISE_SIGMAS = 3.0
+# Output -> mission that produces it: "range" flies tanks-full to the reserve, "route" flies dep -> arr
+OUTPUTS = {
+    "range_nm": "range",
+    "range_time_min": "range",
+    "fuel_burned_lb": "route",
+    "time_min": "route",
+}
+
+# Route and aircraft setup shared by every perturbed run, installed once per worker process
+_SETUP = {}
+
+
+def _init_worker(setup: dict) -> None:
+    """Install the shared base setup and warm the airport table in this worker."""
+    _SETUP.clear()
+    _SETUP.update(setup)
+    load_airports()
+
+
+def _reserve_point(df: pd.DataFrame, reserve_fuel: float) -> tuple[float, float]:
+    """Distance (NM) and time (min) flown when the fuel remaining reaches the reserve (as in the payload-range batch)."""
+    mask = df["Fuel Remaining (lb)"] >= float(reserve_fuel)
+    if not mask.any():
+        return np.nan, np.nan
+    return float(df.loc[mask, "Distance (NM)"].max()), float(df.loc[mask, "Time (s)"].max()) / 60.0
+
+
+def _run_point(point: dict) -> dict:
+    """Run one (possibly perturbed) mission on the installed setup and return its outputs."""
+    setup = _SETUP
+    aircraft, mod = setup["aircraft"], point["mod"]
+    out = {**point}
+    try:
+        ac = ensure_config(aircraft, mod)
+        range_mode = point["mission"] == "range"
+        if range_mode:
+            initial_fuel = compute_initial_fuel(float(ac[22]), float(ac[20]), float(ac[18]), point["payload"])
+        else:
+            initial_fuel = setup["route_fuel"]
+        df, results, *_ = run_simulation(
+            setup["dep_airport"], setup["arr_airport"], aircraft, mod, setup["flap"],
+            point["payload"], initial_fuel, setup["taxi_fuel"], setup["reserve_fuel"],
+            int(round(point["cruise_alt"])), "No Wind", False,
+            write_output_file=False,
+            cruise_mach=0.0 if setup["is_turboprop"] else point["speed"],
+            cruise_kias=point["speed"] if setup["is_turboprop"] else None,
+            isa_dev_c=point["isa_dev"],
+            range_mode=range_mode,
+        )
+        error = results.get("error") or "; ".join(results.get("exceedances", [])) or None
+        out["status"] = "ok" if error is None else "failed"
+        out["error_message"] = error
+        # Unrounded outputs from the time history (the results dict rounds to whole lb/min/NM)
+        has_history = isinstance(df, pd.DataFrame) and not df.empty
+        if has_history and range_mode:
+            out["range_nm"], out["range_time_min"] = _reserve_point(df, setup["reserve_fuel"])
+        elif has_history and error is None:
+            out["fuel_burned_lb"] = initial_fuel - setup["taxi_fuel"] - float(df["Fuel Remaining (lb)"].iloc[-1])
+            out["time_min"] = float(df["Time (s)"].iloc[-1]) / 60.0
+    except Exception as e:
+        out["status"] = "error"
+        out["error_message"] = str(e)
+    return out
+
+
+def _config_step(aircraft: str, field: str, mods: list[str]) -> float:
+    """Half-step of a config field: CONFIG_STEPS, else DEFAULT_REL_STEP of the value (at least 1 for int fields)."""
+    if field in CONFIG_STEPS:
+        return CONFIG_STEPS[field]
+    i = CONFIG_FIELDS.index(field)
+    values = [AIRCRAFT_CONFIG[(aircraft, m)][i] for m in mods]
+    step = DEFAULT_REL_STEP * max(abs(float(np.mean(values))), 1e-9)
+    return max(round(step), 1) if all(isinstance(v, int) for v in values) else step
+
+
+def differing_fields(aircraft: str, mod_a: str, mod_b: str) -> list[str]:
+    """Numeric config fields whose values differ between two mods of the aircraft."""
+    a, b = AIRCRAFT_CONFIG[(aircraft, mod_a)], AIRCRAFT_CONFIG[(aircraft, mod_b)]
+    return [
+        field for field, x, y in zip(CONFIG_FIELDS, a, b)
+        if isinstance(x, (int, float)) and isinstance(y, (int, float)) and not np.isclose(x, y, rtol=1e-12, atol=0.0)
+    ]
+
+
+def _mission_limits(setup: dict, mod: str) -> dict:
+    """Bounds the perturbed mission inputs are clipped to."""
+    ac = AIRCRAFT_CONFIG[(setup["aircraft"], mod)]
+    speed_max = np.inf if setup["is_turboprop"] else float(ac[25])
+    return {
+        "payload": (0.0, float(ac[19]) - float(ac[18])),
+        "isa_dev": (-np.inf, np.inf),
+        "cruise_alt": (0.0, float(ac[8])),
+        "speed": (0.0, speed_max),
+    }
+
+
+def _zero_fuel_weight(aircraft: str, point: dict) -> float:
+    return float(AIRCRAFT_CONFIG[(aircraft, point["mod"])][18]) + float(point["payload"])
+
+
+def route_fuel(setup: dict, mod: str, points: list[dict] | None = None) -> float:
+    """
+    Fuel load every "route" run carries: tanks full within MRW at the base
+    payload and BOW of the mod, less the largest zero-fuel-weight increase among
+    the perturbed points, so the heaviest run still fits within MRW.
+    """
+    ac = AIRCRAFT_CONFIG[(setup["aircraft"], mod)]
+    base_zfw = float(ac[18]) + float(setup["payload"])
+    headroom = max([_zero_fuel_weight(setup["aircraft"], p) - base_zfw for p in points or []] + [0.0])
+    return compute_initial_fuel(float(ac[22]), float(ac[20]) - headroom, float(ac[18]), float(setup["payload"]))
+
+
+def build_points(setup: dict, mod: str, config_fields: list[str], mission_inputs: list[str],
+                 config_steps: dict | None = None, noise_probe: bool = True) -> list[dict]:
+    """
+    Base, central-difference and noise-probe runs of one mod, for every mission.
+
+    Config perturbations are registered as override variants of the mod (so
+    spawned workers rebuild them with ensure_config); mission perturbations are
+    clipped to the payload, ceiling and MMO limits, making the difference
+    one-sided at a bound.
+
+    Fuel convention: every "range" run is refuelled to tanks full within MRW at
+    its own payload and BOW, so the ramp weight stays at MRW while payload trades
+    against fuel; every "route" run carries the same setup["route_fuel"]
+    (route_fuel()), so payload, BOW and the other inputs change the weight flown.
+
+    Args:
+        setup: Shared base setup (base payload, route_fuel, isa_dev, cruise_alt, speed, missions).
+        mod: Mod the perturbations are taken around.
+        config_fields: CONFIG_FIELDS names to differentiate with respect to.
+        mission_inputs: MISSION_STEPS names to differentiate with respect to.
+        config_steps: Half-step per config field (default _config_step).
+
+    Returns:
+        list[dict]: One point per run with mod, param, side, x (perturbed value) and mission.
+    """
+    aircraft = setup["aircraft"]
+    config_steps = config_steps or {}
+    base = {k: float(setup[k]) for k in MISSION_STEPS}
+    limits = _mission_limits(setup, mod)
+    ac = AIRCRAFT_CONFIG[(aircraft, mod)]
+    runs = [{"mod": mod, "param": "base", "side": 0.0, "x": np.nan, **base}]
+    for field in config_fields:
+        step = config_steps.get(field) or _config_step(aircraft, field, [mod])
+        x0 = float(ac[CONFIG_FIELDS.index(field)])
+        for side in (-1.0, 1.0):
+            variant = register_variant(aircraft, mod, [(field, "+", side * step)])
+            x = float(AIRCRAFT_CONFIG[(aircraft, variant)][CONFIG_FIELDS.index(field)])
+            runs.append({"mod": variant, "param": field, "side": side, "x": x, **base, "x0": x0})
+    for name in mission_inputs:
+        step = TURBOPROP_SPEED_STEP if name == "speed" and setup["is_turboprop"] else MISSION_STEPS[name]
+        lo, hi = limits[name]
+        for side in (-1.0, 1.0):
+            x = float(np.clip(base[name] + side * step, lo, hi))
+            runs.append({"mod": mod, "param": name, "side": side, "x": x, **{**base, name: x}, "x0": base[name]})
+    if noise_probe:
+        lo, hi = limits["payload"]
+        for offset in NOISE_OFFSETS:
+            x = float(np.clip(base["payload"] + offset, lo, hi))
+            runs.append({"mod": mod, "param": "noise", "side": offset, "x": x, **{**base, "payload": x}})
+    points = []
+    for run in runs:
+        for mission in setup["missions"]:
+            points.append({**run, "base_mod": mod, "mission": mission})
+    return points
+
+
+def _output_frame(rows: list[dict], base_mod: str) -> pd.DataFrame:
+    """One row per run (mission outputs merged) for the runs taken around base_mod."""
+    df = pd.DataFrame([r for r in rows if r["base_mod"] == base_mod])
+    for name in OUTPUTS:
+        if name not in df.columns:
+            df[name] = np.nan
+    keys = ["param", "side"]
+    agg = {name: "max" for name in OUTPUTS}
+    agg.update({"x": "first", "status": lambda s: "ok" if (s == "ok").all() else "failed"})
+    if "x0" in df.columns:
+        agg["x0"] = "first"
+    return df.groupby(keys, dropna=False).agg(agg).reset_index()
+
+
+def _quantization_sigma(base: pd.Series) -> dict:
+    """
+    Standard deviation of an output whose end point can fall anywhere within one
+    fixed time step (uniform over TIME_STEP_S), from the mean rate of the base run.
+    """
+    q = TIME_STEP_S / np.sqrt(12.0)
+    range_rate = base["range_nm"] / (60.0 * base["range_time_min"]) if base["range_time_min"] else np.nan
+    fuel_rate = base["fuel_burned_lb"] / (60.0 * base["time_min"]) if base["time_min"] else np.nan
+    return {
+        "range_nm": q * range_rate,
+        "range_time_min": q / 60.0,
+        "fuel_burned_lb": q * fuel_rate,
+        "time_min": q / 60.0,
+    }
+
+
+def noise_sigma(runs: pd.DataFrame, base_payload: float) -> dict:
+    """
+    Time-step noise of every output: the larger of the quantization of one fixed
+    time step and the residual standard deviation of a straight line fitted
+    through the base run and the tiny payload offsets of the probe. Over a few lb
+    the true response is linear, so what is left is the jitter from segment
+    transitions landing on the integration step.
+    """
+    probe = runs[runs["param"].isin(["noise", "base"])].copy()
+    probe["payload_x"] = np.where(probe["param"] == "base", base_payload, probe["x"])
+    floor = _quantization_sigma(runs[runs["param"] == "base"].iloc[0])
+    sigma = {}
+    for name in OUTPUTS:
+        sub = probe[["payload_x", name]].dropna()
+        fit_sd = np.nan
+        if len(sub) >= 3 and sub["payload_x"].nunique() >= 2:
+            coef = np.polyfit(sub["payload_x"], sub[name], 1)
+            resid = sub[name] - np.polyval(coef, sub["payload_x"])
+            fit_sd = float(np.sqrt(np.sum(resid ** 2) / max(len(sub) - 2, 1)))
+        sigma[name] = float(np.nanmax([fit_sd, floor[name]])) if np.isfinite([fit_sd, floor[name]]).any() else np.nan
+    return sigma
+
+
+def jacobian_frame(runs: pd.DataFrame, sigma: dict) -> pd.DataFrame:
+    """
+    Central-difference derivatives of every output with respect to every
+    perturbed parameter, with elasticities and the noise-limited flag.
+
+    Returns:
+        pd.DataFrame: One row per (param, output) with x0, x_minus, x_plus,
+        f0, f_minus, f_plus, derivative, elasticity (d ln f / d ln x), deriv_noise
+        (standard error of the derivative from the time-step noise) and noise_limited.
+    """
+    base = runs[runs["param"] == "base"].iloc[0]
+    rows = []
+    for param, sub in runs[~runs["param"].isin(["base", "noise"])].groupby("param", sort=False):
+        minus, plus = sub[sub["side"] < 0].iloc[0], sub[sub["side"] > 0].iloc[0]
+        span = float(plus["x"] - minus["x"])
+        for name in OUTPUTS:
+            f0, fm, fp = float(base[name]), float(minus[name]), float(plus[name])
+            deriv = (fp - fm) / span if span else np.nan
+            sd = sigma.get(name, np.nan)
+            diff_noise = NOISE_SIGMAS * sd * np.sqrt(2.0) if np.isfinite(sd) else np.nan
+            rows.append({
+                "param": param,
+                "output": name,
+                "x0": float(plus["x0"]),
+                "x_minus": float(minus["x"]),
+                "x_plus": float(plus["x"]),
+                "f0": f0,
+                "f_minus": fm,
+                "f_plus": fp,
+                "derivative": deriv,
+                "elasticity": deriv * float(plus["x0"]) / f0 if f0 else np.nan,
+                "deriv_noise": sd * np.sqrt(2.0) / abs(span) if span else np.nan,
+                "noise_limited": bool(np.isfinite(diff_noise) and abs(fp - fm) <= diff_noise) or not np.isfinite(deriv),
+            })
+    return pd.DataFrame(rows)
+
+
+def attribution_frame(jac_a: pd.DataFrame, jac_b: pd.DataFrame, aircraft: str, mod_a: str, mod_b: str) -> pd.DataFrame:
+    """
+    Linear attribution of the mod_b - mod_a change of every output to the config
+    fields that differ between the mods, using the average of the two Jacobians
+    (trapezoidal rule along the straight path between the configs). The
+    "residual" row is the actual change not explained by the linear terms.
+    """
+    fields = differing_fields(aircraft, mod_a, mod_b)
+    ac_a, ac_b = AIRCRAFT_CONFIG[(aircraft, mod_a)], AIRCRAFT_CONFIG[(aircraft, mod_b)]
+    rows = []
+    for name in OUTPUTS:
+        ja = jac_a[jac_a["output"] == name].set_index("param")
+        jb = jac_b[jac_b["output"] == name].set_index("param")
+        f_a, f_b = float(ja["f0"].iloc[0]), float(jb["f0"].iloc[0])
+        explained = 0.0
+        for field in fields:
+            i = CONFIG_FIELDS.index(field)
+            dx = float(ac_b[i]) - float(ac_a[i])
+            j_avg = 0.5 * (float(ja.loc[field, "derivative"]) + float(jb.loc[field, "derivative"])) if field in ja.index and field in jb.index else np.nan
+            contribution = j_avg * dx
+            explained += contribution if np.isfinite(contribution) else 0.0
+            rows.append({
+                "output": name, "term": field, "delta_param": dx, "jacobian_avg": j_avg, "contribution": contribution,
+                "noise_limited": bool(ja.loc[field, "noise_limited"] and jb.loc[field, "noise_limited"]) if field in ja.index and field in jb.index else True,
+            })
+        rows.append({"output": name, "term": "residual", "contribution": (f_b - f_a) - explained})
+        rows.append({"output": name, "term": "total", "contribution": f_b - f_a, "f_a": f_a, "f_b": f_b})
+    return pd.DataFrame(rows)
+
+
+def run_sensitivity(setup: dict, mods: list[str], config_fields: list[str] | None = None,
+                    mission_inputs: list[str] | None = None, parallel_workers: int = 6) -> dict:
+    """
+    Finite-difference Jacobian of the mission outputs around the base setup for
+    one or two mods. All base, perturbed and noise-probe runs of every mod are
+    dispatched together over one process pool sharing the base setup.
+
+    With two mods the config fields that differ between them are added to the
+    differentiated fields (same half-step for both, so the Jacobians line up) and
+    the second-minus-first change of every output is attributed to them.
+
+    "range" runs are refuelled to tanks full within MRW (ramp weight held at
+    MRW); "route" runs all carry one fuel load, setup["route_fuel"] (default
+    route_fuel() of the first mod over all points: the base load less the
+    headroom the heaviest perturbed run needs under MRW), so fuel burned and time
+    respond to payload, BOW and the other weight inputs.
+
+    Args:
+        setup: aircraft, flap, dep/arr airports, taxi/reserve fuel, base payload,
+            isa_dev, cruise_alt, speed (Mach, or KIAS for turboprops), is_turboprop,
+            missions (subset of "range", "route") and optionally route_fuel (lb).
+        mods: One mod, or [baseline, modified] for attribution.
+        config_fields: Config fields to differentiate (default CONFIG_STEPS).
+        mission_inputs: Mission inputs to differentiate (default MISSION_STEPS).
+
+    Returns:
+        dict: jacobians (mod -> jacobian_frame), noise (mod -> sigma per output),
+        attribution (attribution_frame, or None with one mod), runs (one row per run)
+        and route_fuel (lb).
+    """
+    aircraft = setup["aircraft"]
+    config_fields = list(config_fields if config_fields is not None else CONFIG_STEPS)
+    mission_inputs = list(mission_inputs if mission_inputs is not None else MISSION_STEPS)
+    if len(mods) == 2:
+        config_fields += [f for f in differing_fields(aircraft, *mods) if f not in config_fields]
+    steps = {f: _config_step(aircraft, f, mods) for f in config_fields}
+    points = []
+    for mod in mods:
+        ac = AIRCRAFT_CONFIG[(aircraft, mod)]
+        fields = [f for f in config_fields if isinstance(ac[CONFIG_FIELDS.index(f)], (int, float))]
+        points.extend(build_points(setup, mod, fields, mission_inputs, steps))
+    if setup.get("route_fuel") is None:
+        setup = {**setup, "route_fuel": route_fuel(setup, mods[0], points)}
+    with ProcessPoolExecutor(max_workers=parallel_workers, initializer=_init_worker, initargs=(setup,)) as ex:
+        rows = list(ex.map(_run_point, points))
+    jacobians, noise = {}, {}
+    for mod in mods:
+        runs = _output_frame(rows, mod)
+        noise[mod] = noise_sigma(runs, float(setup["payload"]))
+        jacobians[mod] = jacobian_frame(runs, noise[mod])
+    attribution = attribution_frame(jacobians[mods[0]], jacobians[mods[1]], aircraft, *mods) if len(mods) == 2 else None
+    return {"jacobians": jacobians, "noise": noise, "attribution": attribution, "runs": rows,
+            "route_fuel": setup["route_fuel"]}
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Finite-difference sensitivities of range, fuel and time (with mod benefit attribution)")
+    p.add_argument("--dep", default="KSZT")
+    p.add_argument("--arr", default="KSAN")
+    p.add_argument("--aircraft", required=True)
+    p.add_argument("--mod", default="Flatwing")
+    p.add_argument("--compare-mod", default=None, help="Second mod (e.g. Tamarack): attribute its benefit over --mod")
+    p.add_argument("--flap", type=int, default=0)
+    p.add_argument("--alt", type=int, required=True, help="Cruise altitude (ft)")
+    p.add_argument("--mach", type=float, default=None, help="Cruise Mach (default 0.9 MMO)")
+    p.add_argument("--kias", type=float, default=None, help="Cruise IAS for turboprops (kts)")
+    p.add_argument("--payload", type=float, default=None, help="Payload (lb, default half of MZFW - BOW)")
+    p.add_argument("--isa", type=float, default=0.0, help="ISA deviation (C)")
+    p.add_argument("--params", nargs="+", default=list(CONFIG_STEPS), choices=CONFIG_FIELDS, help="Config fields to differentiate")
+    p.add_argument("--inputs", nargs="*", default=list(MISSION_STEPS), choices=list(MISSION_STEPS), help="Mission inputs to differentiate")
+    p.add_argument("--missions", nargs="+", default=["range", "route"], choices=["range", "route"])
+    p.add_argument("--parallel", type=int, default=6)
+    p.add_argument("--out", type=str, default=None, help="Optional directory for Jacobian, attribution and run CSVs")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    ac = AIRCRAFT_CONFIG[(args.aircraft, args.mod)]
+    taxi_fuel, reserve_fuel = default_fuel_policy(args.aircraft, args.mod)
+    is_turboprop = args.aircraft in TURBOPROP_PARAMS
+    if is_turboprop:
+        if args.kias is None:
+            raise SystemExit("--kias is required for turboprops")
+        speed = args.kias
+    else:
+        speed = args.mach if args.mach is not None else 0.9 * float(ac[25])
+    setup = {
+        "dep_airport": args.dep,
+        "arr_airport": args.arr,
+        "aircraft": args.aircraft,
+        "flap": args.flap,
+        "taxi_fuel": float(taxi_fuel),
+        "reserve_fuel": float(reserve_fuel),
+        "payload": args.payload if args.payload is not None else 0.5 * (float(ac[19]) - float(ac[18])),
+        "isa_dev": args.isa,
+        "cruise_alt": args.alt,
+        "speed": float(speed),
+        "is_turboprop": is_turboprop,
+        "missions": args.missions,
+    }
+    mods = [args.mod] + ([args.compare_mod] if args.compare_mod else [])
+    outputs = [name for name, mission in OUTPUTS.items() if mission in args.missions]
+    t0 = time.perf_counter()
+    res = run_sensitivity(setup, mods, args.params, args.inputs, parallel_workers=args.parallel)
+    print(f"{len(res['runs'])} runs in {time.perf_counter() - t0:.1f} s (route fuel {res['route_fuel']:.0f} lb)")
+    for mod, jac in res["jacobians"].items():
+        print(f"\n{args.aircraft} {mod}: derivative (elasticity), * = noise-limited")
+        jac = jac[jac["output"].isin(outputs)]
+        cells = jac.apply(lambda r: f"{r['derivative']:.4g} ({r['elasticity']:+.3f}){'*' if r['noise_limited'] else ''}", axis=1)
+        print(jac.assign(cell=cells).pivot(index="param", columns="output", values="cell")[outputs].to_string())
+        print("time-step noise (1 sigma): " + ", ".join(f"{k} {v:.3g}" for k, v in res["noise"][mod].items() if k in outputs))
+    if res["attribution"] is not None:
+        attr = res["attribution"]
+        attr = attr[attr["output"].isin(outputs)]
+        print(f"\n{args.compare_mod} - {args.mod} attribution")
+        print(attr.pivot(index="term", columns="output", values="contribution")[outputs].round(2).to_string())
+    if args.out:
+        out_dir = Path(args.out)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        pd.concat([j.assign(mod=m) for m, j in res["jacobians"].items()]).to_csv(out_dir / "sensitivity_jacobian.csv", index=False)
+        pd.DataFrame(res["runs"]).to_csv(out_dir / "sensitivity_runs.csv", index=False)
+        if res["attribution"] is not None:
+            res["attribution"].to_csv(out_dir / "sensitivity_attribution.csv", index=False)
+        print(f"Saved sensitivity CSVs to {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from aircraft_config import AIRCRAFT_CONFIG
+try:
+    from aircraft_config import TURBOPROP_PARAMS
+except ImportError:
+    TURBOPROP_PARAMS = {}
+from simulation import run_simulation
+from performance import range_mode_step_plan
+from batch.climb_tables import load_or_build_climb_table
+from batch.payload_range import compute_initial_fuel
+from batch.terminal_tables import default_fuel_policy
+
+
+def _mission_summary(results: dict) -> dict:
+    return {
+        "total_dist_nm": results.get("Total Dist (NM)"),
+        "total_time_min": results.get("Total Time (min)"),
+        "fuel_burned_lb": results.get("Total Fuel Burned (lb)"),
+        "first_level_off_ft": results.get("First Level-Off Alt (ft)"),
+        "step_altitudes_ft": results.get("Step Altitudes (ft)"),
+    }
+
+
+def compare_step_plan(aircraft: str, mod: str, payload: float, cruise_alt: int, isa_dev: float,
+                      mach: float | None = None, kias: float | None = None, objective: str = "fuel",
+                      stage_nm: float = 25.0, flap: int = 0) -> dict:
+    """
+    Optimize a range-mode step-climb schedule and fly it in run_simulation next
+    to the standard (level at cruise_alt with greedy steps) profile.
+    """
+    ac = AIRCRAFT_CONFIG[(aircraft, mod)]
+    taxi_fuel, reserve_fuel = default_fuel_policy(aircraft, mod)
+    initial_fuel = compute_initial_fuel(ac[22], ac[20], ac[18], payload)
+    is_turboprop = aircraft in TURBOPROP_PARAMS
+    mach = float(mach if mach is not None else (0.0 if is_turboprop else ac[25]))
+    speed_goal = float(kias) if (is_turboprop and kias is not None) else mach
+    table = load_or_build_climb_table(aircraft, mod, flap, isa_devs=[int(isa_dev)], target_alts=[int(cruise_alt)])
+    plan = range_mode_step_plan(aircraft, mod, table, payload, initial_fuel, taxi_fuel, reserve_fuel,
+                                cruise_alt, isa_dev, speed_goal, objective=objective, stage_nm=stage_nm)
+    runs = {}
+    for label, step_plan in (("standard", None), ("optimized", plan["step_plan"])):
+        _, results, *_ = run_simulation(
+            "KSZT", "KSAN", aircraft, mod, flap, payload, initial_fuel, taxi_fuel, reserve_fuel,
+            cruise_alt, "No Wind", False,
+            write_output_file=False,
+            cruise_mach=mach,
+            cruise_kias=(kias if is_turboprop else None),
+            isa_dev_c=isa_dev,
+            range_mode=True,
+            step_plan=step_plan,
+        )
+        runs[label] = _mission_summary(results)
+    return {"plan": plan, "runs": runs}
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Optimize a range-mode step-climb schedule and compare it with the standard profile")
+    p.add_argument("--aircraft", required=True)
+    p.add_argument("--mod", default="Flatwing")
+    p.add_argument("--payload", type=float, default=0.0)
+    p.add_argument("--alt", type=int, required=True, help="Initial cruise altitude (ft)")
+    p.add_argument("--isa", type=float, default=0.0)
+    p.add_argument("--mach", type=float, default=None, help="Cruise Mach (default MMO)")
+    p.add_argument("--kias", type=float, default=None, help="Cruise IAS for turboprops (kts)")
+    p.add_argument("--objective", choices=["fuel", "time"], default="fuel")
+    p.add_argument("--stage-nm", type=float, default=25.0, help="DP stage length (NM)")
+    p.add_argument("--out", type=str, default=None, help="Optional CSV path for the step plan")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    res = compare_step_plan(args.aircraft, args.mod, args.payload, args.alt, args.isa, mach=args.mach,
+                            kias=args.kias, objective=args.objective, stage_nm=args.stage_nm)
+    plan = res["plan"]
+    print("Step plan (NM from departure, ft):", plan["step_plan"])
+    print(f"Predicted cruise: {plan['fuel_lb']:.0f} lb / {plan['time_min']:.1f} min "
+          f"(level: {plan['level_fuel_lb']:.0f} lb / {plan['level_time_min']:.1f} min)")
+    print(pd.DataFrame(res["runs"]).T.to_string())
+    if args.out:
+        path = Path(args.out)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame(plan["step_plan"], columns=["dist_nm", "alt_ft"]).to_csv(path, index=False)
+        print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Line style per ISA deviation in the multi-ISA plots (others: dashdot)
+ISA_DASH = {-10: "dash", 0: "solid", 10: "dot"}
+RENDER_CHUNK = 4
+
+
+def _mod_style(mod: str, long_names: bool) -> tuple[str, str]:
+    if mod == "Flatwing":
+        return "red", ("Baseline (Flatwing)" if long_names else "Baseline")
+    return "green", ("Modified (Tamarack)" if long_names else "Modified")
+
+
+def _isa_label(isa_dev) -> str:
+    return f"ISA {int(isa_dev):+d}°C"
+
+
+def _speed_column(df_a: pd.DataFrame) -> str:
+    """Speed axis of an aircraft's rows: TAS for turboprops (then IAS), else Mach."""
+    for col in ("ktas", "kias"):
+        if col in df_a.columns and pd.to_numeric(df_a[col], errors="coerce").notna().any():
+            return col
+    return "mach"
+
+
+def _payload_range_xy(ranges: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Payload-range polyline of one series: max range per payload, range made
+    monotone as payload decreases and shifted by one point (the curve starts at
+    zero range), consecutive duplicate ranges dropped keeping the last.
+    """
+    ranges = ranges.dropna().sort_index(ascending=False)
+    x_mon = np.maximum.accumulate(ranges.to_numpy(dtype=float))
+    y = ranges.index.to_numpy()
+    x = np.concatenate(([0.0], x_mon[:-1])) if len(x_mon) else x_mon
+    if len(x) > 1:
+        keep = np.concatenate(((x[:-1] < x[1:] - 1e-9), [True]))
+        x, y = x[keep], y[keep]
+    return x, y
+
+
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """Rows with numeric range/speed columns and a per-aircraft speed key (rounded for exact grouping)."""
+    data = df[["aircraft", "mod", "isa_dev", "cruise_alt", "payload"]].copy()
+    data["range"] = pd.to_numeric(df["total_dist_nm"], errors="coerce")
+    data["speed_col"] = ""
+    data["speed"] = np.nan
+    for aircraft, idx in data.groupby("aircraft").groups.items():
+        col = _speed_column(df.loc[idx])
+        data.loc[idx, "speed_col"] = col
+        data.loc[idx, "speed"] = pd.to_numeric(df.loc[idx, col], errors="coerce").round(1 if col != "mach" else 4)
+    return data.dropna(subset=["cruise_alt", "speed"])
+
+
+def _spec(path: Path, title: str, x_title: str, y_title: str, width: int, traces: list[dict]) -> dict:
+    return {"path": str(path), "title": title, "xaxis_title": x_title, "yaxis_title": y_title,
+            "width": width, "height": 900, "traces": traces}
+
+
+def _speed_text(col: str, spd: float) -> str:
+    if col == "ktas":
+        return f"TAS {float(spd):.0f} kt"
+    if col == "kias":
+        return f"IAS {int(spd)} kt"
+    return f"M {float(spd):.2f}"
+
+
+def build_plot_specs(df: pd.DataFrame, aircraft_dirs: dict) -> list[dict]:
+    """
+    Specs (output path, titles, trace x/y arrays and styles) of every summary plot:
+    payload-range per (altitude, speed), combined over ISA and per ISA; range vs
+    speed per altitude and range vs altitude per speed at zero payload. The
+    series come from one groupby pass over the rows.
+
+    Returns:
+        list[dict]: Plain-data specs for render_spec.
+    """
+    data = _prepare(df)
+    speed_cols = data.groupby("aircraft")["speed_col"].first()
+    # Turboprop file names say IAS whenever IAS is recorded (even though the axis is TAS)
+    has_kias = {
+        aircraft: "kias" in df.columns and pd.to_numeric(df.loc[df["aircraft"] == aircraft, "kias"], errors="coerce").notna().any()
+        for aircraft in speed_cols.index
+    }
+    specs = []
+
+    # Payload-range: max range per payload of each (aircraft, alt, speed, mod, ISA) series
+    pr = data.groupby(["aircraft", "cruise_alt", "speed", "mod", "isa_dev", "payload"], sort=True)["range"].max()
+    slices = {}
+    for (aircraft, alt, spd, mod, isa), s in pr.groupby(level=[0, 1, 2, 3, 4], sort=True):
+        slices.setdefault((aircraft, alt, spd), {})[(mod, isa)] = s.droplevel([0, 1, 2, 3, 4])
+    for (aircraft, alt, spd) in sorted(slices, key=lambda k: (k[0], -k[1], -k[2])):
+        col, out_dir = speed_cols[aircraft], aircraft_dirs[aircraft]["summary_plots"]
+        isa_vals = sorted({float(isa) for _, isa in slices[(aircraft, alt, spd)]})
+        combined, per_isa = [], {isa: [] for isa in isa_vals}
+        for (mod, isa), s in sorted(slices[(aircraft, alt, spd)].items()):
+            color, long_name = _mod_style(mod, long_names=True)
+            if s.dropna().empty:
+                continue
+            x, y = _payload_range_xy(s)
+            combined.append({"x": x, "y": y, "name": f"{long_name} - {_isa_label(isa)}",
+                             "line": {"color": color, "dash": ISA_DASH.get(int(isa), "dashdot")}})
+            per_isa[float(isa)].append({"x": x, "y": y, "name": long_name, "line": {"color": color}})
+        title = f"Payload-Range | {aircraft} | FL{int(alt / 100)} | {_speed_text(col, spd)}"
+        speed_token = {"ktas": f"tas{int(spd)}", "kias": f"kias{int(spd)}"}.get(col, f"mach{float(spd):.2f}")
+        base_name = f"payload_range_{aircraft}_alt{int(alt)}_{speed_token}"
+        # Combined plot only when the slice has several ISA deviations; always one per ISA
+        if len(isa_vals) > 1:
+            specs.append(_spec(out_dir / f"{base_name}.png", title, "Range (NM)", "Payload (lb)", 1400, combined))
+        for isa in isa_vals:
+            file_name = f"{base_name}_ISA{isa:+.0f}C.png".replace("+", "p")
+            specs.append(_spec(out_dir / file_name, f"{title} — ISA {isa:+.0f}°C", "Range (NM)", "Payload (lb)",
+                               1400, per_isa[isa]))
+
+    # Zero-payload families: range vs speed per altitude and range vs altitude per speed
+    zero = data[data["payload"] == 0].sort_values(["aircraft", "mod", "isa_dev"])
+    for (aircraft, alt), rows in zero.groupby(["aircraft", "cruise_alt"], sort=True):
+        col, out_dir = speed_cols[aircraft], aircraft_dirs[aircraft]["summary_plots"]
+        traces = []
+        for (mod, isa), s in rows.groupby(["mod", "isa_dev"], sort=True):
+            s = s.sort_values("speed")
+            color, name = _mod_style(mod, long_names=False)
+            traces.append({"x": s["speed"].to_numpy(), "y": s["range"].to_numpy(),
+                           "name": f"{name} FL{int(alt / 100)} - {_isa_label(isa)}",
+                           "line": {"color": color, "dash": ISA_DASH.get(int(isa), "dashdot")}})
+        axis = {"ktas": "TAS", "kias": "IAS"}.get(col, "Mach")
+        out_name = f"range_vs_ias_{aircraft}_FL{int(alt / 100)}.png" if has_kias[aircraft] else f"range_vs_mach_{aircraft}_FL{int(alt / 100)}.png"
+        specs.append(_spec(out_dir / out_name, f"Range vs {axis} (Payload=0) | {aircraft} | FL{int(alt / 100)}",
+                           {"ktas": "TAS (kts)", "kias": "IAS (kts)"}.get(col, "Mach"), "Range (NM)", 1600, traces))
+    for (aircraft, spd), rows in zero.groupby(["aircraft", "speed"], sort=True):
+        col, out_dir = speed_cols[aircraft], aircraft_dirs[aircraft]["summary_plots"]
+        traces = []
+        for (mod, isa), s in rows.groupby(["mod", "isa_dev"], sort=True):
+            s = s.sort_values("cruise_alt")
+            color, name = _mod_style(mod, long_names=False)
+            traces.append({"x": s["cruise_alt"].to_numpy(), "y": s["range"].to_numpy(),
+                           "name": f"{name} {_speed_text(col, spd)} - {_isa_label(isa)}",
+                           "line": {"color": color, "dash": ISA_DASH.get(int(isa), "dashdot")}})
+        out_name = f"range_vs_altitude_{aircraft}_IAS{int(spd)}.png" if has_kias[aircraft] else f"range_vs_altitude_{aircraft}_M{float(spd):.2f}.png"
+        specs.append(_spec(out_dir / out_name, f"Range vs Altitude (Payload=0) | {aircraft} | {_speed_text(col, spd)}",
+                           "Altitude (ft)", "Range (NM)", 1600, traces))
+    return specs
+
+
+def render_spec(spec: dict) -> str:
+    """Build the figure of one spec and write it with kaleido. Returns the output path."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure([go.Scatter(x=t["x"], y=t["y"], mode="lines", name=t["name"], line=t["line"]) for t in spec["traces"]])
+    fig.update_layout(title=spec["title"], xaxis_title=spec["xaxis_title"], yaxis_title=spec["yaxis_title"],
+                      template="plotly_white")
+    Path(spec["path"]).parent.mkdir(parents=True, exist_ok=True)
+    fig.write_image(spec["path"], width=spec["width"], height=spec["height"], scale=2)
+    return spec["path"]
+
+
+def _render_batch(specs: list[dict]) -> list[str]:
+    """Render several specs in one worker; errors are reported per spec instead of aborting the batch."""
+    errors = []
+    for spec in specs:
+        try:
+            render_spec(spec)
+        except Exception as e:
+            errors.append(f"{spec['path']}: {e}")
+    return errors
+
+
+def render_specs(specs: list[dict], workers: int | None = None, use_threads: bool = False) -> list[str]:
+    """
+    Render specs on a pool whose processes each keep one kaleido renderer alive
+    for all the specs they are given (kaleido renders one image at a time per
+    process, so threads would serialize).
+
+    Returns:
+        list[str]: Error messages of specs that failed.
+    """
+    if not specs:
+        return []
+    workers = max(1, min(int(workers or os.cpu_count() or 1), (len(specs) + RENDER_CHUNK - 1) // RENDER_CHUNK))
+    batches = [specs[i:i + RENDER_CHUNK] for i in range(0, len(specs), RENDER_CHUNK)]
+    if workers == 1:
+        return [e for batch in batches for e in _render_batch(batch)]
+    Executor = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+    with Executor(max_workers=workers) as ex:
+        return [e for errors in ex.map(_render_batch, batches) for e in errors]
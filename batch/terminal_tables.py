@@ -0,0 +1,254 @@
+import argparse
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from aircraft_config import AIRCRAFT_CONFIG
+try:
+    from aircraft_config import TURBOPROP_PARAMS
+except ImportError:
+    TURBOPROP_PARAMS = {}
+from simulation import run_simulation
+from config_overrides import ensure_config
+from perf_tables import TerminalTable, config_fingerprint
+
+DEFAULT_TABLE_DIR = Path("performance_tables")
+
+
+def default_fuel_policy(aircraft: str, mod: str) -> tuple[int, int]:
+    """Taxi and reserve fuel (lb) used by the batch runner for this aircraft."""
+    ac = AIRCRAFT_CONFIG[(aircraft, mod)]
+    if aircraft in TURBOPROP_PARAMS:
+        return 15, 230
+    return 100, int(ac[24])
+
+
+def _run_terminal_case(case: dict) -> dict:
+    """Run one short range-mode mission and return its takeoff/landing increments."""
+    try:
+        ensure_config(case["aircraft"], case["mod"])
+        _, results, *_ = run_simulation(
+            "KSZT", "KSAN", case["aircraft"], case["mod"], case["flap"],
+            case["payload"], case["initial_fuel"], case["taxi_fuel"], case["reserve_fuel"],
+            case["cruise_alt"], "No Wind", False,
+            write_output_file=False,
+            cruise_mach=case["cruise_mach"],
+            cruise_kias=case["cruise_kias"],
+            isa_dev_c=case["isa_dev"],
+            range_mode=True,
+        )
+        inc = results.get("Terminal Increments") or {}
+        return {**case, "departure": inc.get("departure"), "arrival": inc.get("arrival")}
+    except Exception as e:
+        return {**case, "departure": None, "arrival": None, "error_message": str(e)}
+
+
+def build_terminal_table(
+    aircraft: str,
+    mod: str,
+    flap: int = 0,
+    isa_devs: list[int] = (-10, 0, 10, 20),
+    weight_steps: int = 6,
+    parallel_workers: int = 6,
+) -> TerminalTable:
+    """
+    Tabulate departure (segments 0-3) and arrival (segments 11-13) increments.
+
+    Each sample is a short range-mode mission at 5000 ft carrying a small mission
+    fuel load, so the full takeoff and landing physics run while cruise is brief.
+    Range mode pins both airports to sea level, so the table has no elevation axis.
+    """
+    ac = AIRCRAFT_CONFIG[(aircraft, mod)]
+    bow, mzfw, mrw, mtow, max_fuel = float(ac[18]), float(ac[19]), float(ac[20]), float(ac[21]), float(ac[22])
+    m_climb, v_climb = float(ac[30]), float(ac[31])
+    taxi_fuel, reserve_fuel = default_fuel_policy(aircraft, mod)
+    is_turboprop = aircraft in TURBOPROP_PARAMS
+    max_payload = max(0.0, mzfw - bow)
+    short_mission_fuel = 150.0 if is_turboprop else 300.0
+
+    min_fuel = reserve_fuel + taxi_fuel + short_mission_fuel
+    w_lo = bow + min_fuel - taxi_fuel
+    w_hi = min(mtow, mrw - taxi_fuel, mzfw + max_fuel - taxi_fuel)
+    weights = np.linspace(w_lo, w_hi, max(2, int(weight_steps)))
+    isa_axis = sorted({int(x) for x in isa_devs})
+
+    cases = []
+    for tow, isa_dev in product(weights, isa_axis):
+        fuel = min(max_fuel, max(min_fuel, tow + taxi_fuel - bow - max_payload))
+        payload = max(0.0, tow + taxi_fuel - bow - fuel)
+        cases.append({
+            "aircraft": aircraft,
+            "mod": mod,
+            "flap": int(flap),
+            "isa_dev": float(isa_dev),
+            "payload": float(payload),
+            "initial_fuel": float(fuel),
+            "taxi_fuel": float(taxi_fuel),
+            "reserve_fuel": float(reserve_fuel),
+            "cruise_alt": 5000,
+            "cruise_mach": (0.0 if is_turboprop else m_climb),
+            "cruise_kias": (v_climb if is_turboprop else None),
+        })
+
+    with ProcessPoolExecutor(max_workers=parallel_workers) as ex:
+        runs = list(ex.map(_run_terminal_case, cases))
+
+    n_w, n_isa = len(weights), len(isa_axis)
+    departure = np.full((n_w, n_isa, len(TerminalTable.FIELDS)), np.nan)
+    departure_vktas = np.full((n_w, n_isa), np.nan)
+    arrival_samples = {j: [] for j in range(n_isa)}
+    for k, run in enumerate(runs):
+        i, j = divmod(k, n_isa)
+        dep = run.get("departure")
+        if dep:
+            departure[i, j] = [dep[f] for f in TerminalTable.FIELDS]
+            departure_vktas[i, j] = dep["vktas"]
+        arr = run.get("arrival")
+        if arr:
+            arrival_samples[j].append([arr["weight_lb"]] + [arr[f] for f in TerminalTable.FIELDS])
+
+    if np.isnan(departure).any() or any(len(v) < 2 for v in arrival_samples.values()):
+        failed = [r.get("error_message") for r in runs if r.get("departure") is None or r.get("arrival") is None]
+        raise RuntimeError(f"Terminal table sweep failed for {aircraft} {mod}: {failed[:3]}")
+
+    all_arr_w = np.concatenate([np.asarray(v)[:, 0] for v in arrival_samples.values()])
+    arrival_weights = np.linspace(all_arr_w.min(), all_arr_w.max(), n_w)
+    arrival = np.zeros((n_w, n_isa, len(TerminalTable.FIELDS)))
+    for j, samples in arrival_samples.items():
+        samples = np.asarray(sorted(samples))
+        for f in range(len(TerminalTable.FIELDS)):
+            arrival[:, j, f] = np.interp(arrival_weights, samples[:, 0], samples[:, f + 1])
+
+    meta = {
+        "elevation_ft": 0.0,
+        "taxi_fuel_lb": taxi_fuel,
+        "reserve_fuel_lb": reserve_fuel,
+        "config_hash": config_fingerprint(aircraft, mod),
+    }
+    return TerminalTable(aircraft, mod, flap, isa_axis, weights, departure, departure_vktas,
+                         arrival_weights, arrival, meta=meta)
+
+
+def terminal_table_path(aircraft: str, mod: str, flap: int, table_dir: str | Path | None = None) -> Path:
+    table_dir = Path(table_dir) if table_dir else DEFAULT_TABLE_DIR
+    return table_dir / f"terminal_{aircraft}_{mod}_flap{int(flap)}_{config_fingerprint(aircraft, mod)}.npz"
+
+
+def load_or_build_terminal_table(
+    aircraft: str,
+    mod: str,
+    flap: int = 0,
+    isa_devs: list[int] = (-10, 0, 10, 20),
+    table_dir: str | Path | None = None,
+    parallel_workers: int = 6,
+) -> TerminalTable:
+    """Load a cached terminal table, rebuilding it if missing or if it does not span isa_devs."""
+    path = terminal_table_path(aircraft, mod, flap, table_dir)
+    if path.exists():
+        table = TerminalTable.load(path)
+        if table.covers_isa(isa_devs):
+            return table
+        isa_devs = sorted({*isa_devs, *table.isa_devs.astype(int).tolist()})
+    table = build_terminal_table(aircraft, mod, flap, isa_devs=isa_devs, parallel_workers=parallel_workers)
+    table.save(path)
+    return table
+
+
+def validate_terminal_table(
+    table: TerminalTable,
+    cruise_alts: list[int],
+    speeds: list[float],
+    payloads: list[int],
+    isa_devs: list[int] = (0,),
+) -> pd.DataFrame:
+    """Run matching full-physics and fast-path batch cases and report the differences."""
+    from batch.payload_range import run_single_case
+
+    aircraft, mod, flap = table.aircraft, table.mod, table.flap
+    is_turboprop = aircraft in TURBOPROP_PARAMS
+    taxi_fuel, reserve_fuel = default_fuel_policy(aircraft, mod)
+    tables = {(aircraft, mod, flap): table}
+    rows = []
+    for cruise_alt, spd, payload, isa_dev in product(cruise_alts, speeds, payloads, isa_devs):
+        case = {
+            "aircraft": aircraft,
+            "mod": mod,
+            "flap": flap,
+            "isa_dev": int(isa_dev),
+            "cruise_alt": int(cruise_alt),
+            "mach": (0.0 if is_turboprop else float(spd)),
+            "kias": (float(spd) if is_turboprop else None),
+            "payload": int(payload),
+            "taxi_fuel": taxi_fuel,
+            "reserve_fuel": reserve_fuel,
+        }
+        t0 = time.perf_counter()
+        full = run_single_case(case)
+        t_full = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        fast = run_single_case(case, terminal_tables=tables)
+        t_fast = time.perf_counter() - t0
+        row = {k: case[k] for k in ("aircraft", "mod", "flap", "isa_dev", "cruise_alt", "mach", "kias", "payload")}
+        for key in ("total_dist_nm", "total_time_min", "fuel_burned_lb", "first_level_off_ft"):
+            a = pd.to_numeric(pd.Series([full.get(key)]), errors="coerce").iloc[0]
+            b = pd.to_numeric(pd.Series([fast.get(key)]), errors="coerce").iloc[0]
+            row[f"{key}_full"] = a
+            row[f"{key}_fast"] = b
+            row[f"{key}_delta"] = b - a
+        row["wall_s_full"] = round(t_full, 3)
+        row["wall_s_fast"] = round(t_fast, 3)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Build takeoff/landing increment tables for the range-mode fast path")
+    p.add_argument("--aircraft", nargs="+", required=True, help="Aircraft models, e.g., CJ1 M2 C208B")
+    p.add_argument("--mods", nargs="+", default=["Flatwing", "Tamarack"], help="Mods to include")
+    p.add_argument("--flaps", nargs="+", type=int, default=[0])
+    p.add_argument("--isa", nargs="+", type=int, default=[-10, 0, 10, 20])
+    p.add_argument("--weight-steps", type=int, default=6)
+    p.add_argument("--parallel", type=int, default=6)
+    p.add_argument("--out", type=str, default=None, help="Table directory (default performance_tables)")
+    p.add_argument("--validate", action="store_true", help="Compare fast-path and full-physics batch results")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    table_dir = Path(args.out) if args.out else DEFAULT_TABLE_DIR
+    reports = []
+    for aircraft, mod, flap in product(args.aircraft, args.mods, args.flaps):
+        if (aircraft, mod) not in AIRCRAFT_CONFIG:
+            continue
+        table = build_terminal_table(aircraft, mod, flap, isa_devs=args.isa,
+                                     weight_steps=args.weight_steps, parallel_workers=args.parallel)
+        path = table.save(terminal_table_path(aircraft, mod, flap, table_dir))
+        print(f"Saved {path}")
+        if args.validate:
+            ac = AIRCRAFT_CONFIG[(aircraft, mod)]
+            is_turboprop = aircraft in TURBOPROP_PARAMS
+            speeds = [float(ac[31])] if is_turboprop else [round(float(ac[25]), 2)]
+            max_payload = max(0, int(ac[19] - ac[18]))
+            reports.append(validate_terminal_table(
+                table,
+                cruise_alts=[int(ac[8]) - 4000],
+                speeds=speeds,
+                payloads=[max_payload, max_payload // 2, 0],
+                isa_devs=args.isa,
+            ))
+    if reports:
+        report = pd.concat(reports, ignore_index=True)
+        report_path = table_dir / "terminal_validation.csv"
+        report.to_csv(report_path, index=False)
+        print(report[["aircraft", "mod", "isa_dev", "payload", "total_dist_nm_delta", "total_time_min_delta",
+                      "fuel_burned_lb_delta", "wall_s_full", "wall_s_fast"]].to_string(index=False))
+        print(f"Saved {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import argparse
+import hashlib
+import threading
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = ds = pq = None
+
+# Dataset directory under a batch output directory, and its case_id -> row-group index
+DATASET_DIR = "timeseries"
+INDEX_FILE = "_case_index.parquet"
+# Cases are buffered per partition and written together once a row group holds this many rows
+ROW_GROUP_ROWS = 16384
+COMPRESSION = "zstd"
+# Integration axes kept in float64 (differenced and summed downstream); other floats fit float32
+FLOAT64_COLUMNS = ("Time (s)", "Distance (NM)")
+CATEGORY_COLUMNS = ("Segment Name", "Flight Phase")
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("The time-series dataset needs pyarrow (use timeseries_format='files' without it)")
+
+
+def timeseries_case_id(effective_key: tuple) -> str:
+    """
+    Dataset id of a case's time series: a hash of its effective simulation inputs
+    (payload_range.effective_case_key), so deduplicated cases, shards and reruns
+    agree on it.
+    """
+    return hashlib.sha1(repr(effective_key).encode("utf-8")).hexdigest()[:16]
+
+
+def compact_table(case_id: str, df: pd.DataFrame):
+    """
+    Arrow table of one run's time history: a leading dictionary-encoded case_id,
+    float32 for every float column except FLOAT64_COLUMNS, small ints for the
+    segment number and dictionary-encoded text columns.
+    """
+    _require_pyarrow()
+    columns = {"case_id": pa.DictionaryArray.from_arrays(np.zeros(len(df), dtype=np.int32), [case_id])}
+    for col in df.columns:
+        values = df[col]
+        if col in CATEGORY_COLUMNS or values.dtype == object:
+            columns[col] = pa.array(values.astype("string"), type=pa.string()).dictionary_encode()
+        elif pd.api.types.is_float_dtype(values) and col not in FLOAT64_COLUMNS:
+            columns[col] = pa.array(values.to_numpy(dtype=np.float32))
+        elif pd.api.types.is_integer_dtype(values) and values.abs().max() < 2 ** 15:
+            columns[col] = pa.array(values.to_numpy(dtype=np.int16))
+        else:
+            columns[col] = pa.array(values.to_numpy())
+    return pa.table(columns)
+
+
+def _partition_dir(aircraft: str, mod: str) -> str:
+    """Hive-style partition path (values URI-encoded, as pyarrow decodes them)."""
+    return f"aircraft={quote(str(aircraft), safe='')}/mod={quote(str(mod), safe='')}"
+
+
+class _PartitionFile:
+    """One open Parquet file of a partition, with the cases buffered for its next row group."""
+
+    def __init__(self, path: Path, schema):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path, self.schema = path, schema
+        self.writer = pq.ParquetWriter(path, schema, compression=COMPRESSION)
+        self.buffer, self.buffered_rows, self.row_groups = [], 0, 0
+
+    def flush(self, index: list[dict], root: Path) -> None:
+        if not self.buffer:
+            return
+        self.writer.write_table(pa.concat_tables([t for _, t in self.buffer]), row_group_size=self.buffered_rows)
+        offset = 0
+        for case_id, table in self.buffer:
+            index.append({"case_id": case_id, "file": self.path.relative_to(root).as_posix(),
+                          "row_group": self.row_groups, "row_offset": offset, "num_rows": table.num_rows})
+            offset += table.num_rows
+        self.row_groups += 1
+        self.buffer, self.buffered_rows = [], 0
+
+
+class TimeseriesDatasetWriter:
+    """
+    Appends per-case time histories to one Parquet dataset partitioned by
+    aircraft/mod (zstd, one file per partition, several cases per row group) and
+    writes the case_id -> (file, row group, row offset, rows) index on close.
+    Thread-safe; cases already written (deduplicated or refined twice) are skipped.
+    """
+
+    def __init__(self, root: str | Path, row_group_rows: int = ROW_GROUP_ROWS):
+        _require_pyarrow()
+        self.root = Path(root)
+        self.row_group_rows = row_group_rows
+        self._files: dict[tuple, list[_PartitionFile]] = {}
+        self._index: list[dict] = []
+        self._case_ids: set[str] = set()
+        self._lock = threading.Lock()
+
+    def append(self, case_id: str, aircraft: str, mod: str, df: pd.DataFrame) -> None:
+        table = compact_table(case_id, df)
+        with self._lock:
+            if case_id in self._case_ids:
+                return
+            self._case_ids.add(case_id)
+            files = self._files.setdefault((aircraft, mod), [])
+            # A run whose columns differ from the partition's file starts another part file
+            part = next((f for f in files if f.schema.equals(table.schema)), None)
+            if part is None:
+                part = _PartitionFile(self.root / _partition_dir(aircraft, mod) / f"part-{len(files)}.parquet",
+                                      table.schema)
+                files.append(part)
+            part.buffer.append((case_id, table))
+            part.buffered_rows += table.num_rows
+            if part.buffered_rows >= self.row_group_rows:
+                part.flush(self._index, self.root)
+
+    def write_row(self, row: dict, case_id: str) -> dict:
+        """
+        Append the time history carried in row["_outputs"] and return the row
+        without it, with its case_id set (or a ts_error status if the write failed).
+        """
+        outputs = dict(row["_outputs"])
+        out = {**row, "_outputs": outputs}
+        try:
+            self.append(case_id, row["aircraft"], row["mod"], outputs.pop("timeseries"))
+            out["case_id"] = case_id
+        except Exception as e:
+            out["status"] = "ts_error" if out["status"] == "ok" else out["status"]
+            out["timeseries_error_message"] = str(e)
+        if not outputs:
+            del out["_outputs"]
+        return out
+
+    def close(self) -> Path | None:
+        """Flush every partition, close the files and write the index. Returns the index path."""
+        with self._lock:
+            for files in self._files.values():
+                for part in files:
+                    part.flush(self._index, self.root)
+                    part.writer.close()
+            self._files = {}
+            if not self._index:
+                return None
+            index_path = self.root / INDEX_FILE
+            pq.write_table(pa.Table.from_pylist(self._index), index_path, compression=COMPRESSION)
+            return index_path
+
+
+def load_index(root: str | Path) -> pd.DataFrame:
+    _require_pyarrow()
+    return pq.read_table(Path(root) / INDEX_FILE).to_pandas()
+
+
+def read_case(root: str | Path, case_id: str, index: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Time history of one case, read from its row group only (via the index).
+
+    Args:
+        index: load_index(root), when reading many cases.
+    """
+    _require_pyarrow()
+    index = load_index(root) if index is None else index
+    hit = index[index["case_id"] == case_id]
+    if hit.empty:
+        raise KeyError(f"No time series for case_id {case_id} in {root}")
+    entry = hit.iloc[0]
+    group = pq.ParquetFile(Path(root) / entry["file"]).read_row_group(int(entry["row_group"]))
+    df = group.slice(int(entry["row_offset"]), int(entry["num_rows"])).to_pandas()
+    return df.drop(columns="case_id")
+
+
+def open_dataset(root: str | Path):
+    """The whole dataset as a pyarrow Dataset (aircraft/mod restored from the partition paths)."""
+    _require_pyarrow()
+    return ds.dataset(root, format="parquet", partitioning="hive")
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Read time series from a batch run's time-series dataset")
+    p.add_argument("batch_dir", help="Batch output directory (holds timeseries/ and combined_summary.csv)")
+    p.add_argument("--case-id", type=str, default=None, help="case_id from combined_summary.csv (omit to list cases)")
+    p.add_argument("--out", type=str, default=None, help="Write the case's time series to this CSV instead of printing")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    root = Path(args.batch_dir) / DATASET_DIR
+    index = load_index(root)
+    if args.case_id is None:
+        print(index.to_string(index=False))
+        return
+    df = read_case(root, args.case_id, index)
+    if args.out:
+        df.to_csv(args.out, index=False)
+        print(f"Saved {len(df)} rows to {args.out}")
+    else:
+        print(df.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
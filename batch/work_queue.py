@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# Seconds without a heartbeat after which a claimed task is handed back to the queue
+LEASE_TIMEOUT_S = 600.0
+POLL_INTERVAL_S = 1.0
+# Claims of one task that may expire before it is recorded as an error
+MAX_ATTEMPTS = 3
+_STATES = ("pending", "claimed", "done")
+
+
+def _json_default(obj):
+    """numpy scalars as Python numbers, anything else (paths) as text."""
+    return obj.item() if hasattr(obj, "item") else str(obj)
+
+
+def _write_json(path: Path, obj) -> None:
+    """Write JSON next to path and rename it into place, so readers never see a partial file."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(obj, default=_json_default))
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path):
+    return json.loads(Path(path).read_text())
+
+
+def init_queue(queue_dir: str | Path, settings: dict) -> Path:
+    """
+    Create (or reset) a queue directory for a new sweep.
+
+    Layout: queue.json (settings shared by every task, plus a closed flag) and one
+    JSON file per task in pending/, claimed/ or done/. Task files left over from
+    an earlier sweep are removed.
+    """
+    queue_dir = Path(queue_dir)
+    for state in _STATES:
+        (queue_dir / state).mkdir(parents=True, exist_ok=True)
+        for path in (queue_dir / state).glob("*.json"):
+            path.unlink(missing_ok=True)
+    _write_json(queue_dir / "queue.json", {**settings, "closed": False})
+    return queue_dir
+
+
+def read_settings(queue_dir: str | Path) -> dict:
+    return _read_json(Path(queue_dir) / "queue.json")
+
+
+def close_queue(queue_dir: str | Path) -> None:
+    """Mark the sweep finished; idle workers exit when they see it."""
+    _write_json(Path(queue_dir) / "queue.json", {**read_settings(queue_dir), "closed": True})
+
+
+def cancel_queue(queue_dir: str | Path) -> int:
+    """
+    Close the sweep and drop its pending tasks, so workers exit after the case
+    they are running. Works before init_queue too (workers waiting for the queue
+    see it closed). Returns the number of tasks dropped.
+    """
+    queue_dir = Path(queue_dir)
+    queue_dir.mkdir(parents=True, exist_ok=True)
+    settings = read_settings(queue_dir) if (queue_dir / "queue.json").exists() else {}
+    _write_json(queue_dir / "queue.json", {**settings, "closed": True})
+    dropped = 0
+    for path in (queue_dir / "pending").glob("*.json"):
+        path.unlink(missing_ok=True)
+        dropped += 1
+    return dropped
+
+
+def enqueue(queue_dir: str | Path, tasks: dict[str, dict]) -> None:
+    """Write one pending task file per (task id, case)."""
+    pending = Path(queue_dir) / "pending"
+    for task_id, case in tasks.items():
+        _write_json(pending / f"{task_id}.json", {"id": task_id, "attempts": 0, "case": case})
+
+
+def claim_next(queue_dir: str | Path) -> dict | None:
+    """
+    Claim the first pending task by renaming its file into claimed/. The rename
+    is atomic, so when several workers race for a task exactly one gets it.
+    The claimed file's mtime is the lease (see renew_lease).
+    """
+    queue_dir = Path(queue_dir)
+    for path in sorted((queue_dir / "pending").glob("*.json")):
+        target = queue_dir / "claimed" / path.name
+        try:
+            os.rename(path, target)
+        except OSError:
+            continue
+        os.utime(target)
+        return _read_json(target)
+    return None
+
+
+def renew_lease(queue_dir: str | Path, task_id: str) -> None:
+    try:
+        os.utime(Path(queue_dir) / "claimed" / f"{task_id}.json")
+    except FileNotFoundError:
+        pass
+
+
+def complete(queue_dir: str | Path, task_id: str, result: dict) -> None:
+    """Record a task's result row and release its claim."""
+    queue_dir = Path(queue_dir)
+    _write_json(queue_dir / "done" / f"{task_id}.json", result)
+    (queue_dir / "claimed" / f"{task_id}.json").unlink(missing_ok=True)
+
+
+def requeue_stale(queue_dir: str | Path, lease_timeout: float = LEASE_TIMEOUT_S,
+                  max_attempts: int = MAX_ATTEMPTS) -> int:
+    """
+    Hand claims whose lease has expired (worker killed or host gone) back to
+    pending/. A task whose lease has expired max_attempts times is completed
+    with an error row instead. Returns the number of claims released.
+
+    Safe to call from several processes: a stale claim is first renamed to a
+    name unique to this caller, so exactly one caller takes it over, and a claim
+    found renewed after the rename (re-claimed in between) is put back.
+    """
+    queue_dir = Path(queue_dir)
+    released = 0
+    for path in (queue_dir / "claimed").glob("*.json"):
+        try:
+            if time.time() - path.stat().st_mtime < lease_timeout:
+                continue
+        except FileNotFoundError:
+            continue
+        taken = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.stale")
+        try:
+            os.rename(path, taken)
+        except OSError:
+            continue
+        try:
+            if time.time() - taken.stat().st_mtime < lease_timeout:
+                os.rename(taken, path)
+                continue
+            task = _read_json(taken)
+        except json.JSONDecodeError:
+            os.rename(taken, path)
+            continue
+        task["attempts"] = int(task.get("attempts", 0)) + 1
+        if task["attempts"] >= max_attempts:
+            _write_json(queue_dir / "done" / path.name, {**task["case"], "status": "error",
+                                                         "error_message": f"Lease expired {task['attempts']} times"})
+        else:
+            _write_json(queue_dir / "pending" / path.name, task)
+        taken.unlink(missing_ok=True)
+        released += 1
+    return released
+
+
+def queue_counts(queue_dir: str | Path) -> dict:
+    """Number of task files in each state."""
+    return {state: sum(1 for _ in (Path(queue_dir) / state).glob("*.json")) for state in _STATES}
+
+
+def collect(queue_dir: str | Path, task_ids) -> dict:
+    """Result rows of the given tasks that are done so far."""
+    done = Path(queue_dir) / "done"
+    finished = {path.stem for path in done.glob("*.json")}
+    return {task_id: _read_json(done / f"{task_id}.json") for task_id in task_ids if task_id in finished}
+
+
+class LeaseHeartbeat:
+    """Context manager renewing a task's lease from a background thread while it runs."""
+
+    def __init__(self, queue_dir: str | Path, task_id: str, interval: float):
+        self.queue_dir, self.task_id, self.interval = queue_dir, task_id, interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            renew_lease(self.queue_dir, self.task_id)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+def run_queued(queue_dir: str | Path, cases: list[dict], batch_id: int, lease_timeout: float = LEASE_TIMEOUT_S,
+               poll_interval: float = POLL_INTERVAL_S) -> list[dict]:
+    """
+    Enqueue cases and wait until workers have completed all of them, releasing
+    expired claims while waiting.
+
+    Returns:
+        list[dict]: Result rows in the order of cases.
+    """
+    ids = [f"{batch_id:03d}_{i:06d}" for i in range(len(cases))]
+    enqueue(queue_dir, dict(zip(ids, cases)))
+    print(f"[queue] {len(ids)} cases queued in {queue_dir}; start workers with: python -m batch.worker {queue_dir}")
+    results = {}
+    while len(results) < len(ids):
+        results.update(collect(queue_dir, [i for i in ids if i not in results]))
+        if len(results) < len(ids):
+            requeue_stale(queue_dir, lease_timeout)
+            time.sleep(poll_interval)
+    return [results[i] for i in ids]
@@ -0,0 +1,112 @@
+import argparse
+import os
+import socket
+import time
+from multiprocessing import Process
+from pathlib import Path
+
+from batch.payload_range import run_single_case
+from batch.terminal_tables import load_or_build_terminal_table
+from batch.climb_tables import load_or_build_climb_table
+from batch.work_queue import (
+    LEASE_TIMEOUT_S,
+    POLL_INTERVAL_S,
+    LeaseHeartbeat,
+    claim_next,
+    complete,
+    queue_counts,
+    read_settings,
+    requeue_stale,
+)
+from utils import load_airports
+
+
+def _table_key(case: dict) -> tuple:
+    return case["aircraft"], case["mod"], int(case["flap"])
+
+
+def _tables_for(case: dict, settings: dict, terminal_tables: dict, climb_tables: dict) -> None:
+    """Load the cached terminal/climb tables a case needs (built by the coordinator before queueing)."""
+    key = _table_key(case)
+    if settings.get("fast_terminal") and key not in terminal_tables:
+        terminal_tables[key] = load_or_build_terminal_table(*key, isa_devs=settings["isa_devs"], parallel_workers=1)
+    if settings.get("fast_climb") and key not in climb_tables:
+        alts = settings.get("climb_alts", {}).get("|".join(map(str, key)))
+        climb_tables[key] = load_or_build_climb_table(*key, isa_devs=settings["isa_devs"], target_alts=alts,
+                                                      parallel_workers=1)
+
+
+def run_worker(queue_dir: str | Path, lease_timeout: float = LEASE_TIMEOUT_S, poll_interval: float = POLL_INTERVAL_S,
+               exit_when_idle: bool = False, max_tasks: int | None = None) -> int:
+    """
+    Claim and run queued payload-range cases until the sweep is closed (or the
+    queue is idle with exit_when_idle, or after max_tasks). A worker started
+    before the queue is opened waits for it. While a case runs its lease is
+    renewed, so only killed workers have their claims re-queued.
+
+    Returns:
+        int: Number of tasks completed by this worker.
+    """
+    load_airports()
+    terminal_tables, climb_tables = {}, {}
+    completed = 0
+    while max_tasks is None or completed < max_tasks:
+        try:
+            settings = read_settings(queue_dir)
+        except FileNotFoundError:
+            # Queue not open yet: the worker was started before the coordinator's init_queue
+            time.sleep(poll_interval)
+            continue
+        task = claim_next(queue_dir)
+        if task is None:
+            requeue_stale(queue_dir, lease_timeout)
+            counts = queue_counts(queue_dir)
+            if settings.get("closed") or (exit_when_idle and counts["pending"] == 0 and counts["claimed"] == 0):
+                break
+            time.sleep(poll_interval)
+            continue
+        case = task["case"]
+        with LeaseHeartbeat(queue_dir, task["id"], interval=lease_timeout / 4):
+            try:
+                _tables_for(case, settings, terminal_tables, climb_tables)
+                row = run_single_case(
+                    case,
+                    hide_mach_limited=settings.get("hide_mach_limited", False),
+                    hide_altitude_limited=settings.get("hide_altitude_limited", False),
+                    terminal_tables=terminal_tables,
+                    climb_tables=climb_tables,
+                )
+            except Exception as e:
+                row = {**case, "status": "error", "error_message": str(e)}
+        complete(queue_dir, task["id"], {**row, "worker": f"{socket.gethostname()}:{os.getpid()}"})
+        completed += 1
+    return completed
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Worker for a queued payload-range sweep (payload_range --queue DIR)")
+    p.add_argument("queue", help="Queue directory (shared filesystem path)")
+    p.add_argument("--procs", type=int, default=1, help="Worker processes to start on this host")
+    p.add_argument("--lease-timeout", type=float, default=LEASE_TIMEOUT_S, help="Seconds before a silent claim is re-queued")
+    p.add_argument("--poll", type=float, default=POLL_INTERVAL_S, help="Seconds between polls of an empty queue")
+    p.add_argument("--exit-when-idle", action="store_true", help="Exit when nothing is pending or claimed instead of waiting for more")
+    p.add_argument("--max-tasks", type=int, default=None, help="Exit after this many tasks (per process)")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    kwargs = dict(lease_timeout=args.lease_timeout, poll_interval=args.poll,
+                  exit_when_idle=args.exit_when_idle, max_tasks=args.max_tasks)
+    if args.procs <= 1:
+        print(f"Completed {run_worker(args.queue, **kwargs)} tasks")
+        return
+    procs = [Process(target=run_worker, args=(args.queue,), kwargs=kwargs) for _ in range(args.procs)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import os
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -11,6 +12,8 @@ try:
 except ImportError:
     TURBOPROP_PARAMS = {}
 from batch.payload_range import run_payload_range_batch
+from batch.case_plots import render_case_plot, select_rows
+from job_client import JobClient, JobServerError, format_progress
 
 st.set_page_config(page_title="Payload–Range Sweeps", layout="wide")
 st.title("Batch Payload–Range Sweeps")
@@ -46,6 +49,11 @@ with st.sidebar:
         "Assumed throughput (runs/min)", min_value=1, max_value=2000, step=1,
         value=int(st.session_state.get("assumed_rpm", 30))
     )
+    job_server_url = st.text_input(
+        "Job server URL (optional)", value=st.query_params.get("server", os.environ.get("JOB_SERVER_URL", "")),
+        help="Run sweeps on a shared job server (python job_server.py) instead of in this session; "
+             "they keep running if the page is closed or refreshed"
+    ).strip()
 
     # Output options
     output_mode = st.radio(
@@ -110,6 +118,10 @@ with st.sidebar:
         "Save summary plots (PNG)", value=True,
         help="Writes static images to each aircraft's summary_plots folder"
     )
+    case_plots_ui = st.checkbox(
+        "Keep per-case fuel vs distance plots", value=False,
+        help="Stores each case's fuel/distance arrays; plots are rendered (and cached) only when opened below"
+    )
 
     # Rough ETA estimate based on current inputs (ignores per-aircraft ceiling/MMO filtering)
     def _count_range_float(start: float, end: float, step: float) -> int:
@@ -209,8 +221,7 @@ if run_clicked:
             tas_values = build_int_range(int(tas_start), int(tas_end), int(tas_step))
         alt_values = build_int_range(int(alt_start), int(alt_end), int(alt_step))
 
-        t0 = time.perf_counter()
-        df = run_payload_range_batch(
+        sweep_kwargs = dict(
             aircraft_models=selected_aircraft,
             mods=selected_mods,
             payload_steps=int(payload_steps),
@@ -218,7 +229,8 @@ if run_clicked:
             isa_devs=[int(x) for x in selected_isa],
             flap_settings=[0],
             parallel_workers=int(parallel),
-            save_plots=False,
+            save_plots=case_plots_ui,
+            plot_mode="deferred",
             save_summary_plots=save_summary_plots_ui,
             mach_values=mach_values,
             kias_values=None,
@@ -226,13 +238,53 @@ if run_clicked:
             alt_values=alt_values,
             hide_mach_limited=(output_mode == "Hide Mach-Limited Cases"),
             hide_altitude_limited=(altitude_mode == "Hide Altitude-Limited Cases"),
-            use_threads=True,
         )
-        elapsed_sec = time.perf_counter() - t0
-    st.session_state.batch_summary = df
-    st.session_state.batch_elapsed_sec = elapsed_sec
-    if len(df) > 0 and elapsed_sec > 0:
-        st.session_state.assumed_rpm = max(1, int(len(df) / (elapsed_sec / 60.0)))
+        if job_server_url:
+            # Followed below via the URL, so a refreshed page reattaches to the running job
+            try:
+                st.query_params["job"] = JobClient(job_server_url).submit_sweep(**sweep_kwargs)
+                st.query_params["server"] = job_server_url
+            except JobServerError as e:
+                st.error(str(e))
+                st.stop()
+        else:
+            t0 = time.perf_counter()
+            df = run_payload_range_batch(**sweep_kwargs, use_threads=True)
+            elapsed_sec = time.perf_counter() - t0
+    if not job_server_url:
+        st.session_state.batch_summary = df
+        st.session_state.batch_elapsed_sec = elapsed_sec
+        if len(df) > 0 and elapsed_sec > 0:
+            st.session_state.assumed_rpm = max(1, int(len(df) / (elapsed_sec / 60.0)))
+
+# Sweep running on the job server: wait for it (cancellable) and load its rows once
+job_id = st.query_params.get("job")
+if job_server_url and job_id and st.session_state.get("batch_job_id") != job_id:
+    client = JobClient(job_server_url)
+    try:
+        if st.button("Cancel sweep"):
+            client.cancel(job_id)
+        progress_bar = st.progress(0.0, text=f"Sweep job {job_id}: submitted")
+
+        def show_progress(status: dict) -> None:
+            progress = status["progress"]
+            frac = progress["done"] / progress["total"] if progress.get("total") else 0.0
+            progress_bar.progress(min(frac, 1.0), text=f"Sweep job {job_id}: {format_progress(status)}")
+
+        status = client.wait(job_id, on_progress=show_progress)
+        progress_bar.empty()
+        st.session_state.batch_job_id = job_id
+        if status["state"] == "done":
+            df = client.sweep_result(job_id)
+            elapsed_sec = status["finished"] - status["started"]
+            st.session_state.batch_summary = df
+            st.session_state.batch_elapsed_sec = elapsed_sec
+            if len(df) > 0 and elapsed_sec > 0:
+                st.session_state.assumed_rpm = max(1, int(len(df) / (elapsed_sec / 60.0)))
+        else:
+            st.error(f"Sweep job {job_id} {status['state']}" + (f": {status['error']}" if status["error"] else ""))
+    except JobServerError as e:
+        st.error(str(e))
 
 # Results area
 summary_df: pd.DataFrame | None = st.session_state.get("batch_summary")
@@ -500,6 +552,23 @@ if summary_df is not None and len(summary_df) > 0:
             else:
                 st.info("No payload=0 data at selected Mach.")
 
+    # Per-case fuel vs distance plots (deferred: rendered on request, cached by case hash)
+    case_rows = select_rows(filtered)
+    if len(case_rows) > 0:
+        st.subheader("Case Fuel vs Distance")
+        case_labels = {
+            i: (f"{r['aircraft']} {r['mod']} | {int(r['cruise_alt'])} ft | "
+                + (f"TAS {int(r['ktas'])} kt" if speed_col_global == "ktas" else f"M {float(r['mach']):.2f}")
+                + f" | ISA {int(r['isa_dev']):+d} | payload {int(r['payload'])} lb")
+            for i, r in case_rows.iterrows()
+        }
+        sel_case = st.selectbox("Case", options=list(case_labels), format_func=case_labels.get, key="case_plot")
+        if st.button("Render case plot"):
+            try:
+                st.image(str(render_case_plot(case_rows.loc[sel_case].to_dict())), use_column_width=True)
+            except Exception as e:
+                st.error(f"Could not render plot: {e}")
+
 else:
     st.info("Configure parameters in the sidebar and click 'Run Sweep.'")
    
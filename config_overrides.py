@@ -0,0 +1,120 @@
+"""
+Config Overrides Module
+
+Named parameter overrides of AIRCRAFT_CONFIG tuples for design sweeps. An
+overridden configuration is registered in AIRCRAFT_CONFIG under a derived mod
+name such as "Tamarack@cdo=0.028,h*1.2", so run_simulation, the performance
+models and the cached tables (keyed by perf_tables.config_fingerprint) use it
+without further changes.
+
+Each override is a (field, op, value) triple: op "=" sets the field, "*"
+multiplies it and "+" adds to it. Field names are aircraft_config.CONFIG_FIELDS.
+"""
+
+from itertools import product
+
+import numpy as np
+
+from aircraft_config import AIRCRAFT_CONFIG, CONFIG_FIELDS
+
+VARIANT_SEP = "@"
+OPS = {
+    "=": lambda base, value: value,
+    "*": lambda base, value: base * value,
+    "+": lambda base, value: base + value,
+}
+
+
+def apply_overrides(ac: tuple, overrides) -> tuple:
+    """A copy of the config tuple with each (field, op, value) override applied in order."""
+    values = list(ac)
+    for field, op, value in overrides:
+        if field not in CONFIG_FIELDS:
+            raise ValueError(f"Unknown config field '{field}' (expected one of {', '.join(CONFIG_FIELDS)})")
+        if op not in OPS:
+            raise ValueError(f"Unknown override op '{op}' (expected '=', '*' or '+')")
+        i = CONFIG_FIELDS.index(field)
+        if values[i] is None:
+            raise ValueError(f"Config field '{field}' is not set for this aircraft")
+        new = OPS[op](float(values[i]), float(value))
+        values[i] = int(round(new)) if isinstance(ac[i], int) else new
+    return tuple(values)
+
+
+def variant_name(mod: str, overrides) -> str:
+    """Derived mod name encoding the overrides, e.g. "Tamarack@cdo=0.028,h*1.2"."""
+    if not overrides:
+        return mod
+    return mod + VARIANT_SEP + ",".join(f"{field}{op}{float(value):g}" for field, op, value in overrides)
+
+
+def parse_variant(mod: str) -> tuple[str, list[tuple[str, str, float]]]:
+    """Inverse of variant_name: (base mod, overrides)."""
+    base, _, spec = mod.partition(VARIANT_SEP)
+    overrides = []
+    for item in filter(None, spec.split(",")):
+        i = next((n for n, ch in enumerate(item) if ch in OPS), None)
+        if i is None:
+            raise ValueError(f"Cannot parse config override '{item}' in '{mod}'")
+        overrides.append((item[:i], item[i], float(item[i + 1:])))
+    return base, overrides
+
+
+def register_variant(aircraft: str, mod: str, overrides) -> str:
+    """Register the overridden config of (aircraft, mod) and return its derived mod name."""
+    name = variant_name(mod, overrides)
+    if (aircraft, name) not in AIRCRAFT_CONFIG:
+        AIRCRAFT_CONFIG[(aircraft, name)] = apply_overrides(AIRCRAFT_CONFIG[(aircraft, mod)], overrides)
+    return name
+
+
+def ensure_config(aircraft: str, mod: str) -> tuple:
+    """
+    The config tuple for (aircraft, mod), registering it first if mod is a variant
+    name not yet known in this process (e.g. in a spawned worker).
+    """
+    if (aircraft, mod) not in AIRCRAFT_CONFIG and VARIANT_SEP in mod:
+        base, overrides = parse_variant(mod)
+        register_variant(aircraft, base, overrides)
+    return AIRCRAFT_CONFIG[(aircraft, mod)]
+
+
+def parse_param_axis(spec: str) -> tuple[str, str, list[float]]:
+    """
+    Parse a sweep axis such as "cdo=0.026:0.030:0.001" (start:stop:step, stop
+    inclusive), "h+=0:2:0.5", "e*=0.95,1.05" or "b=47.5".
+
+    Returns:
+        tuple: (field, op, values).
+    """
+    lhs, sep, rhs = spec.partition("=")
+    if not sep or not rhs:
+        raise ValueError(f"Cannot parse parameter axis '{spec}' (expected e.g. cdo=0.026:0.030:0.001)")
+    op = "="
+    if lhs and lhs[-1] in ("*", "+"):
+        lhs, op = lhs[:-1], lhs[-1]
+    field = lhs.strip()
+    if field not in CONFIG_FIELDS:
+        raise ValueError(f"Unknown config field '{field}' (expected one of {', '.join(CONFIG_FIELDS)})")
+    if ":" in rhs:
+        start, stop, step = (float(x) for x in rhs.split(":"))
+        n = int(np.floor((stop - start) / step + 1e-9)) + 1
+        values = [round(start + i * step, 10) for i in range(max(n, 1))]
+    else:
+        values = [float(x) for x in rhs.split(",")]
+    return field, op, values
+
+
+def expand_config_variants(aircraft: str, mods: list[str], param_axes=None) -> list[str]:
+    """
+    Mods of the aircraft with the cartesian product of param_axes applied,
+    registering every variant. Without axes the configured mods are returned.
+    """
+    mods = [m for m in mods if (aircraft, m) in AIRCRAFT_CONFIG]
+    if not param_axes:
+        return mods
+    variants = []
+    for mod, values in product(mods, product(*(axis[2] for axis in param_axes))):
+        overrides = [(field, op, value) for (field, op, _), value in zip(param_axes, values)]
+        variants.append(register_variant(aircraft, mod, overrides))
+    return variants
@@ -294,6 +294,57 @@ def predict_roc(next_step_alt, alt, w, m, thrust, drag, vktas, thrust_mult, engi
     return new_roc_fpm
 
 
+
+class ROCCache:
+    """
+    Lazily filled predict_roc() table for the step-climb logic of one run.
+
+    predict_roc only depends on the step altitude, weight, speed goal, ISA
+    deviation, segment, engine count and thrust factor (plus the current Mach
+    for IAS goals), so entries are keyed on those, with ISA rounded to 0.1 C and
+    Mach to mach_band. Each entry is evaluated at weight-band edges and lookups
+    interpolate linearly between the two edges bracketing the weight.
+    """
+
+    def __init__(self, thrust_mult, cdo, dcdo_flap1, dcdo_flap2, dcdo_flap3, dcdo_gear, k, s,
+                 weight_band_lb=100.0, mach_band=0.005):
+        self.thrust_mult = thrust_mult
+        self.cdo = cdo
+        self.dcdo = (dcdo_flap1, dcdo_flap2, dcdo_flap3, dcdo_gear)
+        self.k = k
+        self.s = s
+        self.weight_band_lb = float(weight_band_lb)
+        self.mach_band = float(mach_band)
+        self.table = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _edge(self, key, w_edge):
+        next_step_alt, m, isa_diff, speed_goal, segment, engines, thrust_factor = key
+        entry = (*key, w_edge)
+        if entry in self.table:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.table[entry] = predict_roc(
+                next_step_alt, next_step_alt, w_edge, m, 0, 0, 0, self.thrust_mult, engines, thrust_factor,
+                self.cdo, *self.dcdo, self.k, self.s, isa_diff, speed_goal, segment, next_step_alt,
+            )
+        return self.table[entry]
+
+    def predict(self, next_step_alt, w, m, isa_diff, speed_goal, segment, engines, thrust_factor):
+        """Cached equivalent of predict_roc() for the same step altitude and conditions."""
+        m_key = round(round(m / self.mach_band) * self.mach_band, 6) if speed_goal >= 1 else 0.0
+        key = (float(next_step_alt), m_key, round(float(isa_diff), 1), float(speed_goal), int(segment),
+               engines, thrust_factor)
+        w_lo = np.floor(w / self.weight_band_lb) * self.weight_band_lb
+        frac = (w - w_lo) / self.weight_band_lb
+        roc_lo = self._edge(key, w_lo)
+        if frac <= 1e-9:
+            return roc_lo
+        return (1 - frac) * roc_lo + frac * self._edge(key, w_lo + self.weight_band_lb)
+
+
 def next_step_altitude(current_alt, final_cruise_alt, previous_step_alt):
     rounded_current_alt = round(current_alt / 1000) * 1000
     rounded_final_cruise_alt = round(final_cruise_alt / 1000) * 1000
@@ -314,4 +365,103 @@ def next_step_altitude(current_alt, final_cruise_alt, previous_step_alt):
             next_alt = rounded_current_alt + 2000
     if next_alt > rounded_final_cruise_alt:
         next_alt = rounded_final_cruise_alt
-    return round(next_alt / 1000) * 1000
\ No newline at end of file
+    return round(next_alt / 1000) * 1000
+
+# Vectorized counterparts of the scalar models above. They accept NumPy arrays
+# (or scalars) and reproduce the same branches element-wise, for table builders
+# and batch fast paths that evaluate many flight conditions at once.
+
+def compressibility_correction(m, delta):
+    """IAS/EAS ratio used throughout physics(): vkias = vkeas * correction."""
+    return 1 + 1/8 * (1 - delta) * m ** 2 + 3/640 * (1 - 10 * delta + 9 * delta ** 2) * m ** 4
+
+
+def atmos_array(alt, isa_diff):
+    alt = np.asarray(alt, dtype=float)
+    isa_diff = np.asarray(isa_diff, dtype=float)
+    d_alt = np.where(alt > 36089, alt + isa_diff * 96.157, alt + isa_diff * 118.89)
+    theta = np.where(d_alt < 36089, 1 - (0.000006875) * d_alt, 0.7519)
+    strat = np.exp(-(0.00004811) * (d_alt - 36089))
+    sigma = np.where(d_alt < 36089, theta ** 4.2621, 0.297 * strat)
+    delta = np.where(alt < 36089, theta ** 5.2621, 0.223 * strat)
+    k_temp = 288.15 * theta
+    c = (1.4 * 287 * k_temp) ** 0.5 * 1.94384
+    return d_alt, theta, sigma, delta, k_temp, c
+
+
+def thrust_calc_array(d_alt, m, thrust_mult, engines, thrust_factor):
+    thrust_reg = (2785.75 -
+                  1950.17 * m -
+                  0.05261 * d_alt -
+                  12.9726 * m ** 2 +
+                  0.07669 * m * d_alt -
+                  0.0000001806 * d_alt ** 2 +
+                  1118.99 * m ** 3 -
+                  0.03617 * m ** 2 * d_alt -
+                  0.0000003701 * m * d_alt ** 2 +
+                  0.000000000003957 * d_alt ** 3)
+    return np.maximum(thrust_reg * thrust_mult * engines * thrust_factor, 100.0)
+
+
+def drag_calc_array(cdo, m, k, cl, q, s, dcdo=0.0, compressibility=True):
+    """
+    Airborne drag for clean (segments 4-10) or configured (dcdo > 0) flight.
+
+    Compressibility drag is applied above M 0.5 only when compressibility is
+    True, matching drag_calc() which drops it in the approach segments.
+    """
+    m = np.asarray(m, dtype=float)
+    cl = np.asarray(cl, dtype=float)
+    cdnp = np.where(
+        m > 0.5,
+        (6.667 * m ** 4 - 15.733 * m ** 3 + 13.923 * m ** 2 - 5.464 * m + 0.8012) * (np.exp(6 * cl ** 2) / 4),
+        0.0,
+    )
+    cd = cdo + k * cl ** 2 + dcdo + (cdnp if compressibility else 0.0)
+    return q * s * cd, cd
+
+
+def turboprop_thrust_array(v_true_fps, sigma, engines, thrust_factor, turboprop, prop_rpm=None):
+    """Propeller thrust from shaft power and eta(J), as in the turboprop branch of physics()."""
+    rho = np.asarray(sigma, dtype=float) * 0.0023769
+    D = turboprop.get('prop_diameter_ft', 10.8)
+    rpm = prop_rpm if prop_rpm is not None else turboprop.get('prop_rpm', 1900.0)
+    n = rpm / 60.0
+    P_rated = turboprop.get('P_rated_shp', 675.0) * engines
+    alpha = turboprop.get('alpha_lapse', 0.6)
+    C_T0 = turboprop.get('C_T0', 0.10)
+    J_curve = turboprop.get('eta_curve_J', [0.0, 0.4, 0.8, 1.0, 1.2, 1.4])
+    eta_curve = turboprop.get('eta_curve_eta', [0.00, 0.70, 0.83, 0.86, 0.82, 0.70])
+
+    V = np.maximum(0.0, np.asarray(v_true_fps, dtype=float))
+    J = V / (n * D) if n * D > 1e-6 else np.zeros_like(V)
+    eta = np.interp(J, J_curve, eta_curve)
+    throttle = max(0.0, min(1.0, thrust_factor))
+    P_avail_shp = P_rated * (np.asarray(sigma, dtype=float) ** alpha) * throttle
+    T_power = (eta * P_avail_shp * 550.0) / np.maximum(V, 1e-3)
+    T_static = throttle * C_T0 * rho * (n ** 2) * (D ** 4)
+    V_lo, V_hi = 10.0, 80.0
+    w_blend = np.clip((V - V_lo) / (V_hi - V_lo), 0.0, 1.0)
+    thrust = (1 - w_blend) * T_static + w_blend * T_power
+    return np.maximum(thrust, 100.0), P_avail_shp
+
+
+def predict_roc_array(next_step_alt, w, m, thrust_mult, engines, thrust_factor, cdo, k, s, isa_diff, speed_goal):
+    """Vectorized predict_roc() for the clean climb segments (4/5)."""
+    new_d_alt, _, new_sigma, new_delta, _, new_c = atmos_array(next_step_alt, isa_diff)
+    speed_goal = np.asarray(speed_goal, dtype=float)
+    correction = compressibility_correction(np.asarray(m, dtype=float), new_delta)
+    new_vkeas_ias = speed_goal / correction
+    new_vktas = np.where(speed_goal < 1, speed_goal * new_c, new_vkeas_ias / np.sqrt(new_sigma))
+    new_vkeas = np.where(speed_goal < 1, new_vktas * np.sqrt(new_sigma), new_vkeas_ias)
+    new_m = new_vktas / new_c
+    v_true_fps_new = new_vktas * 6076.12 / 3600
+    new_thrust = thrust_calc_array(new_d_alt, new_m, thrust_mult, engines, thrust_factor)
+    new_q = new_vkeas ** 2 / 295
+    safe_q = np.where(new_q > 0, new_q, 1.0)
+    new_drag, _ = drag_calc_array(cdo, new_m, k, w / (safe_q * s), safe_q, s)
+    new_drag = np.where(new_q > 0, new_drag, 0.0)
+    new_tx = (new_thrust - new_drag) / w
+    new_gamma = np.arcsin(np.clip(new_tx, -1.0, 1.0))
+    new_roc_fpm = new_gamma * v_true_fps_new / (6076.12 / 3600) * 60
+    return np.maximum(new_roc_fpm, 0.0)
@@ -0,0 +1,206 @@
+"""
+Job Client Module
+
+Thin client of the local job server (job_server.py). The Streamlit apps and the
+batch CLI use it to submit simulations and payload-range sweeps, follow their
+progress and fetch the results, so the work runs in the server's shared pool
+rather than in the calling process.
+
+    client = JobClient("http://127.0.0.1:8765")
+    job_id = client.submit_sweep(aircraft_models=["CJ1"], mods=["Tamarack"], isa_devs=[0])
+    client.wait(job_id, on_progress=print)
+    df = client.sweep_result(job_id)
+"""
+
+import argparse
+import io
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pandas as pd
+import plotly.io as pio
+
+DEFAULT_URL = os.environ.get("JOB_SERVER_URL", "http://127.0.0.1:8765")
+POLL_INTERVAL_S = 1.0
+FINISHED_STATES = ("done", "failed", "cancelled")
+# Positional parameters of simulation.run_simulation, in order
+SIMULATION_ARGS = (
+    "dep_airport", "arr_airport", "aircraft", "mod", "takeoff_flap_setting", "payload", "initial_fuel",
+    "taxi_fuel", "reserve_fuel", "cruise_alt", "winds_temps_source", "v1_cut_enabled", "write_output_file",
+)
+
+
+class JobServerError(RuntimeError):
+    """Error reported by the job server, or a job that did not finish successfully."""
+
+
+def _json_default(obj):
+    """numpy scalars as Python numbers, anything else (paths) as text."""
+    return obj.item() if hasattr(obj, "item") else str(obj)
+
+
+class JobClient:
+    """Client of one job server, addressed by its base URL."""
+
+    def __init__(self, url: str = DEFAULT_URL, timeout: float = 30.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, body: dict | None = None) -> bytes:
+        data = json.dumps(body, default=_json_default).encode("utf-8") if body is not None else None
+        req = urllib.request.Request(self.url + path, data=data, method=method,
+                                     headers={"Content-Type": "application/json"} if data else {})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                return resp.read()
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", e.reason)
+            except (ValueError, AttributeError):
+                message = e.reason
+            raise JobServerError(f"{method} {path}: {message} (HTTP {e.code})") from None
+        except urllib.error.URLError as e:
+            raise JobServerError(f"Job server at {self.url} is not reachable: {e.reason}") from None
+
+    def _json(self, method: str, path: str, body: dict | None = None):
+        return json.loads(self._request(method, path, body))
+
+    def health(self) -> dict:
+        return self._json("GET", "/health")
+
+    def submit(self, kind: str, params: dict) -> str:
+        """Submit a "simulation" or "sweep" job and return its id."""
+        return self._json("POST", "/jobs", {"kind": kind, "params": params})["id"]
+
+    def submit_simulation(self, **params) -> str:
+        return self.submit("simulation", params)
+
+    def submit_sweep(self, **params) -> str:
+        """Submit run_payload_range_batch keyword arguments (output_dir and queue_dir are chosen by the server)."""
+        return self.submit("sweep", params)
+
+    def status(self, job_id: str) -> dict:
+        return self._json("GET", f"/jobs/{job_id}")
+
+    def jobs(self) -> list[dict]:
+        return self._json("GET", "/jobs")
+
+    def cancel(self, job_id: str) -> dict:
+        return self._json("POST", f"/jobs/{job_id}/cancel")
+
+    def wait(self, job_id: str, poll_interval: float = POLL_INTERVAL_S, on_progress=None,
+             timeout: float | None = None) -> dict:
+        """
+        Poll until the job has finished.
+
+        Args:
+            on_progress: Called with each status dict while waiting.
+            timeout: Give up (raise TimeoutError) after this many seconds.
+
+        Returns:
+            dict: The final status.
+        """
+        t0 = time.monotonic()
+        while True:
+            status = self.status(job_id)
+            if on_progress is not None:
+                on_progress(status)
+            if status["state"] in FINISHED_STATES:
+                return status
+            if timeout is not None and time.monotonic() - t0 > timeout:
+                raise TimeoutError(f"Job {job_id} still {status['state']} after {timeout:.0f} s")
+            time.sleep(poll_interval)
+
+    def files(self, job_id: str) -> list[str]:
+        return self._json("GET", f"/jobs/{job_id}/files")
+
+    def download(self, job_id: str, name: str, dest: str | Path) -> Path:
+        """Save one output file of a sweep (path relative to its output directory) to dest."""
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(self._request("GET", f"/jobs/{job_id}/files/{name}"))
+        return dest
+
+    def simulation_result(self, job_id: str) -> tuple:
+        """The outputs of a finished simulation job, in the order run_simulation returns them."""
+        out = self._json("GET", f"/jobs/{job_id}/result")
+        df = pd.read_json(io.StringIO(json.dumps(out["flight_data"])), orient="split")
+        results = {**out["results"], **{k: pio.from_json(v) for k, v in out.get("figures", {}).items()}}
+        return df, results, out["dep_lat"], out["dep_lon"], out["arr_lat"], out["arr_lon"], out["output_file"]
+
+    def sweep_result(self, job_id: str) -> pd.DataFrame:
+        """The result rows of a finished sweep job (as returned by run_payload_range_batch)."""
+        return pd.read_csv(io.BytesIO(self._request("GET", f"/jobs/{job_id}/result")))
+
+    def _finished(self, job_id: str, on_progress=None) -> None:
+        status = self.wait(job_id, on_progress=on_progress)
+        if status["state"] != "done":
+            raise JobServerError(f"Job {job_id} {status['state']}" + (f": {status['error']}" if status["error"] else ""))
+
+    def run_simulation(self, *args, **kwargs) -> tuple:
+        """Drop-in for simulation.run_simulation that runs on the server and waits for the outputs."""
+        if len(args) > len(SIMULATION_ARGS):
+            raise TypeError(f"run_simulation takes at most {len(SIMULATION_ARGS)} positional arguments")
+        job_id = self.submit("simulation", {**dict(zip(SIMULATION_ARGS, args)), **kwargs})
+        self._finished(job_id)
+        return self.simulation_result(job_id)
+
+    def run_payload_range_batch(self, on_progress=None, **kwargs) -> pd.DataFrame:
+        """Drop-in for batch.payload_range.run_payload_range_batch that runs on the server and waits for the rows."""
+        job_id = self.submit_sweep(**kwargs)
+        self._finished(job_id, on_progress)
+        return self.sweep_result(job_id)
+
+
+def format_progress(status: dict) -> str:
+    """One-line progress text of a job status, e.g. "running 120/736 cases"."""
+    progress = status.get("progress") or {}
+    if progress.get("stage") == "preparing":
+        return f"{status['state']} (building tables)"
+    if status.get("kind") == "sweep" and progress.get("total"):
+        return f"{status['state']} {progress['done']}/{progress['total']} cases"
+    return status["state"]
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Client of the local job server (job_server.py)")
+    p.add_argument("--url", type=str, default=DEFAULT_URL, help="Job server URL (default: $JOB_SERVER_URL)")
+    sub = p.add_subparsers(dest="command", required=True)
+    sub.add_parser("jobs", help="List jobs")
+    for name, help_text in (("status", "Show a job's status"), ("wait", "Wait for a job, printing progress"),
+                            ("cancel", "Cancel a job"), ("files", "List a sweep's output files")):
+        sub.add_parser(name, help=help_text).add_argument("job_id")
+    dl = sub.add_parser("download", help="Download a sweep output file (job_rows.csv holds the result rows)")
+    dl.add_argument("job_id")
+    dl.add_argument("name", help="Path within the output directory, e.g. combined_summary.csv")
+    dl.add_argument("--out", type=str, default=None, help="Destination (default: file name in the current directory)")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    client = JobClient(args.url)
+    if args.command == "jobs":
+        for job in client.jobs():
+            print(f"{job['id']}  {job['kind']:<10}  {format_progress(job)}")
+    elif args.command == "status":
+        print(json.dumps(client.status(args.job_id), indent=2))
+    elif args.command == "wait":
+        status = client.wait(args.job_id, on_progress=lambda s: print(f"\r{format_progress(s)}", end="", flush=True))
+        print()
+        if status["error"]:
+            print(status["error"])
+    elif args.command == "cancel":
+        print(client.cancel(args.job_id)["state"])
+    elif args.command == "files":
+        print("\n".join(client.files(args.job_id)))
+    elif args.command == "download":
+        print(f"Saved {client.download(args.job_id, args.name, args.out or Path(args.name).name)}")
+
+
+if __name__ == "__main__":
+    main()
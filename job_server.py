@@ -0,0 +1,379 @@
+"""
+Job Server Module
+
+A small local HTTP service that runs simulations and payload-range sweeps on a
+warm, shared process pool, so long sweeps outlive the Streamlit session (or CLI)
+that submitted them. Jobs are submitted as JSON keyword arguments of
+run_simulation or run_payload_range_batch and polled for status and progress;
+results and output files are downloaded when they finish.
+
+Endpoints (JSON unless noted):
+    GET  /health                       Pool size and job counts
+    GET  /jobs                         Status of every job
+    POST /jobs                         {"kind": "simulation" | "sweep", "params": {...}} -> status
+    GET  /jobs/<id>                    Status: state, progress, error, output_dir
+    POST /jobs/<id>/cancel             Cancel a queued or running job
+    GET  /jobs/<id>/result             Simulation: results and flight data; sweep: result rows (CSV)
+    GET  /jobs/<id>/files              Output files of a sweep
+    GET  /jobs/<id>/files/<path>       Download one output file
+
+Sweeps run through the batch work queue (batch/work_queue.py): a coordinator
+process runs run_payload_range_batch with queue_dir inside the job directory
+and the pool's processes run the queued cases, so progress is read from the
+queue and cancellation drops the cases not yet started.
+
+Run from the directory holding airports_full.csv:
+    python job_server.py --port 8765 --workers 6
+The server binds to 127.0.0.1 and has no authentication; do not expose it.
+"""
+
+import argparse
+import inspect
+import json
+import mimetypes
+import multiprocessing
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote
+
+import numpy as np
+
+from batch.payload_range import run_payload_range_batch
+from batch.work_queue import cancel_queue, queue_counts
+from batch.worker import run_worker
+from simulation import run_simulation
+from utils import load_airports
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 6
+JOBS_DIR = Path("job_outputs")
+# Queue polling of the sweep workers; short, since the pool is local
+SWEEP_POLL_S = 0.5
+# Sweep arguments the server chooses itself
+_SERVER_SWEEP_ARGS = ("output_dir", "queue_dir", "shard", "use_threads")
+_FINISHED = ("done", "failed", "cancelled")
+
+
+def _json_default(obj):
+    """numpy arrays as lists, numpy scalars as Python numbers, anything else as text."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return obj.item() if hasattr(obj, "item") else str(obj)
+
+
+def _init_worker():
+    load_airports()
+
+
+def _simulation_job(params: dict) -> dict:
+    """Run one simulation in a pool process and return its outputs as JSON-ready data."""
+    df, results, dep_lat, dep_lon, arr_lat, arr_lon, output_file = run_simulation(**params)
+    # Plotly figures in the results (fuel_distance_plot) travel as plotly JSON
+    figures = {k: v.to_json() for k, v in results.items() if hasattr(v, "to_plotly_json")}
+    return json.loads(json.dumps({
+        "results": {k: v for k, v in results.items() if k not in figures},
+        "figures": figures,
+        "flight_data": json.loads(df.to_json(orient="split", double_precision=15)),
+        "dep_lat": dep_lat, "dep_lon": dep_lon, "arr_lat": arr_lat, "arr_lon": arr_lon,
+        "output_file": output_file,
+    }, default=_json_default))
+
+
+def _sweep_coordinator(params: dict, queue_dir: str, output_dir: str) -> None:
+    """Coordinator process of a sweep job: queue the cases, wait for them and write the outputs."""
+    try:
+        load_airports()
+        df = run_payload_range_batch(**params, queue_dir=queue_dir, output_dir=output_dir)
+        df.to_csv(Path(output_dir) / "job_rows.csv", index=False)
+    except BaseException:
+        (Path(output_dir) / "job_error.txt").write_text(traceback.format_exc())
+        raise
+
+
+def _sweep_worker(queue_dir: str) -> int:
+    """Pool task of a sweep job: run queued cases until the coordinator (or a cancel) closes the queue."""
+    return run_worker(queue_dir, poll_interval=SWEEP_POLL_S)
+
+
+def _check_params(func, params: dict, reserved=()) -> None:
+    """Raise ValueError unless params are valid keyword arguments of func."""
+    if not isinstance(params, dict):
+        raise ValueError("params must be a JSON object of keyword arguments")
+    taken = sorted(set(params) & set(reserved))
+    if taken:
+        raise ValueError(f"params may not set {', '.join(taken)} (chosen by the server)")
+    try:
+        inspect.signature(func).bind(**params)
+    except TypeError as e:
+        raise ValueError(f"Invalid {func.__name__} arguments: {e}") from None
+
+
+class JobManager:
+    """
+    Jobs submitted to the server and the warm process pool that runs them.
+
+    Each job has a directory under jobs_dir (sweep outputs and queue). Job state
+    is kept in memory: queued -> running -> done | failed | cancelled.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, jobs_dir: str | Path = JOBS_DIR):
+        self.workers = int(workers)
+        self.jobs_dir = Path(jobs_dir).resolve()
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self._ctx = multiprocessing.get_context("spawn")
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=self._ctx, initializer=_init_worker)
+        self.jobs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _new_job(self, kind: str, params: dict) -> dict:
+        job_id = datetime.now().strftime("%Y%m%d_%H%M%S_") + uuid.uuid4().hex[:6]
+        job = {
+            "id": job_id, "kind": kind, "state": "queued", "params": params,
+            "submitted": time.time(), "started": None, "finished": None, "error": None,
+            "dir": self.jobs_dir / job_id,
+        }
+        job["dir"].mkdir(parents=True)
+        with self._lock:
+            self.jobs[job_id] = job
+        return job
+
+    def _finish(self, job: dict, state: str, error: str | None = None) -> None:
+        with self._lock:
+            if job["state"] in _FINISHED:
+                return
+            job.update(state=state, error=error, finished=time.time())
+
+    def submit_simulation(self, params: dict) -> dict:
+        _check_params(run_simulation, params)
+        job = self._new_job("simulation", params)
+        future = self.pool.submit(_simulation_job, params)
+        job["future"] = future
+
+        def done(f):
+            try:
+                job["result"] = f.result()
+                self._finish(job, "done")
+            except CancelledError:
+                self._finish(job, "cancelled")
+            except Exception as e:
+                self._finish(job, "failed", f"{type(e).__name__}: {e}")
+        future.add_done_callback(done)
+        return self.status(job["id"])
+
+    def submit_sweep(self, params: dict) -> dict:
+        _check_params(run_payload_range_batch, params, reserved=_SERVER_SWEEP_ARGS)
+        if params.get("mode", "full") != "full":
+            raise ValueError("Sweeps run on the work queue, which runs full-physics cases only (mode='full')")
+        job = self._new_job("sweep", params)
+        queue_dir, output_dir = job["dir"] / "queue", job["dir"] / "out"
+        output_dir.mkdir()
+        job.update(queue_dir=queue_dir, output_dir=output_dir, started=time.time(), state="running")
+        job["process"] = self._ctx.Process(target=_sweep_coordinator, args=(params, str(queue_dir), str(output_dir)),
+                                           name=f"sweep-{job['id']}")
+        job["process"].start()
+        job["futures"] = [self.pool.submit(_sweep_worker, str(queue_dir)) for _ in range(self.workers)]
+        threading.Thread(target=self._monitor_sweep, args=(job,), daemon=True).start()
+        return self.status(job["id"])
+
+    def _monitor_sweep(self, job: dict) -> None:
+        job["process"].join()
+        if job["process"].exitcode == 0:
+            self._finish(job, "done")
+            return
+        # Failed or terminated: release the sweep workers still waiting on the queue
+        cancel_queue(job["queue_dir"])
+        error_path = job["output_dir"] / "job_error.txt"
+        error = error_path.read_text().strip().splitlines()[-1] if error_path.exists() else None
+        self._finish(job, "failed", error or f"Coordinator exited with code {job['process'].exitcode}")
+
+    def cancel(self, job_id: str) -> dict:
+        job = self._get(job_id)
+        if job["state"] not in _FINISHED:
+            # Marked first so the sweep monitor does not report the terminated coordinator as failed
+            self._finish(job, "cancelled")
+            if job["kind"] == "simulation":
+                # A simulation already running in a pool process finishes, but its result is discarded
+                job["future"].cancel()
+            else:
+                job["process"].terminate()
+                cancel_queue(job["queue_dir"])
+        return self.status(job_id)
+
+    def _get(self, job_id: str) -> dict:
+        with self._lock:
+            if job_id not in self.jobs:
+                raise KeyError(job_id)
+            return self.jobs[job_id]
+
+    def _progress(self, job: dict) -> dict:
+        if job["kind"] == "simulation":
+            return {"done": int(job["state"] == "done"), "total": 1}
+        if not (job["queue_dir"] / "queue.json").exists():
+            return {"done": 0, "total": None, "stage": "preparing"}
+        counts = queue_counts(job["queue_dir"])
+        return {"done": counts["done"], "total": sum(counts.values()), "running": counts["claimed"], "stage": "cases"}
+
+    def status(self, job_id: str) -> dict:
+        job = self._get(job_id)
+        if job["kind"] == "simulation" and job["state"] == "queued" and job["future"].running():
+            job.update(state="running", started=time.time())
+        status = {k: job[k] for k in ("id", "kind", "state", "submitted", "started", "finished", "error", "params")}
+        status["progress"] = self._progress(job)
+        if job["kind"] == "sweep":
+            status["output_dir"] = str(job["output_dir"])
+        return status
+
+    def list_jobs(self) -> list[dict]:
+        with self._lock:
+            ids = list(self.jobs)
+        return [self.status(job_id) for job_id in ids]
+
+    def result(self, job_id: str):
+        """Simulation: the outputs dict. Sweep: path of the result-row CSV."""
+        job = self._get(job_id)
+        if job["state"] != "done":
+            raise RuntimeError(f"Job {job_id} is {job['state']}, not done")
+        return job["result"] if job["kind"] == "simulation" else job["output_dir"] / "job_rows.csv"
+
+    def files(self, job_id: str) -> list[str]:
+        job = self._get(job_id)
+        if job["kind"] != "sweep":
+            return []
+        root = job["output_dir"]
+        return sorted(str(p.relative_to(root)) for p in root.rglob("*") if p.is_file())
+
+    def file_path(self, job_id: str, name: str) -> Path:
+        job = self._get(job_id)
+        if job["kind"] != "sweep":
+            raise FileNotFoundError(name)
+        root = job["output_dir"].resolve()
+        path = (root / name).resolve()
+        if root not in path.parents or not path.is_file():
+            raise FileNotFoundError(name)
+        return path
+
+    def shutdown(self) -> None:
+        for job in self.list_jobs():
+            if job["state"] not in _FINISHED:
+                self.cancel(job["id"])
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """Routes the endpoints listed in the module docstring to the server's JobManager."""
+
+    server_version = "FlightJobServer/1.0"
+
+    @property
+    def manager(self) -> JobManager:
+        return self.server.manager
+
+    def log_message(self, format, *args):
+        if not getattr(self.server, "quiet", False):
+            super().log_message(format, *args)
+
+    def _send(self, code: int, body: bytes, content_type: str, filename: str | None = None) -> None:
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if filename:
+            self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, obj, code: int = 200) -> None:
+        self._send(code, json.dumps(obj, default=_json_default).encode("utf-8"), "application/json")
+
+    def _send_file(self, path: Path) -> None:
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        self._send(200, path.read_bytes(), content_type, filename=path.name)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _route(self, method: str) -> None:
+        parts = [unquote(p) for p in self.path.split("?", 1)[0].strip("/").split("/") if p]
+        try:
+            if method == "GET" and parts == ["health"]:
+                jobs = self.manager.list_jobs()
+                states = {s: sum(j["state"] == s for j in jobs) for s in ("queued", "running", *_FINISHED)}
+                return self._send_json({"status": "ok", "workers": self.manager.workers, "jobs": states})
+            if parts == ["jobs"]:
+                if method == "GET":
+                    return self._send_json(self.manager.list_jobs())
+                body = self._read_json()
+                submit = {"simulation": self.manager.submit_simulation, "sweep": self.manager.submit_sweep}.get(body.get("kind"))
+                if submit is None:
+                    raise ValueError("kind must be 'simulation' or 'sweep'")
+                return self._send_json(submit(body.get("params") or {}), code=202)
+            if len(parts) >= 2 and parts[0] == "jobs":
+                job_id, rest = parts[1], parts[2:]
+                if method == "GET" and not rest:
+                    return self._send_json(self.manager.status(job_id))
+                if method == "POST" and rest == ["cancel"]:
+                    return self._send_json(self.manager.cancel(job_id))
+                if method == "GET" and rest == ["result"]:
+                    result = self.manager.result(job_id)
+                    return self._send_file(result) if isinstance(result, Path) else self._send_json(result)
+                if method == "GET" and rest == ["files"]:
+                    return self._send_json(self.manager.files(job_id))
+                if method == "GET" and len(rest) >= 2 and rest[0] == "files":
+                    return self._send_file(self.manager.file_path(job_id, "/".join(rest[1:])))
+            self._send_json({"error": f"No endpoint {method} {self.path}"}, code=404)
+        except KeyError as e:
+            self._send_json({"error": f"Unknown job {e.args[0]}"}, code=404)
+        except FileNotFoundError as e:
+            self._send_json({"error": f"No such file: {e.args[0] if e.args else ''}"}, code=404)
+        except RuntimeError as e:
+            self._send_json({"error": str(e)}, code=409)
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json({"error": str(e)}, code=400)
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = DEFAULT_WORKERS,
+          jobs_dir: str | Path = JOBS_DIR, quiet: bool = False) -> None:
+    """Run the job server until interrupted, cancelling unfinished jobs on exit."""
+    manager = JobManager(workers, jobs_dir)
+    httpd = ThreadingHTTPServer((host, port), JobRequestHandler)
+    httpd.manager, httpd.quiet = manager, quiet
+    print(f"Job server on http://{host}:{port} ({workers} workers, jobs in {manager.jobs_dir})")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        manager.shutdown()
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Local job server for simulations and payload-range sweeps")
+    p.add_argument("--host", type=str, default=DEFAULT_HOST, help="Interface to bind (keep local)")
+    p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Processes in the shared pool")
+    p.add_argument("--jobs-dir", type=str, default=str(JOBS_DIR), help="Directory for job outputs")
+    p.add_argument("--quiet", action="store_true", help="Do not log every request")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    serve(args.host, args.port, args.workers, args.jobs_dir, args.quiet)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Mission Solvers Module
+
+Inverse solvers for a fixed route: the minimum initial fuel that lands with the
+reserve intact for a given payload, and the maximum payload that can be flown
+within the MTOW, MRW, MZFW and tank limits. Both secant-iterate on
+run_simulation from a specific-range warm start, memoize every run and report
+all iterations, and typically converge in three to five simulations.
+"""
+
+import numpy as np
+
+from aircraft_config import AIRCRAFT_CONFIG
+try:
+    from aircraft_config import TURBOPROP_PARAMS
+except ImportError:
+    TURBOPROP_PARAMS = {}
+from flight_physics import ROCCache
+from performance import aircraft_terms, cruise_point, optimal_cruise_speed
+from simulation import run_simulation, haversine_with_bearing
+from utils import load_airports
+
+FUEL_SLOPE = 0.9  # Initial d(landing fuel)/d(initial fuel) guess before the first secant step
+
+
+class MissionEvaluator:
+    """
+    Memoized run_simulation for one route and configuration, varying only
+    payload and initial fuel. Every distinct run is recorded in iterations.
+    """
+
+    def __init__(self, dep_airport: str, arr_airport: str, aircraft: str, mod: str, taxi_fuel: float,
+                 reserve_fuel: float, cruise_alt: float, takeoff_flap_setting: int = 0,
+                 winds_temps_source: str = "No Wind", sim_kwargs: dict | None = None):
+        self.dep_airport = dep_airport
+        self.arr_airport = arr_airport
+        self.aircraft = aircraft
+        self.mod = mod
+        self.taxi_fuel = float(taxi_fuel)
+        self.reserve_fuel = float(reserve_fuel)
+        self.cruise_alt = cruise_alt
+        self.takeoff_flap_setting = takeoff_flap_setting
+        self.winds_temps_source = winds_temps_source
+        self.sim_kwargs = dict(sim_kwargs or {})
+        ac = AIRCRAFT_CONFIG[(aircraft, mod)]
+        s, b, e, h = float(ac[0]), float(ac[1]), float(ac[2]), float(ac[3])
+        k = 1 / (3.14159 * e * b ** 2 / s * (1 + 1.9 * h / b))
+        # One predict_roc table shared by every run of the solve
+        self.sim_kwargs.setdefault("roc_cache", ROCCache(ac[7], ac[11], ac[12], ac[13], ac[14], ac[15], k, s))
+        self.cache = {}
+        self.iterations = []
+
+    def __call__(self, payload: float, initial_fuel: float) -> dict:
+        key = (round(float(payload), 1), round(float(initial_fuel), 1))
+        if key in self.cache:
+            return self.cache[key]
+        _, results, *_ = run_simulation(
+            self.dep_airport, self.arr_airport, self.aircraft, self.mod, self.takeoff_flap_setting,
+            key[0], key[1], self.taxi_fuel, self.reserve_fuel, self.cruise_alt,
+            self.winds_temps_source, False,
+            write_output_file=False,
+            **self.sim_kwargs,
+        )
+        error = results.get("error")
+        landing_fuel = None if error else (results.get("Fuel Remaining (lb)") or 0)
+        record = {
+            "iteration": len(self.iterations) + 1,
+            "payload_lb": key[0],
+            "initial_fuel_lb": key[1],
+            "status": "ok" if error is None else ("not_enough_fuel" if "Not Enough Fuel" in error else "error"),
+            "error": error,
+            "landing_fuel_lb": landing_fuel,
+            "excess_fuel_lb": None if error else landing_fuel - self.reserve_fuel,
+            "total_time_min": results.get("Total Time (min)"),
+            "total_dist_nm": results.get("Total Dist (NM)"),
+            "total_fuel_burned_lb": results.get("Total Fuel Burned (lb)"),
+        }
+        self.cache[key] = record
+        self.iterations.append(record)
+        return record
+
+
+def route_distance_nm(dep_airport: str, arr_airport: str) -> float:
+    """Great-circle distance between two airports, as run_simulation computes it."""
+    airports = load_airports()
+    dep = airports[airports['ident'] == dep_airport].iloc[0]
+    arr = airports[airports['ident'] == arr_airport].iloc[0]
+    dist, _ = haversine_with_bearing(dep['latitude_deg'], dep['longitude_deg'], arr['latitude_deg'], arr['longitude_deg'])
+    return float(dist)
+
+
+def _cruise_speed_goal(aircraft: str, terms: dict, weight: float, alt: float, isa_dev: float,
+                       cruise_mach=None, cruise_kias=None) -> float:
+    """The speed goal run_simulation flies in cruise, for the specific-range estimate."""
+    if aircraft in TURBOPROP_PARAMS and cruise_kias is not None:
+        return float(cruise_kias)
+    if isinstance(cruise_mach, str):
+        speeds = optimal_cruise_speed(terms, weight, alt, isa_dev)
+        mach = float(speeds[f"{cruise_mach.lower()}_mach"])
+        return mach if np.isfinite(mach) else terms["mmo"]
+    return float(cruise_mach) if cruise_mach is not None else 0.7
+
+
+def estimate_trip_fuel(aircraft: str, mod: str, zfw: float, dist_nm: float, reserve_fuel: float,
+                       cruise_alt: float, isa_dev: float = 0.0, cruise_mach=None, cruise_kias=None,
+                       climb_allowance: float = 0.05) -> dict:
+    """
+    Trip fuel from cruise specific range at the mid-trip weight, plus a fractional
+    climb allowance. Used to warm-start the solvers.
+
+    Returns:
+        dict: trip_fuel_lb and dburn_dweight (extra trip fuel per lb of extra weight).
+    """
+    terms = aircraft_terms(aircraft, mod)
+    alt = min(float(cruise_alt), terms["ceiling"])
+    trip = 0.0
+    for _ in range(3):
+        w_mid = zfw + reserve_fuel + 0.5 * trip
+        goal = _cruise_speed_goal(aircraft, terms, w_mid, alt, isa_dev, cruise_mach, cruise_kias)
+        sr = float(cruise_point(terms, w_mid, alt, isa_dev, goal)["sr"])
+        trip = dist_nm / max(sr, 1e-6) * (1.0 + climb_allowance)
+    return {"trip_fuel_lb": trip, "dburn_dweight": trip / max(zfw + reserve_fuel + 0.5 * trip, 1.0)}
+
+
+def _solve_band(evaluate, x0: float, slope0: float, x_min: float, x_max: float, tol: float,
+                fail_step: float, max_iter: int) -> tuple[float | None, bool]:
+    """
+    Find x where the monotone residual r(x) lands in [0, tol], by secant steps
+    aimed at tol / 2 and safeguarded by the tightest feasible/infeasible bracket.
+
+    Args:
+        evaluate: x -> residual, or None where the run failed (treated as r < 0).
+        slope0: Initial dr/dx guess; its sign sets the direction of feasibility.
+        fail_step: Move towards feasibility after a failed run with no bracket yet.
+
+    Returns:
+        tuple: (best feasible x or None, converged).
+    """
+    sign = 1.0 if slope0 > 0 else -1.0
+    ok = bad = None
+    pts = []
+    x = float(np.clip(x0, x_min, x_max))
+    for _ in range(max_iter):
+        r = evaluate(x)
+        if r is not None and r >= 0:
+            if ok is None or sign * (x - ok) < 0:
+                ok = x
+            if r <= tol:
+                return x, True
+        elif bad is None or sign * (x - bad) > 0:
+            bad = x
+        if r is not None:
+            pts.append((x, r))
+        slope = slope0
+        if len(pts) >= 2 and pts[-1][0] != pts[-2][0]:
+            secant = (pts[-1][1] - pts[-2][1]) / (pts[-1][0] - pts[-2][0])
+            if secant * sign > 0:
+                slope = secant
+        nxt = x + (0.5 * tol - r) / slope if r is not None else x + sign * fail_step
+        if ok is not None and bad is not None and not (min(ok, bad) < nxt < max(ok, bad)):
+            nxt = 0.5 * (ok + bad)
+        nxt = float(np.clip(nxt, x_min, x_max))
+        if abs(nxt - x) < 0.5:
+            break
+        x = nxt
+    return ok, False
+
+
+def _weight_limits(ac, payload: float, taxi_fuel: float) -> dict:
+    """Largest initial fuel each limit allows at this payload."""
+    bow, mrw, mtow, max_fuel = float(ac[18]), float(ac[20]), float(ac[21]), float(ac[22])
+    return {
+        "max_fuel": max_fuel,
+        "mrw": mrw - bow - payload,
+        "mtow": mtow + taxi_fuel - bow - payload,
+    }
+
+
+def solve_min_fuel(dep_airport: str, arr_airport: str, aircraft: str, mod: str, payload: float,
+                   taxi_fuel: float, reserve_fuel: float, cruise_alt: float, takeoff_flap_setting: int = 0,
+                   winds_temps_source: str = "No Wind", tol_lb: float = 25.0, max_iter: int = 8,
+                   evaluator: MissionEvaluator | None = None, **sim_kwargs) -> dict:
+    """
+    Minimum initial fuel (including taxi) that flies the route and lands with at
+    least reserve_fuel, and no more than tol_lb above it.
+
+    Args:
+        sim_kwargs: Extra run_simulation keywords (cruise_mach, cruise_kias, isa_dev_c, ...).
+
+    Returns:
+        dict: initial_fuel_lb (None if no fuel load within the limits works),
+        converged, limit (binding fuel limit when infeasible), estimate_lb,
+        result (the final iteration record) and iterations.
+    """
+    ac = AIRCRAFT_CONFIG[(aircraft, mod)]
+    ev = evaluator or MissionEvaluator(dep_airport, arr_airport, aircraft, mod, taxi_fuel, reserve_fuel,
+                                       cruise_alt, takeoff_flap_setting, winds_temps_source, sim_kwargs)
+    zfw = float(ac[18]) + float(payload)
+    if zfw > float(ac[19]):
+        raise ValueError(f"Payload {payload:.0f} lb exceeds MZFW for {aircraft} {mod}")
+    limits = _weight_limits(ac, payload, taxi_fuel)
+    fuel_cap = min(limits.values())
+    est = estimate_trip_fuel(aircraft, mod, zfw, route_distance_nm(dep_airport, arr_airport), reserve_fuel,
+                             cruise_alt, float(sim_kwargs.get("isa_dev_c") or 0.0),
+                             sim_kwargs.get("cruise_mach"), sim_kwargs.get("cruise_kias"))
+    fuel0 = taxi_fuel + reserve_fuel + est["trip_fuel_lb"] + 0.5 * tol_lb
+
+    def residual(fuel):
+        return ev(payload, fuel)["excess_fuel_lb"]
+
+    fuel, converged = _solve_band(residual, fuel0, FUEL_SLOPE, taxi_fuel + reserve_fuel, fuel_cap, tol_lb,
+                                  fail_step=0.15 * est["trip_fuel_lb"], max_iter=max_iter)
+    return {
+        "initial_fuel_lb": fuel,
+        "converged": converged,
+        "limit": None if fuel is not None else min(limits, key=limits.get),
+        "estimate_lb": fuel0,
+        "result": ev(payload, fuel) if fuel is not None else None,
+        "iterations": ev.iterations,
+    }
+
+
+def solve_max_payload(dep_airport: str, arr_airport: str, aircraft: str, mod: str, taxi_fuel: float,
+                      reserve_fuel: float, cruise_alt: float, takeoff_flap_setting: int = 0,
+                      winds_temps_source: str = "No Wind", tol_lb: float = 25.0, max_iter: int = 8,
+                      **sim_kwargs) -> dict:
+    """
+    Maximum payload for the route, with the aircraft fuelled to the lowest of the
+    tank, MRW and MTOW limits, landing with reserve_fuel to reserve_fuel + tol_lb
+    unless MZFW binds first.
+
+    Args:
+        sim_kwargs: Extra run_simulation keywords (cruise_mach, cruise_kias, isa_dev_c, ...).
+
+    Returns:
+        dict: payload_lb (None if the route cannot be flown empty), initial_fuel_lb,
+        limit (mzfw, max_fuel, mrw or mtow), converged, estimate_lb, result and
+        iterations.
+    """
+    ac = AIRCRAFT_CONFIG[(aircraft, mod)]
+    bow = float(ac[18])
+    ev = MissionEvaluator(dep_airport, arr_airport, aircraft, mod, taxi_fuel, reserve_fuel,
+                          cruise_alt, takeoff_flap_setting, winds_temps_source, sim_kwargs)
+    p_struct = max(0.0, float(ac[19]) - bow)
+
+    def fuel_for(payload):
+        return max(0.0, min(_weight_limits(ac, payload, taxi_fuel).values()))
+
+    # Warm start: the payload whose carried fuel matches the estimated requirement
+    dist_nm = route_distance_nm(dep_airport, arr_airport)
+    isa_dev = float(sim_kwargs.get("isa_dev_c") or 0.0)
+    payload0 = p_struct
+    for _ in range(3):
+        est = estimate_trip_fuel(aircraft, mod, bow + payload0, dist_nm, reserve_fuel, cruise_alt, isa_dev,
+                                 sim_kwargs.get("cruise_mach"), sim_kwargs.get("cruise_kias"))
+        spare = fuel_for(payload0) - (taxi_fuel + reserve_fuel + est["trip_fuel_lb"])
+        weight_limited = fuel_for(payload0) < float(ac[22])
+        slope0 = -((1.0 if weight_limited else 0.0) + est["dburn_dweight"])
+        payload0 = float(np.clip(payload0 + spare / -slope0, 0.0, p_struct))
+
+    def residual(payload):
+        return ev(payload, fuel_for(payload))["excess_fuel_lb"]
+
+    payload, converged = _solve_band(residual, payload0, slope0, 0.0, p_struct, tol_lb,
+                                     fail_step=0.15 * est["trip_fuel_lb"], max_iter=max_iter)
+    if payload is not None and payload >= p_struct - 0.5:
+        limit, converged = "mzfw", True
+    elif payload is not None:
+        limits = _weight_limits(ac, payload, taxi_fuel)
+        limit = min(limits, key=limits.get)
+    else:
+        limit = None
+    return {
+        "payload_lb": payload,
+        "initial_fuel_lb": fuel_for(payload) if payload is not None else None,
+        "limit": limit,
+        "converged": converged,
+        "estimate_lb": payload0,
+        "result": ev(payload, fuel_for(payload)) if payload is not None else None,
+        "iterations": ev.iterations,
+    }
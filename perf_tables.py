@@ -0,0 +1,210 @@
+"""
+Performance Tables Module
+
+This module contains the tabulated performance increments used to shortcut
+time-stepped phases of run_simulation, together with the helpers to
+interpolate, save and load them.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+
+from aircraft_config import AIRCRAFT_CONFIG
+try:
+    from aircraft_config import TURBOPROP_PARAMS
+except ImportError:
+    TURBOPROP_PARAMS = {}
+
+
+def config_fingerprint(aircraft: str, mod: str) -> str:
+    """Short hash of the aircraft configuration used to key cached tables."""
+    payload = repr((AIRCRAFT_CONFIG[(aircraft, mod)], sorted(TURBOPROP_PARAMS.get(aircraft, {}).items())))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:10]
+
+
+def interp_grid(axes, values, point):
+    """
+    Multilinear interpolation on a regular (not necessarily uniform) grid.
+
+    Args:
+        axes: Sequence of 1-D ascending axis arrays, one per leading dimension of values.
+        values: Array of shape (len(axes[0]), ..., len(axes[n-1]), *trailing).
+        point: Sequence of coordinates, one per axis. Values outside an axis are clamped.
+
+    Returns:
+        numpy.ndarray: Interpolated trailing values (scalar array if no trailing dims).
+    """
+    values = np.asarray(values, dtype=float)
+    lo_idx = []
+    fracs = []
+    for ax, x in zip(axes, point):
+        ax = np.asarray(ax, dtype=float)
+        if len(ax) == 1:
+            lo_idx.append(0)
+            fracs.append(0.0)
+            continue
+        x = float(np.clip(x, ax[0], ax[-1]))
+        i = int(np.clip(np.searchsorted(ax, x, side="right") - 1, 0, len(ax) - 2))
+        lo_idx.append(i)
+        fracs.append((x - ax[i]) / (ax[i + 1] - ax[i]))
+
+    out = np.zeros(values.shape[len(axes):])
+    for corner in range(2 ** len(axes)):
+        weight = 1.0
+        idx = []
+        for d in range(len(axes)):
+            bit = (corner >> d) & 1
+            if len(axes[d]) == 1 and bit:
+                weight = 0.0
+                break
+            weight *= fracs[d] if bit else (1.0 - fracs[d])
+            idx.append(lo_idx[d] + bit)
+        if weight == 0.0:
+            continue
+        out = out + weight * values[tuple(idx)]
+    return out
+
+
+class TerminalTable:
+    """
+    Departure (segments 0-3) and arrival (segments 11-13) increments for one
+    (aircraft, mod, flap), tabulated against weight and ISA deviation.
+
+    Departure rows are indexed by takeoff weight and give the time, distance
+    and fuel from brake release to 1500 ft AGL plus the VKTAS reached there.
+    Arrival rows are indexed by the weight at 3000 ft AGL and give the time,
+    distance and fuel from there to a full stop.
+    """
+
+    FIELDS = ("time_s", "dist_nm", "fuel_lb")
+
+    def __init__(self, aircraft, mod, flap, isa_devs, departure_weights, departure,
+                 departure_vktas, arrival_weights, arrival, meta=None):
+        self.aircraft = aircraft
+        self.mod = mod
+        self.flap = int(flap)
+        self.isa_devs = np.asarray(isa_devs, dtype=float)
+        self.departure_weights = np.asarray(departure_weights, dtype=float)
+        self.departure = np.asarray(departure, dtype=float)
+        self.departure_vktas = np.asarray(departure_vktas, dtype=float)
+        self.arrival_weights = np.asarray(arrival_weights, dtype=float)
+        self.arrival = np.asarray(arrival, dtype=float)
+        self.meta = dict(meta or {})
+
+    def departure_increment(self, weight: float, isa_dev: float) -> dict:
+        vals = interp_grid((self.departure_weights, self.isa_devs), self.departure, (weight, isa_dev))
+        vktas = float(interp_grid((self.departure_weights, self.isa_devs), self.departure_vktas, (weight, isa_dev)))
+        return {**dict(zip(self.FIELDS, (float(v) for v in vals))), "vktas": vktas}
+
+    def arrival_increment(self, weight: float, isa_dev: float) -> dict:
+        vals = interp_grid((self.arrival_weights, self.isa_devs), self.arrival, (weight, isa_dev))
+        return dict(zip(self.FIELDS, (float(v) for v in vals)))
+
+    def covers_isa(self, isa_devs) -> bool:
+        return all(self.isa_devs[0] - 1e-9 <= float(x) <= self.isa_devs[-1] + 1e-9 for x in isa_devs)
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {**self.meta, "aircraft": self.aircraft, "mod": self.mod, "flap": self.flap}
+        np.savez_compressed(
+            path,
+            isa_devs=self.isa_devs,
+            departure_weights=self.departure_weights,
+            departure=self.departure,
+            departure_vktas=self.departure_vktas,
+            arrival_weights=self.arrival_weights,
+            arrival=self.arrival,
+            meta=np.array(json.dumps(meta)),
+        )
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            return cls(
+                meta["aircraft"], meta["mod"], meta["flap"], data["isa_devs"],
+                data["departure_weights"], data["departure"], data["departure_vktas"],
+                data["arrival_weights"], data["arrival"], meta=meta,
+            )
+
+
+class ClimbTable:
+    """
+    Brake-release to top-of-climb increments (segments 0-5) for one
+    (aircraft, mod, flap), tabulated against takeoff weight, ISA deviation
+    and target cruise altitude.
+
+    Each entry holds the time, still-air distance and fuel to the first
+    level-off, the level-off altitude actually reached (below the target
+    when the aircraft runs out of climb performance) and the VKTAS there.
+    """
+
+    FIELDS = ("time_s", "dist_nm", "fuel_lb", "level_off_ft", "vktas")
+
+    def __init__(self, aircraft, mod, flap, weights, isa_devs, target_alts, values, meta=None):
+        self.aircraft = aircraft
+        self.mod = mod
+        self.flap = int(flap)
+        self.weights = np.asarray(weights, dtype=float)
+        self.isa_devs = np.asarray(isa_devs, dtype=float)
+        self.target_alts = np.asarray(target_alts, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        self.meta = dict(meta or {})
+
+    @property
+    def elevation_ft(self) -> float:
+        return float(self.meta.get("elevation_ft", 0.0))
+
+    def top_of_climb(self, weight: float, isa_dev: float, target_alt: float) -> dict:
+        vals = interp_grid((self.weights, self.isa_devs, self.target_alts), self.values, (weight, isa_dev, target_alt))
+        out = dict(zip(self.FIELDS, (float(v) for v in vals)))
+        out["level_off_ft"] = min(out["level_off_ft"], float(target_alt))
+        return out
+
+    def covers(self, isa_devs, target_alts) -> bool:
+        isa_ok = all(self.isa_devs[0] - 1e-9 <= float(x) <= self.isa_devs[-1] + 1e-9 for x in isa_devs)
+        alt_ok = all(self.target_alts[0] - 1e-9 <= float(a) <= self.target_alts[-1] + 1e-9 for a in target_alts)
+        return isa_ok and alt_ok
+
+    def to_frame(self):
+        """Long-form table, one row per (weight, ISA, target altitude)."""
+        import pandas as pd
+
+        rows = []
+        for i, w in enumerate(self.weights):
+            for j, isa in enumerate(self.isa_devs):
+                for k, alt in enumerate(self.target_alts):
+                    rows.append({
+                        "aircraft": self.aircraft, "mod": self.mod, "flap": self.flap,
+                        "takeoff_weight_lb": w, "isa_dev": isa, "target_alt_ft": alt,
+                        **dict(zip(self.FIELDS, self.values[i, j, k])),
+                    })
+        return pd.DataFrame(rows)
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {**self.meta, "aircraft": self.aircraft, "mod": self.mod, "flap": self.flap}
+        np.savez_compressed(
+            path,
+            weights=self.weights,
+            isa_devs=self.isa_devs,
+            target_alts=self.target_alts,
+            values=self.values,
+            meta=np.array(json.dumps(meta)),
+        )
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            return cls(
+                meta["aircraft"], meta["mod"], meta["flap"], data["weights"], data["isa_devs"],
+                data["target_alts"], data["values"], meta=meta,
+            )
@@ -0,0 +1,774 @@
+"""
+Performance Module
+
+This module contains vectorized point-performance models that mirror the
+time-stepped physics of run_simulation: cruise specific range evaluated on
+dense (weight x altitude x speed x ISA) grids, cruise integration between two
+weights, and a banded descent model. Together with a climb table they give
+whole-mission range estimates for many cases at once.
+"""
+
+import numpy as np
+
+from aircraft_config import AIRCRAFT_CONFIG
+try:
+    from aircraft_config import TURBOPROP_PARAMS
+except ImportError:
+    TURBOPROP_PARAMS = {}
+from flight_physics import (
+    atmos_array,
+    compressibility_correction,
+    drag_calc_array,
+    predict_roc_array,
+    thrust_calc_array,
+    turboprop_thrust_array,
+)
+
+KTS_TO_FPS = 6076.12 / 3600
+V_U_10K = 200  # KIAS flown at or below 10,100 ft, as in run_simulation
+DESCENT_FUEL_PER_KFT_LB = 3.5  # Range-mode descent trigger allowance above reserve
+LRC_SR_FRACTION = 0.99  # Long-range cruise: specific range at 99% of the MRC value
+GOLDEN_RATIO = (np.sqrt(5.0) - 1.0) / 2.0
+
+
+def aircraft_terms(aircraft: str, mod: str) -> dict:
+    """Named aerodynamic, propulsion and weight terms for one (aircraft, mod)."""
+    ac = AIRCRAFT_CONFIG[(aircraft, mod)]
+    s, b, e, h = float(ac[0]), float(ac[1]), float(ac[2]), float(ac[3])
+    a = b ** 2 / s * (1 + 1.9 * h / b)
+    return {
+        "s": s,
+        "k": 1 / (3.14159 * e * a),
+        "sfc": float(ac[5]),
+        "engines": float(ac[6]),
+        "thrust_mult": float(ac[7]),
+        "ceiling": float(ac[8]),
+        "cdo": float(ac[11]),
+        "dcdo_flap1": float(ac[12]),
+        "dcdo_flap2": float(ac[13]),
+        "dcdo_gear": float(ac[15]),
+        "bow": float(ac[18]),
+        "mzfw": float(ac[19]),
+        "mrw": float(ac[20]),
+        "mtow": float(ac[21]),
+        "max_fuel": float(ac[22]),
+        "mmo": float(ac[25]),
+        "clmax_1": float(ac[28]),
+        "clmax_2": float(ac[29]),
+        "m_climb": float(ac[30]),
+        "v_climb": float(ac[31]),
+        "roc_min": float(ac[32]),
+        "m_descent": float(ac[33]),
+        "v_descent": (float(ac[34]) if ac[34] is not None else None),
+        "turboprop": TURBOPROP_PARAMS.get(aircraft),
+    }
+
+
+def _prop_rpm(turboprop: dict, segment: int) -> float:
+    rpm_sched = turboprop.get('rpm_by_segment') or {}
+    return rpm_sched.get(segment, turboprop.get('prop_rpm', 1900.0))
+
+
+def target_vktas(speed_goal, sigma, delta, c):
+    """
+    True airspeed for a speed goal, using the physics() convention that goals
+    below 1 are Mach numbers and goals of 1 or more are KIAS.
+    """
+    speed_goal = np.asarray(speed_goal, dtype=float)
+    vktas_mach = speed_goal * c
+    m = speed_goal / np.sqrt(sigma) / c
+    for _ in range(4):
+        vktas_ias = speed_goal / compressibility_correction(m, delta) / np.sqrt(sigma)
+        m = vktas_ias / c
+    return np.where(speed_goal < 1, vktas_mach, vktas_ias)
+
+
+def _available_thrust(terms, vktas, sigma, d_alt, c, segment):
+    """Full-throttle thrust and (turboprops) available shaft power."""
+    tp = terms["turboprop"]
+    if tp is None:
+        thrust = thrust_calc_array(d_alt, vktas / c, terms["thrust_mult"], terms["engines"], 1.0)
+        return thrust, None
+    return turboprop_thrust_array(vktas * KTS_TO_FPS, sigma, terms["engines"], 1.0, tp,
+                                  prop_rpm=_prop_rpm(tp, segment))
+
+
+def _airborne_drag(terms, weight, vktas, sigma, c, dcdo=0.0, compressibility=True):
+    vkeas = vktas * np.sqrt(sigma)
+    q = vkeas ** 2 / 295
+    cl = np.minimum(np.asarray(weight, dtype=float) / np.maximum(q * terms["s"], 1e-9), 2.0)
+    drag, _ = drag_calc_array(terms["cdo"], vktas / c, terms["k"], cl, q, terms["s"], dcdo, compressibility)
+    return drag
+
+
+def _thrust_limited_vktas(terms, weight, vt, sigma, d_alt, c, segment=7, v_floor=None):
+    """
+    Level-flight VKTAS capped at vt: where full thrust cannot reach vt, bisect
+    down to the speed where thrust = drag (front side of the drag curve).
+
+    Returns:
+        tuple: (vktas, speed_limited). Where even the floor (v_floor, default
+        0.3 x vt) cannot be held, vktas is left at that floor.
+    """
+    def excess(v):
+        return _available_thrust(terms, v, sigma, d_alt, c, segment)[0] - _airborne_drag(terms, weight, v, sigma, c)
+
+    speed_limited = excess(vt) < 0
+    vktas = vt
+    if speed_limited.any():
+        lo = 0.3 * vt if v_floor is None else np.minimum(v_floor, vt)
+        hi = vt.copy()
+        for _ in range(40):
+            mid = 0.5 * (lo + hi)
+            ok = excess(mid) >= 0
+            lo = np.where(ok, mid, lo)
+            hi = np.where(ok, hi, mid)
+        vktas = np.where(speed_limited, lo, vt)
+    return vktas, speed_limited
+
+
+def _cruise_fuel_flow(terms, drag, sigma):
+    """Cruise fuel flow (lb/hr): drag x SFC for jets, rated power x sigma^alpha x SSFC for turboprops."""
+    tp = terms["turboprop"]
+    if tp is not None and 'SSFC_lb_per_shp_hr' in tp:
+        p_avail = float(tp.get('P_rated_shp', 0.0)) * terms["engines"] * sigma ** float(tp.get('alpha_lapse', 0.6))
+        return p_avail * float(tp['SSFC_lb_per_shp_hr'])
+    return drag * terms["sfc"]
+
+
+def cruise_point(terms: dict, weight, alt, isa_dev, speed_goal) -> dict:
+    """
+    Steady level-flight state at a cruise speed goal (Mach < 1, else KIAS).
+
+    Where thrust cannot reach the goal the aircraft settles at the speed where
+    full thrust equals drag, as the time-stepped model does. Fuel flow is
+    drag x SFC for jets and rated power x sigma^alpha x SSFC for turboprops.
+
+    Returns:
+        dict: Arrays broadcast over the inputs: vktas, vkias, mach, drag,
+        fuel_flow (lb/hr), sr (NM/lb) and speed_limited.
+    """
+    weight, alt, isa_dev, speed_goal = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (weight, alt, isa_dev, speed_goal))
+    )
+    d_alt, _, sigma, delta, _, c = atmos_array(alt, isa_dev)
+    goal = np.where(alt <= 10100, V_U_10K, speed_goal)
+    vt = target_vktas(goal, sigma, delta, c)
+    vktas, speed_limited = _thrust_limited_vktas(terms, weight, vt, sigma, d_alt, c)
+
+    drag = _airborne_drag(terms, weight, vktas, sigma, c)
+    fuel_flow = np.broadcast_to(_cruise_fuel_flow(terms, drag, sigma), vktas.shape)
+    mach = vktas / c
+    vkias = vktas * np.sqrt(sigma) * compressibility_correction(mach, delta)
+    return {
+        "vktas": vktas,
+        "vkias": vkias,
+        "mach": mach,
+        "drag": drag,
+        "fuel_flow": fuel_flow,
+        "sr": vktas / np.maximum(fuel_flow, 1e-9),
+        "speed_limited": speed_limited,
+    }
+
+
+def specific_range_grid(aircraft: str, mod: str, weights, alts, speeds, isa_devs) -> dict:
+    """
+    Specific range on a dense (weight x altitude x speed x ISA) grid.
+
+    Returns:
+        dict: The four axes plus every cruise_point() field shaped
+        (len(weights), len(alts), len(speeds), len(isa_devs)).
+    """
+    axes = {
+        "weights": np.asarray(weights, dtype=float),
+        "alts": np.asarray(alts, dtype=float),
+        "speeds": np.asarray(speeds, dtype=float),
+        "isa_devs": np.asarray(isa_devs, dtype=float),
+    }
+    W, A, S, I = np.meshgrid(axes["weights"], axes["alts"], axes["speeds"], axes["isa_devs"], indexing="ij")
+    return {**axes, **cruise_point(aircraft_terms(aircraft, mod), W, A, I, S)}
+
+
+def integrate_cruise(terms: dict, w_start, w_end, alt, isa_dev, speed_goal, n_steps: int = 32) -> dict:
+    """
+    Cruise distance and time from w_start down to w_end (arrays, one per case)
+    by trapezoidal integration of dW x SR and dW / fuel flow.
+    """
+    w_start = np.asarray(w_start, dtype=float)
+    w_end = np.minimum(np.asarray(w_end, dtype=float), w_start)
+    frac = np.linspace(0.0, 1.0, n_steps + 1)
+    W = w_start[:, None] + (w_end - w_start)[:, None] * frac
+    pt = cruise_point(terms, W, np.asarray(alt, dtype=float)[:, None],
+                      np.asarray(isa_dev, dtype=float)[:, None], np.asarray(speed_goal, dtype=float)[:, None])
+    dw = W[:, :-1] - W[:, 1:]
+    dist_nm = np.sum(0.5 * (pt["sr"][:, 1:] + pt["sr"][:, :-1]) * dw, axis=1)
+    inv_ff = 1.0 / np.maximum(pt["fuel_flow"], 1e-9)
+    time_s = np.sum(0.5 * (inv_ff[:, 1:] + inv_ff[:, :-1]) * dw, axis=1) * 3600
+    return {
+        "dist_nm": dist_nm,
+        "time_s": time_s,
+        "fuel_lb": w_start - w_end,
+        "vktas": pt["vktas"].max(axis=1),
+        "vkias": np.median(pt["vkias"], axis=1),
+        "mach": pt["mach"].max(axis=1),
+        "speed_limited": pt["speed_limited"].any(axis=1),
+    }
+
+
+def descent_to_reserve(terms: dict, w_start, alt_start, fob_start, reserve_fuel, isa_dev,
+                       alt_land: float = 0.0, n_bands: int = 60) -> dict:
+    """
+    Banded descent from cruise to the runway following the run_simulation
+    schedule (M_descent/V_descent at 2000 fpm, 200 KIAS at 1500 fpm below
+    10,000 ft, VAPP then VREF at 700 fpm below 3000/1000 ft AGL).
+
+    Returns:
+        dict: Arrays of dist_to_reserve_nm (distance flown before fuel on board
+        reaches the reserve, or the whole descent if it never does), dist_nm,
+        time_s and fuel_lb for the complete descent.
+    """
+    w = np.asarray(w_start, dtype=float).copy()
+    alt_start = np.asarray(alt_start, dtype=float)
+    isa_dev = np.broadcast_to(np.asarray(isa_dev, dtype=float), w.shape)
+    fuel_to_reserve = np.asarray(fob_start, dtype=float) - np.asarray(reserve_fuel, dtype=float)
+    dh = np.maximum(alt_start - alt_land, 0.0) / n_bands
+    dist = np.zeros_like(w)
+    time_s = np.zeros_like(w)
+    fuel = np.zeros_like(w)
+    dist_res = np.full_like(w, np.nan)
+    dist_res[fuel_to_reserve <= 0] = 0.0
+    tp = terms["turboprop"]
+
+    for i in range(n_bands):
+        h = alt_start - (i + 0.5) * dh
+        agl = h - alt_land
+        d_alt, _, sigma, delta, _, c = atmos_array(h, isa_dev)
+        seg = np.where(h >= 10000, 8, np.where(agl > 3000, 10, np.where(agl > 1000, 11, 12)))
+        rod_fpm = np.where(seg == 8, 2000.0, np.where(seg == 10, 1500.0, 700.0))
+
+        vktas_hi = terms["m_descent"] * c
+        if terms["v_descent"] is not None:
+            vktas_hi = np.minimum(vktas_hi, target_vktas(terms["v_descent"], sigma, delta, c))
+        # VAPP/VREF from vspeeds() with the clmax Mach factor evaluated near approach speed
+        m_app = target_vktas(140.0, sigma, delta, c) / c
+        clmax_factor = (7.432 * m_app ** 6 - 12.59 * m_app ** 5 + 5.0847 * m_app ** 4 + 0.7356 * m_app ** 3
+                        - 0.9942 * m_app ** 2 + 0.1147 * m_app + 0.9994)
+        correction = 1 + (0.01 * (w / 1000 - 100) / 10)
+        vapp = 20 + 1.3 * np.sqrt(295 * w / (delta * terms["s"] * terms["clmax_1"] * clmax_factor)) * correction
+        vref = 1.3 * np.sqrt(295 * w / (delta * terms["s"] * terms["clmax_2"] * clmax_factor)) * correction
+        ias_goal = np.where(seg == 10, V_U_10K, np.where(seg == 11, vapp, vref))
+        vktas = np.where(seg == 8, vktas_hi, target_vktas(ias_goal, sigma, delta, c))
+
+        dcdo = np.where(seg == 11, terms["dcdo_flap1"], np.where(seg == 12, terms["dcdo_flap2"] + terms["dcdo_gear"], 0.0))
+        drag_clean = _airborne_drag(terms, w, vktas, sigma, c)
+        drag_cfg = _airborne_drag(terms, w, vktas, sigma, c, dcdo=dcdo, compressibility=False)
+        drag = np.where(seg >= 11, drag_cfg, drag_clean)
+
+        v_fps = np.maximum(vktas * KTS_TO_FPS, 1e-6)
+        gamma = -(rod_fpm / 60) / v_fps
+        thrust_avail, p_avail = _available_thrust(terms, vktas, sigma, d_alt, c, 8)
+        if tp is not None:
+            thrust_app, _ = _available_thrust(terms, vktas, sigma, d_alt, c, 11)
+            thrust_avail = np.where(seg >= 11, thrust_app, thrust_avail)
+        thrust = np.where(thrust_avail > drag, np.maximum(100.0, w * np.sin(gamma) + drag), thrust_avail)
+        if tp is not None and 'SSFC_lb_per_shp_hr' in tp:
+            util = np.clip(drag / np.maximum(thrust, 1e-9), 0.0, 1.0)
+            ff = p_avail * util * float(tp['SSFC_lb_per_shp_hr'])
+        else:
+            ff = thrust * terms["sfc"]
+
+        dt = dh / (rod_fpm / 60)
+        d_dist = vktas * dt / 3600
+        d_fuel = ff * dt / 3600
+        remaining = fuel_to_reserve - fuel
+        crossing = np.isnan(dist_res) & (d_fuel >= remaining)
+        dist_res = np.where(crossing, dist + d_dist * np.clip(remaining / np.maximum(d_fuel, 1e-9), 0.0, 1.0), dist_res)
+        dist += d_dist
+        time_s += dt
+        fuel += d_fuel
+        w = w - d_fuel
+
+    dist_res = np.where(np.isnan(dist_res), dist, dist_res)
+    return {"dist_to_reserve_nm": dist_res, "dist_nm": dist, "time_s": time_s, "fuel_lb": fuel}
+
+
+def fast_mission(aircraft: str, mod: str, climb_table, payload, initial_fuel, taxi_fuel, reserve_fuel,
+                 cruise_alt, isa_dev, speed_goal) -> dict:
+    """
+    Range-mode mission estimate for arrays of cases of one (aircraft, mod, flap).
+
+    Climb comes from climb_table (a perf_tables.ClimbTable), cruise from the
+    specific-range integral between top-of-climb weight and the range-mode
+    descent trigger weight, and the descent from descent_to_reserve().
+
+    Returns:
+        dict: Arrays of total_dist_nm (fuel-limited at reserve), total_time_min,
+        first_level_off_ft, cruise_vktas_kts, cruise_vkias_kts, achieved_mach
+        and speed_limited.
+    """
+    terms = aircraft_terms(aircraft, mod)
+    payload, initial_fuel, taxi_fuel, reserve_fuel, cruise_alt, isa_dev, speed_goal = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (payload, initial_fuel, taxi_fuel, reserve_fuel, cruise_alt, isa_dev, speed_goal))
+    )
+    zfw = terms["bow"] + payload
+    tow = zfw + initial_fuel - taxi_fuel
+
+    toc = [climb_table.top_of_climb(w, i, a) for w, i, a in zip(tow, isa_dev, np.minimum(cruise_alt, terms["ceiling"]))]
+    climb_time = np.array([x["time_s"] for x in toc])
+    climb_dist = np.array([x["dist_nm"] for x in toc])
+    climb_fuel = np.array([x["fuel_lb"] for x in toc])
+    level_off = np.array([x["level_off_ft"] for x in toc])
+
+    w_toc = tow - climb_fuel
+    w_tod = np.minimum(w_toc, zfw + reserve_fuel + level_off / 1000.0 * DESCENT_FUEL_PER_KFT_LB)
+    cruise = integrate_cruise(terms, w_toc, w_tod, level_off, isa_dev, speed_goal)
+    descent = descent_to_reserve(terms, w_tod, level_off, w_tod - zfw, reserve_fuel, isa_dev)
+
+    total_time_s = climb_time + cruise["time_s"] + descent["time_s"]
+    return {
+        "total_dist_nm": climb_dist + cruise["dist_nm"] + descent["dist_to_reserve_nm"],
+        "total_time_min": np.floor(total_time_s / 60),
+        "first_level_off_ft": np.round(level_off),
+        "cruise_vktas_kts": cruise["vktas"],
+        "cruise_vkias_kts": cruise["vkias"],
+        "achieved_mach": cruise["mach"],
+        "speed_limited": cruise["speed_limited"],
+    }
+
+
+def _climb_roc(terms: dict, weight, alt, isa_dev):
+    """
+    Rate of climb (fpm) on the climb speed schedule as the level-off logic sees it.
+
+    Jets use predict_roc directly. Turboprops also level off when the actual
+    full-power climb rate drops below roc_min, so the lower of the two is used.
+    """
+    d_alt, _, sigma, delta, _, c = atmos_array(alt, isa_dev)
+    m_at_v_climb = target_vktas(terms["v_climb"], sigma, delta, c) / c
+    climb_goal = np.where(m_at_v_climb >= terms["m_climb"], terms["m_climb"], terms["v_climb"])
+    m = np.minimum(m_at_v_climb, terms["m_climb"])
+    roc = predict_roc_array(alt, weight, m, terms["thrust_mult"], terms["engines"], 1.0,
+                            terms["cdo"], terms["k"], terms["s"], isa_dev, climb_goal)
+    if terms["turboprop"] is not None:
+        vktas = m * c
+        thrust, _ = _available_thrust(terms, vktas, sigma, d_alt, c, 4)
+        drag = _airborne_drag(terms, weight, vktas, sigma, c)
+        roc = np.minimum(roc, (thrust - drag) * vktas * KTS_TO_FPS / weight * 60)
+    return roc
+
+
+def screen_cases(aircraft: str, mod: str, tow, zfw, reserve_fuel, cruise_alt, isa_dev, speed_goal,
+                 roc_margin: float = 0.15, climb_fuel_frac: float = 0.05, mach_margin: float = 0.005) -> dict:
+    """
+    Vectorized feasibility pre-screen of batch cases before any simulation.
+
+    Altitude: the climb rate at the target altitude on the climb speed schedule is
+    compared with roc_min, at takeoff weight (heaviest possible top of climb) and
+    at takeoff weight less climb_fuel_frac 500 ft lower (lightest plausible).
+    Speed: the thrust = drag maximum level speed is compared with the Mach goal at
+    takeoff weight and at the end-of-cruise weight (zero fuel + reserve), since
+    run_simulation reports the best Mach reached anywhere in cruise.
+
+    Each check is "feasible" when even the unfavourable weight clears the limit,
+    "infeasible" when even the favourable weight fails it by the margin, and
+    "marginal" otherwise. IAS speed goals are not Mach-screened, and a Mach shortfall
+    is only called infeasible when the altitude is reachable (a lower level-off
+    may still make the speed).
+
+    Returns:
+        dict: Arrays of predicted_roc_fpm, predicted_max_mach, altitude_class,
+        mach_class and prescreen_class (the worse of the two).
+    """
+    terms = aircraft_terms(aircraft, mod)
+    tow, zfw, reserve_fuel, cruise_alt, isa_dev, speed_goal = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (tow, zfw, reserve_fuel, cruise_alt, isa_dev, speed_goal))
+    )
+    alt = np.minimum(cruise_alt, terms["ceiling"])
+    w_light = tow * (1.0 - climb_fuel_frac)
+    roc_heavy = _climb_roc(terms, tow, alt, isa_dev)
+    roc_light = _climb_roc(terms, w_light, np.maximum(alt - 500, 0.0), isa_dev)
+    roc_min = terms["roc_min"]
+    altitude_class = np.where(
+        roc_light < roc_min * (1 - roc_margin), "infeasible",
+        np.where(roc_heavy > roc_min * (1 + roc_margin), "feasible", "marginal"),
+    )
+
+    w_end = zfw + reserve_fuel
+    mach_heavy = cruise_point(terms, tow, alt, isa_dev, speed_goal)["mach"]
+    max_mach_light = cruise_point(terms, w_end, alt, isa_dev, np.full_like(alt, 0.99))["mach"]
+    is_mach_goal = speed_goal < 1
+    mach_class = np.where(
+        ~is_mach_goal | (mach_heavy + 1e-3 >= speed_goal), "feasible",
+        np.where((max_mach_light + mach_margin < speed_goal) & (altitude_class == "feasible"), "infeasible", "marginal"),
+    )
+
+    prescreen_class = np.where(
+        (altitude_class == "infeasible") | (mach_class == "infeasible"), "infeasible",
+        np.where((altitude_class == "marginal") | (mach_class == "marginal"), "marginal", "feasible"),
+    )
+    return {
+        "predicted_roc_fpm": roc_heavy,
+        "predicted_max_mach": max_mach_light,
+        "altitude_class": altitude_class,
+        "mach_class": mach_class,
+        "prescreen_class": prescreen_class,
+    }
+
+
+def ceiling_altitude(terms: dict, weight, isa_dev, n_iter: int = 30):
+    """
+    Highest pressure altitude where the climb-schedule rate of climb still
+    reaches roc_min, capped at the certified ceiling.
+
+    Returns:
+        numpy.ndarray: Ceiling (ft) broadcast over weight and isa_dev; NaN where
+        roc_min cannot be reached even at sea level.
+    """
+    weight, isa_dev = np.broadcast_arrays(np.asarray(weight, dtype=float), np.asarray(isa_dev, dtype=float))
+    roc_min = terms["roc_min"]
+    lo = np.zeros(weight.shape)
+    hi = np.full(weight.shape, terms["ceiling"])
+    top_ok = _climb_roc(terms, weight, hi, isa_dev) >= roc_min
+    for _ in range(n_iter):
+        mid = 0.5 * (lo + hi)
+        ok = _climb_roc(terms, weight, mid, isa_dev) >= roc_min
+        lo = np.where(ok, mid, lo)
+        hi = np.where(ok, hi, mid)
+    alt = np.where(top_ok, terms["ceiling"], lo)
+    return np.where(_climb_roc(terms, weight, np.zeros(weight.shape), isa_dev) >= roc_min, alt, np.nan)
+
+
+def max_level_mach(terms: dict, weight, alt, isa_dev) -> dict:
+    """
+    Maximum level-flight Mach (thrust = drag at full power), capped at mmo.
+
+    Unlike cruise_point, no 200 KIAS restriction is applied below 10,000 ft.
+
+    Returns:
+        dict: Arrays of mach (NaN where level flight cannot be held), vktas,
+        vkias and mmo_limited (True where mmo, not thrust, sets the limit).
+    """
+    weight, alt, isa_dev = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (weight, alt, isa_dev)))
+    d_alt, _, sigma, delta, _, c = atmos_array(alt, isa_dev)
+    vt = terms["mmo"] * c
+    # Search no slower than the minimum-drag speed, so the solution stays on the front side
+    cl_md = np.sqrt(terms["cdo"] / terms["k"])
+    v_md = np.sqrt(295 * weight / (terms["s"] * cl_md)) / np.sqrt(sigma)
+    vktas, thrust_limited = _thrust_limited_vktas(terms, weight, vt, sigma, d_alt, c, v_floor=v_md)
+    v_md = np.minimum(v_md, vt)
+    no_level_flight = _available_thrust(terms, v_md, sigma, d_alt, c, 7)[0] < _airborne_drag(terms, weight, v_md, sigma, c)
+    vktas = np.where(no_level_flight, np.nan, vktas)
+    mach = vktas / c
+    return {
+        "mach": mach,
+        "vktas": vktas,
+        "vkias": vktas * np.sqrt(sigma) * compressibility_correction(mach, delta),
+        "mmo_limited": ~thrust_limited,
+    }
+
+
+def envelope_tables(aircraft: str, mod: str, weights, isa_devs, alts) -> dict:
+    """
+    Ceiling versus (weight, ISA) and maximum level Mach versus (weight, altitude, ISA).
+
+    Returns:
+        dict: The axes plus ceiling_ft shaped (len(weights), len(isa_devs)) and
+        max_mach, max_vktas, max_vkias and mmo_limited shaped
+        (len(weights), len(alts), len(isa_devs)).
+    """
+    terms = aircraft_terms(aircraft, mod)
+    axes = {
+        "weights": np.asarray(weights, dtype=float),
+        "isa_devs": np.asarray(isa_devs, dtype=float),
+        "alts": np.asarray(alts, dtype=float),
+    }
+    W2, I2 = np.meshgrid(axes["weights"], axes["isa_devs"], indexing="ij")
+    W3, A3, I3 = np.meshgrid(axes["weights"], axes["alts"], axes["isa_devs"], indexing="ij")
+    speed = max_level_mach(terms, W3, A3, I3)
+    return {
+        **axes,
+        "ceiling_ft": ceiling_altitude(terms, W2, I2),
+        "max_mach": speed["mach"],
+        "max_vktas": speed["vktas"],
+        "max_vkias": speed["vkias"],
+        "mmo_limited": speed["mmo_limited"],
+    }
+
+
+def optimal_cruise_speed(terms: dict, weight, alt, isa_dev, lrc_fraction: float = LRC_SR_FRACTION,
+                         n_iter: int = 40) -> dict:
+    """
+    Maximum-range (MRC) and long-range (LRC) cruise speeds in level flight.
+
+    MRC maximizes specific range by golden-section search between the
+    minimum-drag speed and the maximum level speed (thrust or mmo limited).
+    LRC is the faster speed at which specific range has fallen to
+    lrc_fraction x the MRC value, or the maximum level speed if it never does.
+    Like max_level_mach, no 200 KIAS restriction is applied below 10,000 ft.
+
+    Returns:
+        dict: Arrays of mrc_mach, mrc_vktas, mrc_vkias, mrc_sr (NM/lb) and the
+        same lrc_* fields, NaN where level flight cannot be held.
+    """
+    weight, alt, isa_dev = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (weight, alt, isa_dev)))
+    d_alt, _, sigma, delta, _, c = atmos_array(alt, isa_dev)
+
+    def sr(v):
+        return v / np.maximum(_cruise_fuel_flow(terms, _airborne_drag(terms, weight, v, sigma, c), sigma), 1e-9)
+
+    v_max = max_level_mach(terms, weight, alt, isa_dev)["vktas"]
+    cl_md = np.sqrt(terms["cdo"] / terms["k"])
+    v_md = np.sqrt(295 * weight / (terms["s"] * cl_md)) / np.sqrt(sigma)
+    with np.errstate(invalid="ignore"):
+        lo, hi = np.minimum(v_md, v_max), v_max
+        for _ in range(n_iter):
+            x1 = hi - GOLDEN_RATIO * (hi - lo)
+            x2 = lo + GOLDEN_RATIO * (hi - lo)
+            right = sr(x1) < sr(x2)
+            lo = np.where(right, x1, lo)
+            hi = np.where(right, hi, x2)
+        v_mrc = 0.5 * (lo + hi)
+        sr_mrc = sr(v_mrc)
+
+        target = lrc_fraction * sr_mrc
+        lo, hi = v_mrc, v_max
+        for _ in range(n_iter):
+            mid = 0.5 * (lo + hi)
+            ok = sr(mid) >= target
+            lo = np.where(ok, mid, lo)
+            hi = np.where(ok, hi, mid)
+        v_lrc = np.where(sr(v_max) >= target, v_max, lo)
+
+    out = {}
+    for name, v in (("mrc", v_mrc), ("lrc", v_lrc)):
+        mach = v / c
+        out[f"{name}_mach"] = mach
+        out[f"{name}_vktas"] = v
+        out[f"{name}_vkias"] = v * np.sqrt(sigma) * compressibility_correction(mach, delta)
+        out[f"{name}_sr"] = sr(v)
+    return out
+
+
+def cruise_speed_tables(aircraft: str, mod: str, weights, alts, isa_devs, lrc_fraction: float = LRC_SR_FRACTION) -> dict:
+    """
+    optimal_cruise_speed() on a (weight x altitude x ISA) grid.
+
+    Returns:
+        dict: The axes plus every optimal_cruise_speed() field shaped
+        (len(weights), len(alts), len(isa_devs)).
+    """
+    axes = {
+        "weights": np.asarray(weights, dtype=float),
+        "alts": np.asarray(alts, dtype=float),
+        "isa_devs": np.asarray(isa_devs, dtype=float),
+    }
+    W, A, I = np.meshgrid(axes["weights"], axes["alts"], axes["isa_devs"], indexing="ij")
+    return {**axes, **optimal_cruise_speed(aircraft_terms(aircraft, mod), W, A, I, lrc_fraction)}
+
+
+def excess_power_grid(aircraft: str, mod: str, machs, alts, weights, isa_dev: float = 0.0) -> dict:
+    """
+    Specific excess power and climb gradient at full climb power on a dense
+    (Mach x altitude x weight) grid, clean configuration.
+
+    Ps = (T - D) x V / W, the steady climb rate physics() flies, and the
+    gradient is tan(asin((T - D) / W)) as run_simulation reports it.
+    Turboprops use the propeller power model at the climb RPM.
+
+    Returns:
+        dict: The three axes plus ps_fpm, gradient_pct, thrust, drag, cl,
+        vktas and vkias shaped (len(machs), len(alts), len(weights)).
+    """
+    terms = aircraft_terms(aircraft, mod)
+    axes = {
+        "machs": np.asarray(machs, dtype=float),
+        "alts": np.asarray(alts, dtype=float),
+        "weights": np.asarray(weights, dtype=float),
+    }
+    M, A, W = np.meshgrid(axes["machs"], axes["alts"], axes["weights"], indexing="ij")
+    d_alt, _, sigma, delta, _, c = atmos_array(A, np.full(A.shape, float(isa_dev)))
+    vktas = M * c
+    thrust, _ = _available_thrust(terms, vktas, sigma, d_alt, c, 4)
+    drag = _airborne_drag(terms, W, vktas, sigma, c)
+    excess = (thrust - drag) / W
+    q = (vktas * np.sqrt(sigma)) ** 2 / 295
+    return {
+        **axes,
+        "ps_fpm": excess * vktas * KTS_TO_FPS * 60,
+        "gradient_pct": np.tan(np.arcsin(np.clip(excess, -1.0, 1.0))) * 100,
+        "thrust": thrust,
+        "drag": drag,
+        "cl": W / np.maximum(q * terms["s"], 1e-9),
+        "vktas": vktas,
+        "vkias": vktas * np.sqrt(sigma) * compressibility_correction(M, delta),
+    }
+
+
+def climb_schedule_mach(terms: dict, alts, isa_dev: float = 0.0):
+    """Mach flown on the v_climb / m_climb schedule at each altitude."""
+    alts = np.asarray(alts, dtype=float)
+    _, _, sigma, delta, _, c = atmos_array(alts, np.asarray(isa_dev, dtype=float) + np.zeros(alts.shape))
+    return np.minimum(target_vktas(terms["v_climb"], sigma, delta, c) / c, terms["m_climb"])
+
+
+def _climb_increment(terms: dict, weight, alt_lo, alt_hi, isa_dev, n_bands: int = 4) -> dict:
+    """
+    Time, fuel and still-air distance to climb from alt_lo to alt_hi on the climb
+    speed schedule at full climb power, integrated over n_bands altitude bands.
+
+    Returns:
+        dict: time_s, fuel_lb and dist_nm arrays (zero where alt_hi <= alt_lo,
+        inf where the aircraft cannot climb).
+    """
+    weight, alt_lo, alt_hi, isa_dev = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (weight, alt_lo, alt_hi, isa_dev))
+    )
+    dh = np.maximum(alt_hi - alt_lo, 0.0) / n_bands
+    time_s = np.zeros(weight.shape)
+    fuel = np.zeros(weight.shape)
+    dist = np.zeros(weight.shape)
+    w = weight.copy()
+    tp = terms["turboprop"]
+    for n in range(n_bands):
+        alt = alt_lo + (n + 0.5) * dh
+        d_alt, _, sigma, _, _, c = atmos_array(alt, isa_dev)
+        vktas = climb_schedule_mach(terms, alt, isa_dev) * c
+        thrust, p_avail = _available_thrust(terms, vktas, sigma, d_alt, c, 5)
+        drag = _airborne_drag(terms, w, vktas, sigma, c)
+        roc_fps = np.clip((thrust - drag) / w, 0.0, 1.0) * vktas * KTS_TO_FPS
+        dt = np.where(dh > 0, dh / np.maximum(roc_fps, 1e-9), 0.0)
+        if tp is not None and 'SSFC_lb_per_shp_hr' in tp:
+            fuel_flow = p_avail * float(tp['SSFC_lb_per_shp_hr'])
+        else:
+            fuel_flow = thrust * terms["sfc"]
+        df = fuel_flow * dt / 3600
+        time_s += dt
+        fuel += df
+        dist += vktas * dt / 3600
+        w = w - df
+    blocked = (dh > 0) & ~np.isfinite(time_s)
+    return {
+        "time_s": np.where(blocked, np.inf, time_s),
+        "fuel_lb": np.where(blocked, np.inf, fuel),
+        "dist_nm": np.where(blocked, np.inf, dist),
+    }
+
+
+def optimize_step_climb(aircraft: str, mod: str, w_toc: float, cruise_dist_nm: float, alt_start: float,
+                        isa_dev: float, speed_goal: float, alts=None, objective: str = "fuel",
+                        stage_nm: float = 25.0) -> dict:
+    """
+    Fuel- or time-optimal step-climb schedule by dynamic programming.
+
+    The cruise from top of climb (weight w_toc, altitude alt_start) over
+    cruise_dist_nm is split into distance stages; the state is the cruise
+    altitude and each path carries its weight. Between stages the aircraft may
+    hold altitude or step up to any higher lattice altitude where the climb rate
+    still reaches roc_min, paying the climb time and fuel from _climb_increment
+    before cruising the rest of the stage at cruise_point() specific range.
+    Because burning less fuel never makes the remaining cruise cheaper, keeping
+    the best path per altitude is exact for the fuel objective and a close
+    approximation for the time objective.
+
+    Args:
+        alts: Candidate cruise altitudes (default alt_start up to the ceiling in 2,000 ft steps).
+        objective: "fuel" or "time".
+        stage_nm: Stage length (NM); steps can only start at stage boundaries.
+
+    Returns:
+        dict: steps [(dist_from_toc_nm, alt_ft), ...] starting with (0, alt_start),
+        stage_alts, fuel_lb, time_min, end_weight_lb, plus level_fuel_lb and
+        level_time_min for holding alt_start throughout.
+    """
+    if objective not in ("fuel", "time"):
+        raise ValueError(f"Unknown objective '{objective}' (expected 'fuel' or 'time')")
+    terms = aircraft_terms(aircraft, mod)
+    if alts is None:
+        alts = np.arange(float(alt_start), terms["ceiling"] + 1.0, 2000.0)
+    alts = np.unique(np.concatenate([[float(alt_start)], np.asarray(alts, dtype=float)]))
+    alts = alts[(alts >= alt_start) & (alts <= terms["ceiling"])]
+    n_alt = len(alts)
+    n_stages = max(1, int(np.ceil(cruise_dist_nm / stage_nm)))
+    stage_len = np.full(n_stages, float(stage_nm))
+    stage_len[-1] = cruise_dist_nm - stage_nm * (n_stages - 1)
+
+    inf = np.inf
+    fuel = np.full(n_alt, inf)
+    time_s = np.full(n_alt, inf)
+    fuel[0] = time_s[0] = 0.0
+    parent = np.zeros((n_stages, n_alt), dtype=int)
+    upper = np.triu(np.ones((n_alt, n_alt), dtype=bool))  # from i (rows) to j >= i (cols)
+    A_from, A_to = np.meshgrid(alts, alts, indexing="ij")
+    level_fuel = level_time = 0.0
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for n, dd in enumerate(stage_len):
+            w_from = np.broadcast_to((w_toc - fuel)[:, None], (n_alt, n_alt))
+            climb = _climb_increment(terms, w_from, A_from, A_to, isa_dev)
+            can_climb = _climb_roc(terms, w_from, A_to, isa_dev) >= terms["roc_min"]
+            ok = upper & np.isfinite(fuel)[:, None] & (np.eye(n_alt, dtype=bool) | can_climb) & np.isfinite(climb["fuel_lb"])
+            w_top = w_from - np.where(ok, climb["fuel_lb"], 0.0)
+            cruise = cruise_point(terms, w_top, A_to, isa_dev, speed_goal)
+            rest = np.maximum(dd - np.where(ok, climb["dist_nm"], 0.0), 0.0)
+            stage_fuel = np.where(ok, climb["fuel_lb"], 0.0) + rest / cruise["sr"]
+            stage_time = np.where(ok, climb["time_s"], 0.0) + rest / cruise["vktas"] * 3600
+            total_fuel = np.where(ok, fuel[:, None] + stage_fuel, inf)
+            total_time = np.where(ok, time_s[:, None] + stage_time, inf)
+            score = total_fuel if objective == "fuel" else total_time
+            best = np.argmin(score, axis=0)
+            cols = np.arange(n_alt)
+            parent[n] = best
+            fuel = total_fuel[best, cols]
+            time_s = total_time[best, cols]
+            level_fuel += stage_fuel[0, 0]
+            level_time += stage_time[0, 0]
+
+    end = int(np.argmin(fuel if objective == "fuel" else time_s))
+    path = [end]
+    for n in range(n_stages - 1, 0, -1):
+        path.append(int(parent[n][path[-1]]))
+    stage_alts = [float(alts[j]) for j in reversed(path)]
+    steps = [(0.0, float(alt_start))]
+    for n, alt in enumerate(stage_alts):
+        if alt != steps[-1][1]:
+            if steps[-1][0] == stage_nm * n:
+                steps.pop()
+            steps.append((float(stage_nm * n), alt))
+    return {
+        "steps": steps,
+        "stage_alts": stage_alts,
+        "fuel_lb": float(fuel[end]),
+        "time_min": float(time_s[end] / 60),
+        "end_weight_lb": float(w_toc - fuel[end]),
+        "level_fuel_lb": float(level_fuel),
+        "level_time_min": float(level_time / 60),
+    }
+
+
+def range_mode_step_plan(aircraft: str, mod: str, climb_table, payload: float, initial_fuel: float,
+                         taxi_fuel: float, reserve_fuel: float, cruise_alt: float, isa_dev: float,
+                         speed_goal: float, objective: str = "fuel", stage_nm: float = 25.0) -> dict:
+    """
+    optimize_step_climb() for one range-mode case, with the top of climb taken
+    from climb_table and the cruise distance from a level cruise at the first
+    level-off down to the range-mode descent trigger.
+
+    Returns:
+        dict: optimize_step_climb() output plus step_plan, the steps shifted to
+        distance from departure for run_simulation(step_plan=...).
+    """
+    terms = aircraft_terms(aircraft, mod)
+    zfw = terms["bow"] + float(payload)
+    tow = zfw + float(initial_fuel) - float(taxi_fuel)
+    alt_target = min(float(cruise_alt), terms["ceiling"])
+    toc = climb_table.top_of_climb(tow, isa_dev, alt_target)
+    w_toc = tow - toc["fuel_lb"]
+    w_tod = min(w_toc, zfw + reserve_fuel + toc["level_off_ft"] / 1000.0 * DESCENT_FUEL_PER_KFT_LB)
+    cruise = integrate_cruise(terms, [w_toc], [w_tod], [toc["level_off_ft"]], [isa_dev], [speed_goal])
+    res = optimize_step_climb(
+        aircraft, mod, w_toc, float(cruise["dist_nm"][0]), toc["level_off_ft"], isa_dev, speed_goal,
+        alts=np.arange(alt_target, terms["ceiling"] + 1.0, 2000.0), objective=objective, stage_nm=stage_nm,
+    )
+    res["step_plan"] = [(round(toc["dist_nm"] + d, 1), a) for d, a in res["steps"]]
+    res["step_plan"][0] = (0.0, alt_target)
+    return res
@@ -12,8 +12,9 @@ try:
     from aircraft_config import TURBOPROP_PARAMS
 except ImportError:
     TURBOPROP_PARAMS = {}
-from flight_physics import atmos, vspeeds, physics, predict_roc, next_step_altitude
+from flight_physics import atmos, vspeeds, physics, predict_roc, next_step_altitude, ROCCache
 from utils import load_airports
+from performance import aircraft_terms, optimal_cruise_speed
 
 def compute_segment_fuel_remaining(total_initial_fuel, fuel_burn_sequence):
     """
@@ -61,10 +62,177 @@ def reset_output_timestamp():
     global _global_timestamp
     _global_timestamp = None
 
+# Time-history recording policies for run_simulation: segment -> (interval_s, deadbands).
+# A row is kept each time simulated time crosses a multiple of interval_s (0 keeps every
+# integration step) and, with deadbands, as soon as any listed quantity has moved by more
+# than its deadband since the last kept row. Unlisted segments use RECORDING_INTERVAL_S.
+# Both sides of every segment change and of the reserve-fuel crossing, and the final
+# step, are always kept.
+RECORDING_INTERVAL_S = 5.0
+RECORDING_POLICIES = {
+    # Every 5 s of simulated time
+    "fixed": {},
+    # Every step through takeoff/initial climb and approach/landing; cruise rows only
+    # when altitude, speed or climb rate change (else every 5 min)
+    "adaptive": {
+        **{seg: (0.0, None) for seg in (0, 1, 2, 3, 11, 12, 13)},
+        **{seg: (300.0, {"alt": 20.0, "vktas": 1.0, "mach": 0.001, "roc": 100.0}) for seg in (6, 7)},
+    },
+}
+# Values of one recorded step, in order (deadbands refer to these names)
+_HISTORY_FIELDS = ("t", "alt", "dist_nm", "vktas", "vkias", "roc", "thrust", "drag", "segment", "mach",
+                   "gradient", "weight", "induced_drag", "fob")
+
+
+def recording_policy(recording="adaptive"):
+    """
+    Per-segment recording rules for run_simulation.
+
+    Args:
+        recording (str | dict): A RECORDING_POLICIES name, or a dict in the same form
+
+    Returns:
+        dict: segment -> (interval_s, [(field index, deadband), ...]) for segments 0-13
+    """
+    if isinstance(recording, str):
+        if recording not in RECORDING_POLICIES:
+            raise ValueError(f"Unknown recording policy '{recording}' (expected one of {sorted(RECORDING_POLICIES)})")
+        recording = RECORDING_POLICIES[recording]
+    policy = {}
+    for seg in range(14):
+        interval_s, deadbands = recording.get(seg, (RECORDING_INTERVAL_S, None))
+        policy[seg] = (float(interval_s), [(_HISTORY_FIELDS.index(k), float(v)) for k, v in (deadbands or {}).items()])
+    return policy
+
+
+# Output CSV columns in file order, with the decimals they are rounded to
+# (0 = written as integers, None = text passed through)
+OUTPUT_COLUMNS = (
+    ("Time (s)", 0),
+    ("Segment", 0),
+    ("Segment Name", None),
+    ("Altitude (ft)", 0),
+    ("Distance (NM)", 1),
+    ("VKTAS (kts)", 0),
+    ("VKIAS (kts)", 0),
+    ("ROC (fpm)", 0),
+    ("Thrust (lb)", 0),
+    ("Drag (lb)", 0),
+    ("Weight (lb)", 0),
+    ("Fuel Remaining (lb)", 0),
+    ("Fuel Flow (lb/hr)", 0),
+    ("Mach", 3),
+    ("Gradient (%)", 1),
+    ("VAPP (kts)", 1),
+    ("VREF (kts)", 1),
+)
+OUTPUT_INTERVAL_S = 2.0
+# Stepwise columns, taken from the nearest recorded point instead of interpolated
+NEAREST_COLUMNS = ("Segment", "Segment Name")
+
+
+def _nearest_index(src_times, query_times):
+    """Index of the recorded point nearest each query time (ties go to the earlier point)."""
+    idx = np.searchsorted(src_times, query_times, side='left')
+    idx = np.clip(idx, 1, len(src_times) - 1)
+    left = src_times[idx - 1]
+    right = src_times[idx]
+    return np.where(query_times - left <= right - query_times, idx - 1, idx)
+
+
+def _interp_matrix(times, new_time, values):
+    """
+    np.interp of every column of values (one row per recorded time) at new_time,
+    in one pass over the matrix. Same bracketing and arithmetic as np.interp, so
+    the results are identical to interpolating column by column.
+    """
+    j = np.clip(np.searchsorted(times, new_time, side='right') - 1, 0, len(times) - 2)
+    slope = (values[j + 1] - values[j]) / (times[j + 1] - times[j])[:, None]
+    out = slope * (new_time - times[j])[:, None] + values[j]
+    exact = times[j] == new_time
+    out[exact] = values[j][exact]
+    out[new_time < times[0]] = values[0]
+    out[new_time >= times[-1]] = values[-1]
+    return out
+
+
+def resample_output_history(results_df, interval_s=OUTPUT_INTERVAL_S):
+    """
+    The OUTPUT_COLUMNS of a time history on a fixed time grid: numeric columns
+    interpolated together, NEAREST_COLUMNS and columns with fewer than two
+    values taken from the nearest recorded point. Histories without a usable
+    time column are returned as recorded.
+
+    Args:
+        results_df (pd.DataFrame): Simulation results DataFrame
+        interval_s (float): Grid spacing in seconds
+
+    Returns:
+        pd.DataFrame: Resampled columns (unrounded)
+    """
+    time_col = 'Time (s)'
+    names = [col for col, _ in OUTPUT_COLUMNS if col in results_df.columns]
+    if time_col not in results_df.columns:
+        return results_df[names]
+    df_sorted = results_df.sort_values(time_col).reset_index(drop=True)
+    times = pd.to_numeric(df_sorted[time_col], errors='coerce').astype(float).to_numpy()
+    if len(times) < 2 or not np.isfinite(times).all():
+        return results_df[names]
+
+    new_time = np.arange(float(np.floor(times.min())), float(np.ceil(times.max())) + 1e-6, interval_s)
+    nearest = _nearest_index(times, new_time)
+    resampled = {time_col: new_time}
+    numeric = {col: pd.to_numeric(df_sorted[col], errors='coerce').to_numpy(dtype=float)
+               for col in names if col != time_col and col not in NEAREST_COLUMNS}
+    dense = [col for col, vals in numeric.items() if np.isfinite(vals).all()]
+    if dense:
+        block = _interp_matrix(times, new_time, np.column_stack([numeric[col] for col in dense]))
+        resampled.update(zip(dense, block.T))
+    for col, vals in numeric.items():
+        if col in resampled:
+            continue
+        valid = np.isfinite(vals)
+        if valid.sum() >= 2:
+            resampled[col] = np.interp(new_time, times[valid], vals[valid])
+        else:
+            resampled[col] = df_sorted[col].to_numpy()[nearest]
+    if 'Segment' in df_sorted.columns:
+        resampled['Segment'] = pd.to_numeric(df_sorted['Segment'], errors='coerce').to_numpy()[nearest]
+    if 'Segment Name' in df_sorted.columns:
+        resampled['Segment Name'] = df_sorted['Segment Name'].to_numpy()[nearest]
+    return pd.DataFrame(resampled)[names]
+
+
+def _csv_field_text(values, decimals):
+    """
+    CSV text of one column rounded per OUTPUT_COLUMNS, as pandas.to_csv writes it
+    (shortest float repr, empty for NaN, quoted only when needed).
+
+    Returns:
+        list: One str per row
+    """
+    if decimals is None:
+        # Text columns repeat a few labels: format each once (NaN gets code -1, the trailing empty label)
+        codes, labels = pd.factorize(values)
+        labels = [str(v) for v in labels]
+        labels = ['"' + v.replace('"', '""') + '"' if any(ch in v for ch in ',"\r\n') else v for v in labels] + ['']
+        return [labels[c] for c in codes.tolist()]
+    vals = np.asarray(values, dtype=float) if values.dtype != object else pd.to_numeric(values, errors='coerce')
+    vals = np.round(np.asarray(vals, dtype=float), decimals)
+    if decimals == 0:
+        if not np.isfinite(vals).all():
+            raise ValueError("Cannot convert non-finite values (NA or inf) to integer")
+        return list(map(str, vals.astype(np.int64).tolist()))
+    text = list(map(repr, vals.tolist()))
+    for i in np.flatnonzero(np.isnan(vals)):
+        text[i] = ''
+    return text
+
+
 def create_output_file(results_df, aircraft_model, modification, dep_airport, arr_airport, 
                       initial_fuel, payload, cruise_alt, winds_temps_source, isa_dev_c=None):
     """
-    Create output file with time history data at exact 5-second intervals.
+    Create output file with time history data resampled to exact 2-second intervals.
     
     Args:
         results_df (pd.DataFrame): Simulation results DataFrame
@@ -86,125 +254,10 @@ def create_output_file(results_df, aircraft_model, modification, dep_airport, ar
     output_dir = os.path.join("single_output", timestamp)
     os.makedirs(output_dir, exist_ok=True)
     
-    # Data is already collected at exact 5-second intervals during simulation
-    # No need for post-processing sampling
-    output_df = results_df.copy()
-    # Build a strict 2-second time grid for CSV output and resample via interpolation/nearest
-    time_col = 'Time (s)'
-    if time_col in output_df.columns:
-        df_sorted = output_df.sort_values(time_col).reset_index(drop=True)
-        times = pd.to_numeric(df_sorted[time_col], errors='coerce').astype(float).to_numpy()
-        if len(times) >= 2 and np.isfinite(times).all():
-            start_t = float(np.floor(times.min()))
-            end_t = float(np.ceil(times.max()))
-            new_time = np.arange(start_t, end_t + 1e-6, 2.0)
-            resampled = pd.DataFrame({time_col: new_time})
-
-            # Helper to get nearest indices into the original series for categorical/step data
-            def nearest_index(src_times, query_times):
-                idx = np.searchsorted(src_times, query_times, side='left')
-                idx = np.clip(idx, 1, len(src_times) - 1)
-                left = src_times[idx - 1]
-                right = src_times[idx]
-                return np.where(query_times - left <= right - query_times, idx - 1, idx)
-
-            # Interpolate numeric columns; nearest for non-numeric
-            for col in df_sorted.columns:
-                if col == time_col:
-                    continue
-                if col in ['Segment', 'Segment Name']:
-                    continue
-                vals = pd.to_numeric(df_sorted[col], errors='coerce').to_numpy()
-                if np.isfinite(vals).sum() >= 2:
-                    valid = np.isfinite(vals)
-                    x = times[valid]
-                    y = vals[valid]
-                    # Linear interpolation across the range
-                    y_interp = np.interp(new_time, x, y)
-                    resampled[col] = y_interp
-                else:
-                    # Fallback to nearest value for sparse/non-numeric columns
-                    ni = nearest_index(times, new_time)
-                    resampled[col] = df_sorted[col].to_numpy()[ni]
-
-            # Nearest for Segment/Segment Name (categorical/stepwise)
-            if 'Segment' in df_sorted.columns:
-                ni = nearest_index(times, new_time)
-                resampled['Segment'] = pd.to_numeric(df_sorted['Segment'], errors='coerce').to_numpy()[ni]
-            if 'Segment Name' in df_sorted.columns:
-                ni = nearest_index(times, new_time)
-                resampled['Segment Name'] = df_sorted['Segment Name'].to_numpy()[ni]
-
-            output_df = resampled
-    
-    # Select and format columns with proper significant digits
-    # Remove Time (hr) column, keep only Time (s)
-    formatted_df = pd.DataFrame()
-    
-    # Time in seconds (column 1)
-    if 'Time (s)' in output_df.columns:
-        formatted_df['Time (s)'] = output_df['Time (s)'].round(0).astype(int)
-    
-    # Segment - integer
-    if 'Segment' in output_df.columns:
-        formatted_df['Segment'] = output_df['Segment'].round(0).astype(int)
-    # Segment Name - pass through as-is for readability
-    if 'Segment Name' in output_df.columns:
-        formatted_df['Segment Name'] = output_df['Segment Name']
-    
-    # Altitude - 0 significant digits (integer)
-    if 'Altitude (ft)' in output_df.columns:
-        formatted_df['Altitude (ft)'] = output_df['Altitude (ft)'].round(0).astype(int)
-    
-    # Distance - 1 significant digit
-    if 'Distance (NM)' in output_df.columns:
-        formatted_df['Distance (NM)'] = output_df['Distance (NM)'].round(1)
-    
-    # VKTAS - 0 significant digits (integer)
-    if 'VKTAS (kts)' in output_df.columns:
-        formatted_df['VKTAS (kts)'] = output_df['VKTAS (kts)'].round(0).astype(int)
-    
-    # VKIAS - 0 significant digits (integer)
-    if 'VKIAS (kts)' in output_df.columns:
-        formatted_df['VKIAS (kts)'] = output_df['VKIAS (kts)'].round(0).astype(int)
-    
-    # ROC - 0 significant digits (integer)
-    if 'ROC (fpm)' in output_df.columns:
-        formatted_df['ROC (fpm)'] = output_df['ROC (fpm)'].round(0).astype(int)
-    
-    # Thrust - 0 significant digits (integer)
-    if 'Thrust (lb)' in output_df.columns:
-        formatted_df['Thrust (lb)'] = output_df['Thrust (lb)'].round(0).astype(int)
-    
-    # Drag - 0 significant digits (integer)
-    if 'Drag (lb)' in output_df.columns:
-        formatted_df['Drag (lb)'] = output_df['Drag (lb)'].round(0).astype(int)
-    
-    # Weight - 0 significant digits (integer)
-    if 'Weight (lb)' in output_df.columns:
-        formatted_df['Weight (lb)'] = output_df['Weight (lb)'].round(0).astype(int)
-    
-    # Fuel Remaining - 0 significant digits (integer)
-    if 'Fuel Remaining (lb)' in output_df.columns:
-        formatted_df['Fuel Remaining (lb)'] = output_df['Fuel Remaining (lb)'].round(0).astype(int)
-    
-    # Fuel Flow - 0 significant digits (integer)
-    if 'Fuel Flow (lb/hr)' in output_df.columns:
-        formatted_df['Fuel Flow (lb/hr)'] = output_df['Fuel Flow (lb/hr)'].round(0).astype(int)
-    
-    # Mach - 3 significant digits
-    if 'Mach' in output_df.columns:
-        formatted_df['Mach'] = output_df['Mach'].round(3)
-    
-    # Gradient - 1 significant digit
-    if 'Gradient (%)' in output_df.columns:
-        formatted_df['Gradient (%)'] = output_df['Gradient (%)'].round(1)
-    
-    # VAPP/VREF - 1 decimal place (if present)
-    if 'VAPP (kts)' in output_df.columns:
-        formatted_df['VAPP (kts)'] = pd.to_numeric(output_df['VAPP (kts)'], errors='coerce').round(1)
-    if 'VREF (kts)' in output_df.columns:
-        formatted_df['VREF (kts)'] = pd.to_numeric(output_df['VREF (kts)'], errors='coerce').round(1)
+    # Resample onto the output grid, then round and format each column per OUTPUT_COLUMNS
+    output_df = resample_output_history(results_df)
+    decimals = dict(OUTPUT_COLUMNS)
+    columns = {col: _csv_field_text(output_df[col].to_numpy(), decimals[col]) for col in output_df.columns}
     
     # Create filename
     filename = f"{aircraft_model}_{modification}_{dep_airport}_to_{arr_airport}_{timestamp}.csv"
@@ -222,6 +275,7 @@ def create_output_file(results_df, aircraft_model, modification, dep_airport, ar
         s = pd.to_numeric(output_df['VREF (kts)'], errors='coerce').dropna()
         if not s.empty:
             vref_meta = float(s.iloc[-1])
+    time_s = np.round(output_df['Time (s)'].to_numpy(dtype=float)).astype(int)
 
     metadata = [
         f"Flight Simulation Results - {aircraft_model} {modification}",
@@ -235,22 +289,20 @@ def create_output_file(results_df, aircraft_model, modification, dep_airport, ar
         (f"Approach VREF: {vref_meta:.1f} kts" if vref_meta is not None else None),
         f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
         f"Original Data Points: {len(results_df)}",
-        f"Sampled Data Points (2-sec intervals): {len(formatted_df)}",
-        f"Time Range: {formatted_df['Time (s)'].min():.0f} - {formatted_df['Time (s)'].max():.0f} seconds",
+        f"Sampled Data Points (2-sec intervals): {len(output_df)}",
+        f"Time Range: {time_s.min():.0f} - {time_s.max():.0f} seconds",
         f"Exact 2-second intervals, no skipped rows",
         ""
     ]
     # Remove None entries from metadata
     metadata = [m for m in metadata if m is not None]
     
-    # Write to CSV with metadata header (prevent blank lines on Windows)
+    # Write metadata, header and rows in one pass (prevent blank lines on Windows)
+    lines = [f"# {line}" for line in metadata]
+    lines.append(",".join(columns))
+    lines.extend(map(",".join, zip(*columns.values())))
     with open(filepath, 'w', newline='') as f:
-        # Write metadata
-        for line in metadata:
-            f.write(f"# {line}\n")
-        
-        # Write formatted DataFrame with a consistent line terminator
-        formatted_df.to_csv(f, index=False, lineterminator='\n')
+        f.write("\n".join(lines) + "\n")
     
     return filepath
 
@@ -379,6 +431,69 @@ def interpolate_winds_temps(altitude, winds_temps_data):
     return wind_dir, wind_speed, temp
 
 # --- Simulation Logic ---
+def build_fuel_distance_figure(dist_nm, fuel_remaining_lb, markers=()) -> go.Figure:
+    """
+    Fuel remaining vs distance plot of a simulation.
+
+    Args:
+        dist_nm: Distance of each time step (NM).
+        fuel_remaining_lb: Fuel remaining at each time step (lb).
+        markers: (distance NM, color, label) of the dashed segment markers.
+
+    Returns:
+        go.Figure: The figure (stored by run_simulation as results["fuel_distance_plot"]).
+    """
+    fig = go.Figure()
+
+    # Add main line
+    fig.add_trace(go.Scatter(
+        x=list(dist_nm),  # Already in NM
+        y=list(fuel_remaining_lb),
+        mode='lines',
+        name='Fuel Remaining',
+        line=dict(color='blue', width=2)
+    ))
+
+    # Add segment markers
+    for x, color, label in markers:
+        fig.add_vline(
+            x=float(x),
+            line_dash="dash",
+            line_color=color,
+            annotation_text=label,
+            annotation_position="top right"
+        )
+
+    # Update layout
+    fig.update_layout(
+        title="Fuel Remaining vs Distance",
+        xaxis_title="Distance (NM)",
+        yaxis_title="Fuel Remaining (lb)",
+        showlegend=True,
+        xaxis=dict(
+            showgrid=True,
+            gridwidth=1,
+            gridcolor='LightGrey',
+            showline=True,
+            linewidth=1,
+            linecolor='Grey',
+            mirror=True,
+            tickmode='auto',
+            nticks=10
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridwidth=1,
+            gridcolor='LightGrey',
+            showline=True,
+            linewidth=1,
+            linecolor='Grey',
+            mirror=True
+        )
+    )
+    return fig
+
+
 def run_simulation(
     dep_airport: str,
     arr_airport: str,
@@ -393,10 +508,18 @@ def run_simulation(
     winds_temps_source: str,
     v1_cut_enabled: bool,
     write_output_file: bool = True,
-    cruise_mach: float | None = None,
+    cruise_mach: float | str | None = None,
     cruise_kias: float | None = None,
     isa_dev_c: float | None = None,
     range_mode: bool = False,
+    terminal_table=None,
+    climb_table=None,
+    stop_at_segment: int | None = None,
+    roc_cache=True,
+    step_plan: list[tuple[float, float]] | None = None,
+    sfc_factor: float = 1.0,
+    drag_factor: float = 1.0,
+    recording: str | dict = "adaptive",
 ):
     """Simulate a flight between two airports.
     
@@ -414,10 +537,29 @@ def run_simulation(
         winds_temps_source: Source for winds and temperatures.
         v1_cut_enabled: Whether V1 cut is enabled.
         write_output_file: Whether to write the output file.
-        cruise_mach: Optional cruise Mach number.
+        cruise_mach: Optional cruise Mach number, or "MRC" / "LRC" to fly the maximum-range or
+            long-range cruise Mach from performance.optimal_cruise_speed, re-solved as weight
+            and altitude change.
         cruise_kias: Optional cruise indicated airspeed in knots (used for turboprops).
         isa_dev_c: Optional ISA deviation in degrees Celsius.
         range_mode: Optional range mode flag.
+        terminal_table: Optional perf_tables.TerminalTable. In range mode, segments 0-3 and
+            11-13 are replaced by its tabulated time, distance and fuel increments.
+        climb_table: Optional perf_tables.ClimbTable. When the departure elevation matches the
+            table, segments 0-5 are replaced by an interpolated jump to the top of climb.
+        stop_at_segment: Optional segment number; the run ends as soon as it is reached.
+        roc_cache: True (default) to memoize predict_roc for the step-climb logic in a
+            per-run flight_physics.ROCCache, False to call predict_roc on every step, or
+            a ROCCache instance to share one across runs of the same aircraft and mod.
+        step_plan: Optional explicit cruise profile as (distance from departure in NM,
+            altitude in ft) pairs, e.g. from performance.optimize_step_climb. The first
+            altitude replaces cruise_alt; each later altitude becomes the cruise goal
+            once its distance is passed, and the aircraft climbs to it from cruise.
+        sfc_factor: Multiplier on the jet SFC / turboprop SSFC (fuel-flow uncertainty).
+        drag_factor: Multiplier on the clean drag polar (cdo and k).
+        recording: Time-history recording policy: "adaptive" (default; every step in
+            takeoff and landing, change-triggered cruise), "fixed" (every 5 s) or a dict
+            in the form of RECORDING_POLICIES entries.
 
     Returns:
         tuple: (flight_data, results, dep_lat, dep_lon, arr_lat, arr_lon, output_file_path)
@@ -494,10 +636,23 @@ def run_simulation(
     engines = engines_orig  # Store original engines value, may be modified by V1 cut
     reserve_fuel = reserve_fuel
     descent_fuel_per_kft_lb = 3.5
-    m_cruise = float(cruise_mach) if cruise_mach is not None else 0.7
+    auto_cruise = cruise_mach.upper() if isinstance(cruise_mach, str) else None
+    if auto_cruise not in (None, "MRC", "LRC"):
+        raise ValueError(f"cruise_mach must be a Mach number, 'MRC' or 'LRC', got {cruise_mach!r}")
+    if auto_cruise:
+        m_cruise = float(mmo)
+        cruise_terms = aircraft_terms(aircraft, mod)
+        auto_cruise_key = None
+        auto_cruise_machs = []
+    else:
+        m_cruise = float(cruise_mach) if cruise_mach is not None else 0.7
     v_cruise_ias = float(cruise_kias) if cruise_kias is not None else None
     ceiling_ft = int(ac[8]) if len(ac) > 8 else int(cruise_alt)
     alt_goal = min(int(cruise_alt), ceiling_ft)
+    step_plan = sorted((float(d), float(a)) for d, a in step_plan) if step_plan else None
+    plan_idx = 1
+    if step_plan:
+        alt_goal = min(int(step_plan[0][1]), ceiling_ft)
     rod = -2000
     rod_u_10k = -1500
     rod_approach = -700
@@ -567,8 +722,14 @@ def run_simulation(
 
     v_u_10k = 200
     a = b ** 2 / s * (1 + 1.9 * h / b)
-    k = 1 / (3.14159 * e * a)
+    k = 1 / (3.14159 * e * a) * float(drag_factor)
+    cdo = cdo * float(drag_factor)
+    sfc = sfc * float(sfc_factor)
     max_payload = mzfw - bow
+    if roc_cache is True:
+        roc_cache = ROCCache(thrust_mult, cdo, dcdo_flap1, dcdo_flap2, dcdo_flap3, dcdo_gear, k, s)
+    elif roc_cache is False:
+        roc_cache = None
     
     # Check constraints and collect all exceedance messages
     exceedances = []
@@ -608,7 +769,8 @@ def run_simulation(
     climb_fuel_flag = 0
     vspeed_flag = 0
     approach_vspeed_flag = 0
-    descent_threshold = 0.0031 * (alt_goal - alt_land) - 9.7404
+    plan_top_alt = max([alt_goal] + [min(int(a), ceiling_ft) for _, a in (step_plan or [])])
+    descent_threshold = 0.0031 * (plan_top_alt - alt_land) - 9.7404
     next_step_alt = 0
     t = 0
     fuel_burned = 0
@@ -757,7 +919,197 @@ def run_simulation(
     fuel_remaining_data = []
     fuel_flow_data = []  # Fuel flow in lbs per hour
 
+    # Time-history recording: each step is offered to record_step; it is kept when due
+    # under its segment's policy, and otherwise held until a later step supersedes it
+    segment_policy = recording_policy(recording)
+    next_sample_time = 0.0
+    last_recorded = None  # Last kept step (a _HISTORY_FIELDS tuple)
+    held_step = None  # Latest step not kept; recorded before a segment change or reserve crossing, or at the end
+
+    def append_step(step):
+        nonlocal last_recorded
+        (t_s, alt_s, dist_s, vktas_s, vkias_s, roc_s, thrust_s, drag_s, segment_s, mach_s, gradient_s,
+         weight_s, induced_drag_s, fob_s) = step
+        time_data.append(t_s / 3600)
+        alt_data.append(alt_s)
+        dist_data.append(dist_s)
+        vktas_data.append(vktas_s)
+        vkias_data.append(vkias_s)
+        roc_data.append(roc_s)
+        thrust_data.append(thrust_s)
+        drag_data.append(drag_s)
+        segment_data.append(segment_s)
+        mach_data.append(mach_s)
+        gradient_data.append(gradient_s)
+        weight_data.append(weight_s)
+        induced_drag_data.append(induced_drag_s)  # Pure induced drag (without ground effect)
+        fuel_remaining_data.append(fob_s)
+        # Fuel flow in lbs per hour from the fuel used since the previous kept step
+        if last_recorded is not None and t_s > last_recorded[0]:
+            fuel_flow_data.append(max(0, (last_recorded[-1] - fob_s) / (t_s - last_recorded[0]) * 3600))
+        else:
+            fuel_flow_data.append(0)
+        last_recorded = step
+
+    def record_step(step):
+        nonlocal next_sample_time, held_step
+        seg = step[8]
+        interval_s, deadbands = segment_policy.get(seg, (RECORDING_INTERVAL_S, []))
+        boundary = held_step is not None and (
+            held_step[8] != seg or (held_step[-1] >= reserve_fuel) != (step[-1] >= reserve_fuel)
+        )
+        if boundary:
+            append_step(held_step)
+        due = (
+            boundary
+            or last_recorded is None
+            or step[0] + 1e-9 >= next_sample_time  # small epsilon to avoid float drift
+            or any(abs(step[i] - last_recorded[i]) > band for i, band in deadbands)
+        )
+        if not due:
+            held_step = step
+            return
+        append_step(step)
+        held_step = None
+        # Next time-triggered row: the following multiple of the segment's interval
+        next_sample_time = (np.floor((step[0] + 1e-9) / interval_s) + 1) * interval_s if interval_s > 0 else 0.0
+
+    def flush_held_step():
+        nonlocal held_step
+        if held_step is not None:
+            append_step(held_step)
+            held_step = None
+
+    # Segment boundary states used to report takeoff/landing increments
+    departure_state = None
+    arrival_state = None
+    toc_state = None
+
+    # Range-mode fast path: start at 1500 ft AGL from tabulated departure increments
+    use_terminal_table = terminal_table is not None and range_mode and v1_cut == 0
+    table_isa = float(isa_dev_c) if isa_dev_c is not None else 0.0
+    # ISA deviation until the loop's first atmosphere update (the auto-cruise speed is
+    # solved before it on the first step after a climb-table jump)
+    isa_diff = table_isa
+    if use_terminal_table:
+        dep_inc = terminal_table.departure_increment(tow, table_isa)
+        t = dep_inc["time_s"]
+        dist_ft = dep_inc["dist_nm"] * 6076.12
+        fuel_burned = dep_inc["fuel_lb"]
+        mission_fuel_remain -= fuel_burned
+        w -= fuel_burned
+        fob = fuel_start - fuel_burned - taxi_fuel
+        alt = alt_to + 1500
+        d_alt, _, sigma, delta, _, c = atmos(alt, table_isa)
+        vktas = dep_inc["vktas"]
+        v_true_fps = vktas * (6076.12 / 3600)
+        m = vktas / c
+        correction = 1 + 1/8 * (1 - delta) * m ** 2 + 3/640 * (1 - 10 * delta + 9 * delta ** 2) * m ** 4
+        vkias = vktas * sqrt(sigma) * correction
+        dist_to_1500ft = dist_ft
+        climb_fuel = fuel_burned
+        segment = 4
+
+    # Climb-table jump: start level at the interpolated top of climb
+    use_climb_table = climb_table is not None and v1_cut == 0 and abs(alt_to - climb_table.elevation_ft) <= 1000
+    if use_climb_table:
+        toc = climb_table.top_of_climb(tow, table_isa, alt_goal)
+        t = toc["time_s"]
+        fuel_burned = toc["fuel_lb"]
+        mission_fuel_remain = mission_fuel - fuel_burned
+        w = tow - fuel_burned
+        fob = fuel_start - fuel_burned - taxi_fuel
+        alt = min(toc["level_off_ft"], alt_goal)
+        # Table distances are still-air; add the along-track wind at mid-climb
+        wind_dir, wind_speed, _ = interpolate_winds_temps(0.5 * (alt_to + alt), selected_winds_temps)
+        climb_wind_kts = wind_speed * np.cos(np.radians(((wind_dir - bearing) + 360) % 360))
+        dist_ft = toc["dist_nm"] * 6076.12 + climb_wind_kts * 6076.12 / 3600 * t
+        d_alt, _, sigma, delta, _, c = atmos(alt, table_isa)
+        vktas = toc["vktas"]
+        v_true_fps = vktas * (6076.12 / 3600)
+        m = vktas / c
+        correction = 1 + 1/8 * (1 - delta) * m ** 2 + 3/640 * (1 - 10 * delta + 9 * delta ** 2) * m ** 4
+        vkias = vktas * sqrt(sigma) * correction
+        step_altitudes.append(round(alt, 0))
+        segment = 6
+
     while segment != 14:
+        if segment >= 6 and toc_state is None:
+            toc_state = {
+                "weight_lb": tow,
+                "time_s": t,
+                "dist_nm": dist_ft / 6076.12,
+                "fuel_lb": fuel_burned,
+                "level_off_ft": alt,
+                "vktas": vktas,
+            }
+        if stop_at_segment is not None and segment >= stop_at_segment:
+            break
+        if segment == 4 and departure_state is None:
+            departure_state = {
+                "weight_lb": tow,
+                "time_s": t,
+                "dist_nm": dist_ft / 6076.12,
+                "fuel_lb": fuel_burned,
+                "vktas": vktas,
+            }
+        if segment == 11 and arrival_state is None:
+            arrival_state = {"weight_lb": w, "time_s": t, "dist_nm": dist_ft / 6076.12, "fuel_lb": fuel_burned}
+
+        # Range-mode fast path: finish from 3000 ft AGL with tabulated arrival increments
+        if use_terminal_table and segment == 11:
+            descent_end_weight = w
+            landing_start_weight = w
+            _, _, _, _, vapp, vref = vspeeds(
+                w=w, s=s, clmax=clmax, clmax_1=clmax_1, clmax_2=clmax_2,
+                delta=1.0, m=0.2, flap=2, segment=12
+            )
+            final_results["Approach V-Speeds"] = {
+                "Weight": int(w),
+                "VAPP": round(float(vapp), 1) if vapp is not None else None,
+                "VREF": round(float(vref), 1) if vref is not None else None
+            }
+            arr_inc = terminal_table.arrival_increment(w, table_isa)
+            flush_held_step()
+            t0, dist0, alt0, fob0 = t, dist_ft, alt, fob
+            vktas0, vkias0, roc0 = vktas, vkias, roc_fpm
+            t += arr_inc["time_s"]
+            dist_ft += arr_inc["dist_nm"] * 6076.12
+            fuel_burned += arr_inc["fuel_lb"]
+            mission_fuel_remain -= arr_inc["fuel_lb"]
+            w -= arr_inc["fuel_lb"]
+            fob = fuel_start - fuel_burned - taxi_fuel
+            fuel_burn_history.append(fuel_burned)
+            alt = alt_land
+            vkias = vktas = v_true_fps = m = 0
+            landing_end_weight = w
+
+            # Fill the skipped approach and rollout linearly so reserve-crossing lookups stay meaningful,
+            # at segment 11's recording interval (its 1 s integration step when every step is kept)
+            arr_ff = arr_inc["fuel_lb"] / max(arr_inc["time_s"], 1e-6) * 3600
+            fill_interval_s = segment_policy[11][0] or 1.0
+            n_fill = max(1, int(np.ceil(arr_inc["time_s"] / fill_interval_s)))
+            for k_fill in range(1, n_fill + 1):
+                frac = k_fill / n_fill
+                time_data.append((t0 + frac * (t - t0)) / 3600)
+                alt_data.append(alt0 + frac * (alt - alt0))
+                dist_data.append((dist0 + frac * (dist_ft - dist0)) / 6076.12)
+                vktas_data.append((1 - frac) * vktas0)
+                vkias_data.append((1 - frac) * vkias0)
+                roc_data.append(roc0 if k_fill < n_fill else 0)
+                thrust_data.append(0)
+                drag_data.append(0)
+                segment_data.append(11 if k_fill < n_fill else 13)
+                mach_data.append(0)
+                gradient_data.append(0)
+                weight_data.append(landing_start_weight - frac * arr_inc["fuel_lb"])
+                induced_drag_data.append(0)
+                fuel_remaining_data.append(fob0 - frac * (fob0 - fob))
+                fuel_flow_data.append(arr_ff if k_fill < n_fill else 0)
+            last_recorded = (t, alt, dist_ft / 6076.12, 0, 0, 0, 0, 0, 13, 0, 0, w, 0, fob)
+            segment = 14
+            continue
+
         # In range mode, do not error out when mission_fuel_remain <= 0; we manage descent to land on reserves
         if (not range_mode) and mission_fuel_remain < 0 and alt > alt_land:
             final_results = {"error": f"Not Enough Fuel for {mod}."}
@@ -854,6 +1206,16 @@ def run_simulation(
         else:
             t_inc = 1
 
+        # Auto cruise speed: re-solve MRC/LRC whenever weight, altitude or ISA moves to a new band
+        if auto_cruise and segment in (6, 7) and alt > 10100:
+            key = (round(w / 100.0), round(alt / 500.0), round(isa_diff))
+            if key != auto_cruise_key:
+                auto_cruise_key = key
+                m_auto = float(optimal_cruise_speed(cruise_terms, w, alt, isa_diff)[f"{auto_cruise.lower()}_mach"])
+                if np.isfinite(m_auto):
+                    m_cruise = m_auto
+                    auto_cruise_machs.append(m_auto)
+
         # Set speed and ROC goals based on segment
         speed_goal = 0
         roc_goal = 0
@@ -1025,6 +1387,49 @@ def run_simulation(
                 speed_goal = m_climb
             if abs(alt - next_step_alt) < alt_tolerance or next_step_alt == 0:
                 next_step_alt = next_step_altitude(alt, alt_goal, next_step_alt)
+                if roc_cache is not None:
+                    predicted_roc_value = roc_cache.predict(
+                        next_step_alt, w, m, isa_diff, speed_goal, segment, engines, thrust_factor
+                    )
+                else:
+                    predicted_roc_value = predict_roc(
+                        next_step_alt,
+                        alt,
+                        w,
+                        m,
+                        thrust,
+                        drag,
+                        vktas,
+                        thrust_mult,
+                        engines,
+                        thrust_factor,
+                        cdo,
+                        dcdo_flap1,
+                        dcdo_flap2,
+                        dcdo_flap3,
+                        dcdo_gear,
+                        k,
+                        s,
+                        isa_diff,
+                        speed_goal,
+                        segment,
+                        alt_goal,
+                    )
+                if predicted_roc_value <= roc_min or (roc_fpm < roc_min and abs(alt - next_step_alt) < alt_tolerance):
+                    segment = 6
+                if alt >= alt_goal:
+                    segment = 6
+            elif roc_fpm < roc_min and predicted_roc_value < roc_min:
+                segment = 6
+            elif alt >= alt_goal:
+                segment = 6
+        elif segment == 6 and alt < alt_goal:
+            next_step_alt = next_step_altitude(alt, alt_goal, next_step_alt)
+            if roc_cache is not None:
+                predicted_roc_value = roc_cache.predict(
+                    next_step_alt, w, m, isa_diff, speed_goal, segment, engines, thrust_factor
+                )
+            else:
                 predicted_roc_value = predict_roc(
                     next_step_alt,
                     alt,
@@ -1048,37 +1453,6 @@ def run_simulation(
                     segment,
                     alt_goal,
                 )
-                if predicted_roc_value <= roc_min or (roc_fpm < roc_min and abs(alt - next_step_alt) < alt_tolerance):
-                    segment = 6
-                if alt >= alt_goal:
-                    segment = 6
-            elif roc_fpm < roc_min and predicted_roc_value < roc_min:
-                segment = 6
-        elif segment == 6 and alt < alt_goal:
-            next_step_alt = next_step_altitude(alt, alt_goal, next_step_alt)
-            predicted_roc_value = predict_roc(
-                next_step_alt,
-                alt,
-                w,
-                m,
-                thrust,
-                drag,
-                vktas,
-                thrust_mult,
-                engines,
-                thrust_factor,
-                cdo,
-                dcdo_flap1,
-                dcdo_flap2,
-                dcdo_flap3,
-                dcdo_gear,
-                k,
-                s,
-                isa_diff,
-                speed_goal,
-                segment,
-                alt_goal,
-            )
             if predicted_roc_value > roc_min and alt < alt_goal:
                 segment = 5
             elif m >= m_cruise or abs(thrust - drag) < 1:
@@ -1113,7 +1487,7 @@ def run_simulation(
         # Fuel burn: use turboprop SSFC (lb/shp-hr) if turboprop model active; otherwise jet SFC (lb/lbf-hr)
         if turboprop_params is not None and 'SSFC_lb_per_shp_hr' in turboprop_params:
             try:
-                ssfc = float(turboprop_params.get('SSFC_lb_per_shp_hr'))
+                ssfc = float(turboprop_params.get('SSFC_lb_per_shp_hr')) * float(sfc_factor)
                 P_rated = float(turboprop_params.get('P_rated_shp', 0.0)) * float(engines)
                 alpha = float(turboprop_params.get('alpha_lapse', 0.6))
                 # Available shaft power at current conditions (same mapping as physics)
@@ -1132,42 +1506,9 @@ def run_simulation(
         fob = fuel_start - fuel_burned - taxi_fuel
         fuel_burn_history.append(fuel_burned)
 
-        # Only collect data at exact 5-second simulated intervals using an accumulator
-        # Initialize next_sample_time the first time we enter the loop
-        if 'next_sample_time' not in locals():
-            next_sample_time = 0.0
-            sample_interval = 5.0
-        
-        if t + 1e-9 >= next_sample_time:  # small epsilon to avoid float drift
-            time_data.append(t / 3600)
-            alt_data.append(alt)
-            dist_data.append(dist_ft / 6076.12)
-            vktas_data.append(vktas)
-            vkias_data.append(vkias)
-            roc_data.append(roc_fpm)
-            thrust_data.append(thrust)
-            drag_data.append(drag + drag_gnd)
-            segment_data.append(segment)
-            mach_data.append(m)
-            gradient_data.append(gradient)
-            
-            # Add additional time history data
-            weight_data.append(w)
-            induced_drag_data.append(drag)  # Pure induced drag (without ground effect)
-            fuel_remaining_data.append(fob)
-            
-            # Calculate fuel flow in lbs per hour based on change since last sample
-            if len(fuel_remaining_data) > 1:
-                recent_fuel_change = fuel_remaining_data[-2] - fuel_remaining_data[-1]
-                fuel_flow_lbs_per_sec = recent_fuel_change / sample_interval
-                fuel_flow_lbs_per_hour = max(0, fuel_flow_lbs_per_sec * 3600)
-                fuel_flow_data.append(fuel_flow_lbs_per_hour)
-            else:
-                fuel_flow_data.append(0)
-            
-            # Advance the next sample time by fixed 5-second steps until it is ahead of current t
-            while next_sample_time <= t + 1e-9:
-                next_sample_time += sample_interval
+        # Time history: keep this step if its segment's recording policy says so
+        record_step((t, alt, dist_ft / 6076.12, vktas, vkias, roc_fpm, thrust, drag + drag_gnd, segment, m,
+                     gradient, w, drag, fob))
 
         # Track segment start weights and calculate fuel remaining at each phase
         if segment == 0 and takeoff_start_weight == 0:  # Start of takeoff
@@ -1261,6 +1602,12 @@ def run_simulation(
             segment = 5
         if (abs(round(thrust - drag)) < 1 or m >= m_cruise or m >= mmo) and segment == 6:
             segment = 7
+        # Explicit step plan: raise the cruise altitude goal once each planned distance is passed
+        if step_plan and segment in (6, 7) and plan_idx < len(step_plan) and dist_ft / 6076.12 >= step_plan[plan_idx][0]:
+            alt_goal = min(int(step_plan[plan_idx][1]), ceiling_ft)
+            plan_idx += 1
+            if alt_goal > alt + alt_tolerance:
+                segment = 5 if m >= m_climb else 4
         # Start descent when reaching distance threshold (normal mode) or reserve threshold (range_mode), regardless of altitude
         if (segment in (6, 7)) and ((not range_mode and remaining_dist <= descent_threshold) or (range_mode and fob <= reserve_fuel + max(0.0, (alt - alt_land) / 1000.0) * descent_fuel_per_kft_lb)):
             segment = 8
@@ -1299,6 +1646,30 @@ def run_simulation(
             final_results["Landing - Dist from 35 ft to Stop (ft)"] = int(dist_land_35)
             final_results["Landing - Ground Roll (ft)"] = int(dist_land)
 
+    # The final step always ends the time history
+    flush_held_step()
+
+    terminal_increments = {}
+    if departure_state is not None:
+        terminal_increments["departure"] = departure_state
+    if arrival_state is not None:
+        terminal_increments["arrival"] = {
+            "weight_lb": arrival_state["weight_lb"],
+            "time_s": t - arrival_state["time_s"],
+            "dist_nm": dist_ft / 6076.12 - arrival_state["dist_nm"],
+            "fuel_lb": fuel_burned - arrival_state["fuel_lb"],
+        }
+    final_results["Terminal Increments"] = terminal_increments or None
+    final_results["Top of Climb"] = toc_state
+    if auto_cruise:
+        final_results["Auto Cruise Mach"] = {
+            "mode": auto_cruise,
+            "first": round(auto_cruise_machs[0], 4) if auto_cruise_machs else None,
+            "last": round(auto_cruise_machs[-1], 4) if auto_cruise_machs else None,
+        }
+    if step_plan:
+        final_results["Step Plan"] = [{"dist_nm": d, "alt_ft": a} for d, a in step_plan]
+
     # Calculate final descent and landing metrics
     descent_time = (t - descent_start_time) / 60 if descent_start_time > 0 else 0
     descent_dist = (dist_ft - descent_start_dist) / 6076.12 if descent_start_dist > 0 else 0
@@ -1377,72 +1748,19 @@ def run_simulation(
             final_results["Landing - Dist from 35 ft to Stop (ft)"] = int(dist_land_35)
             final_results["Landing - Ground Roll (ft)"] = int(dist_land)
 
-    # Create fuel vs distance plot using plotly.graph_objects
-    fig = go.Figure()
-    
-    # Add main line
-    fig.add_trace(go.Scatter(
-        x=dist_data,  # Already in NM
-        y=[initial_fuel - f for f in fuel_burn_history],
-        mode='lines',
-        name='Fuel Remaining',
-        line=dict(color='blue', width=2)
-    ))
-    
-    # Add segment markers
-    if climb_dist > 0:
-        fig.add_vline(
-            x=climb_dist,
-            line_dash="dash",
-            line_color="green",
-            annotation_text="End of Climb",
-            annotation_position="top right"
+    # Create fuel vs distance plot with segment markers
+    markers = [
+        (x, color, label)
+        for x, color, label, seg_dist in (
+            (climb_dist, "green", "End of Climb", climb_dist),
+            (climb_dist + cruise_dist, "blue", "Start of Descent", cruise_dist),
+            (climb_dist + cruise_dist + descent_dist, "red", "End of Descent", descent_dist),
         )
-    if cruise_dist > 0:
-        fig.add_vline(
-            x=climb_dist + cruise_dist,
-            line_dash="dash",
-            line_color="blue",
-            annotation_text="Start of Descent",
-            annotation_position="top right"
-        )
-    if descent_dist > 0:
-        fig.add_vline(
-            x=climb_dist + cruise_dist + descent_dist,
-            line_dash="dash",
-            line_color="red",
-            annotation_text="End of Descent",
-            annotation_position="top right"
-        )
-    
-    # Update layout
-    fig.update_layout(
-        title="Fuel Remaining vs Distance",
-        xaxis_title="Distance (NM)",
-        yaxis_title="Fuel Remaining (lb)",
-        showlegend=True,
-        xaxis=dict(
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='LightGrey',
-            showline=True,
-            linewidth=1,
-            linecolor='Grey',
-            mirror=True,
-            tickmode='auto',
-            nticks=10
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='LightGrey',
-            showline=True,
-            linewidth=1,
-            linecolor='Grey',
-            mirror=True
-        )
-    )
-    
+        if seg_dist > 0
+    ]
+    # Fuel on board including taxi fuel (initial fuel less fuel burned) at each recorded row
+    fig = build_fuel_distance_figure(dist_data, [f + taxi_fuel for f in fuel_remaining_data], markers)
+
     # Store the figure and fuel burn history in the results
     final_results["fuel_distance_plot"] = fig
     final_results["fuel_burn_history"] = fuel_burn_history